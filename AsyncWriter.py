@@ -0,0 +1,93 @@
+import os
+import threading
+from queue import Queue
+
+
+class AsyncWriter():
+    """
+    Finishes writing files on a background thread so that the caller never
+    waits on the disk. Every file is first written under a temporary name in
+    the target folder, synced to disk and then renamed over the final name, so
+    a crash while writing leaves the last complete version in place. At most
+    maxPending writes are queued; submitting beyond that waits for the oldest
+    one to finish.
+    """
+    def __init__(self, maxPending=2):
+        self.queue = Queue(maxsize=maxPending)
+        self.error = None
+        self.count = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def tmpName(self, filename):
+        """
+        Returns a temporary name for filename that is unique to one write, so
+        a queued rename never picks up files of a later write.
+        """
+        self.count += 1
+        return '.' + filename + '.' + str(self.count) + '.tmp'
+
+    def submit(self, folder, filename, write=None, tmpname=None):
+        """
+        Input:
+            folder, filename: final location of the file
+            write: a function write(folder, tmpname) that writes the data. It
+                   runs on the writer thread, so it must only use data that
+                   the caller no longer modifies (a snapshot). None if the
+                   caller already wrote the data under tmpname itself.
+            tmpname: temporary name from tmpName(), required if write is None
+        """
+        assert write is not None or tmpname is not None
+        self._raiseError()
+        if tmpname is None:
+            tmpname = self.tmpName(filename)
+        self.queue.put((folder, filename, write, tmpname))
+
+    def wait(self):
+        """
+        Blocks until all submitted writes are on disk.
+        """
+        self.queue.join()
+        self._raiseError()
+
+    def _raiseError(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _run(self):
+        while True:
+            folder, filename, write, tmpname = self.queue.get()
+            try:
+                if not os.path.exists(folder):
+                    os.makedirs(folder, exist_ok=True)
+                if write is not None:
+                    write(folder, tmpname)
+                # some frameworks write several files sharing the checkpoint name as prefix
+                tmpfiles = [f for f in os.listdir(folder) if f.startswith(tmpname)]
+                if not tmpfiles:
+                    raise IOError('nothing was written to ' + os.path.join(folder, tmpname))
+                for f in tmpfiles:
+                    path = os.path.join(folder, f)
+                    with open(path, 'rb+') as tmpfile:
+                        os.fsync(tmpfile.fileno())
+                    os.replace(path, os.path.join(folder, filename + f[len(tmpname):]))
+                # tensorflow savers keep the name of the latest checkpoint in a state file
+                state = os.path.join(folder, 'checkpoint')
+                if os.path.isfile(state):
+                    with open(state) as f:
+                        text = f.read()
+                    if tmpname in text:
+                        with open(state, 'w') as f:
+                            f.write(text.replace(tmpname, filename))
+                if os.name != 'nt':
+                    # renames are durable only once the folder itself is synced
+                    fd = os.open(folder, os.O_RDONLY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.queue.task_done()
@@ -1,5 +1,6 @@
 from collections import deque
 from Arena import Arena
+from AsyncWriter import AsyncWriter
 from MCTS import MCTS
 import numpy as np
 from pytorch_classification.utils import Bar, AverageMeter
@@ -21,6 +22,7 @@ class Coach():
         self.mcts = MCTS(self.game, self.nnet, self.args)
         self.trainExamplesHistory = []    # history of examples from args.numItersForTrainExamplesHistory latest iterations
         self.skipFirstSelfPlay = False # can be overriden in loadTrainExamples()
+        self.writer = AsyncWriter(getattr(self.args, 'maxPendingWrites', 2))   # saves checkpoints and examples in the background
 
     def executeEpisode(self):
         """
@@ -93,6 +95,9 @@ class Coach():
                     bar.next()
                 bar.finish()
 
+                if self.mcts.cache is not None:
+                    print('Prediction cache: ' + str(self.mcts.cache))
+
                 # save the iteration examples to the history 
                 self.trainExamplesHistory.append(iterationTrainExamples)
                 
@@ -110,8 +115,8 @@ class Coach():
             shuffle(trainExamples)
 
             # training new network, keeping a copy of the old one
-            self.nnet.save_checkpoint(folder=self.args.checkpoint, filename='temp.pth.tar')
-            self.pnet.load_checkpoint(folder=self.args.checkpoint, filename='temp.pth.tar')
+            prevWeights = self.nnet.get_weights()
+            self.pnet.set_weights(prevWeights)
             pmcts = MCTS(self.game, self.pnet, self.args)
             
             self.nnet.train(trainExamples)
@@ -125,23 +130,40 @@ class Coach():
             print('NEW/PREV WINS : %d / %d ; DRAWS : %d' % (nwins, pwins, draws))
             if pwins+nwins == 0 or float(nwins)/(pwins+nwins) < self.args.updateThreshold:
                 print('REJECTING NEW MODEL')
-                self.nnet.load_checkpoint(folder=self.args.checkpoint, filename='temp.pth.tar')
+                self.nnet.set_weights(prevWeights)
             else:
                 print('ACCEPTING NEW MODEL')
-                self.nnet.save_checkpoint(folder=self.args.checkpoint, filename=self.getCheckpointFile(i))
-                self.nnet.save_checkpoint(folder=self.args.checkpoint, filename='best.pth.tar')                
+                self.saveCheckpoint(self.getCheckpointFile(i))
+                self.saveCheckpoint('best.pth.tar')
+
+        self.writer.wait()
 
     def getCheckpointFile(self, iteration):
         return 'checkpoint_' + str(iteration) + '.pth.tar'
 
+    def saveCheckpoint(self, filename):
+        """
+        Saves the current weights of nnet in the background from an in-memory
+        snapshot. Networks that can't be saved from another thread (see
+        NeuralNet.snapshot_checkpoint) are written under a temporary name on
+        this thread, and only syncing and renaming happen in the background.
+        """
+        write = self.nnet.snapshot_checkpoint()
+        if write is not None:
+            self.writer.submit(self.args.checkpoint, filename, write)
+            return
+        tmpname = self.writer.tmpName(filename)
+        self.nnet.save_checkpoint(folder=self.args.checkpoint, filename=tmpname)
+        self.writer.submit(self.args.checkpoint, filename, tmpname=tmpname)
+
     def saveTrainExamples(self, iteration):
-        folder = self.args.checkpoint
-        if not os.path.exists(folder):
-            os.makedirs(folder)
-        filename = os.path.join(folder, self.getCheckpointFile(iteration)+".examples")
-        with open(filename, "wb+") as f:
-            Pickler(f).dump(self.trainExamplesHistory)
-        f.closed
+        # the deques of older iterations are not modified anymore, copying the list is enough
+        history = list(self.trainExamplesHistory)
+
+        def write(folder, tmpname):
+            with open(os.path.join(folder, tmpname), "wb+") as f:
+                Pickler(f).dump(history)
+        self.writer.submit(self.args.checkpoint, self.getCheckpointFile(iteration)+".examples", write)
 
     def loadTrainExamples(self):
         modelFile = os.path.join(self.args.load_folder_file[0], self.args.load_folder_file[1])
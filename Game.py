@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class Game():
     """
     This class specifies the base Game class. To define your own game, subclass
@@ -111,3 +114,43 @@ class Game():
                          Required by MCTS for hashing.
         """
         pass
+
+    def getNextStateBatch(self, boards, players, actions):
+        """
+        Input:
+            boards: B boards stacked along the first axis
+            players: array of the B current players
+            actions: array of the B actions taken
+
+        Returns:
+            nextBoards: the B boards after applying the actions
+            nextPlayers: array of the B players who play in the next turn
+
+        Applies getNextState to each board; games override it with a
+        vectorized version where they can.
+        """
+        results = [self.getNextState(board, player, action) for board, player, action in zip(boards, players, actions)]
+        return np.array([r[0] for r in results]), np.array([r[1] for r in results])
+
+    def getValidMovesBatch(self, boards, players):
+        """
+        Input:
+            boards: B boards stacked along the first axis
+            players: array of the B current players
+
+        Returns:
+            validMoves: array of shape (B, self.getActionSize()), row i is
+                        getValidMoves(boards[i], players[i])
+        """
+        return np.array([self.getValidMoves(board, player) for board, player in zip(boards, players)])
+
+    def getGameEndedBatch(self, boards, players):
+        """
+        Input:
+            boards: B boards stacked along the first axis
+            players: array of the B current players
+
+        Returns:
+            r: float array of the B values getGameEnded(boards[i], players[i])
+        """
+        return np.array([self.getGameEnded(board, player) for board, player in zip(boards, players)], dtype=float)
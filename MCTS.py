@@ -1,5 +1,6 @@
 import math
 import numpy as np
+from PredictionCache import PredictionCache
 EPS = 1e-8
 
 class MCTS():
@@ -19,6 +20,10 @@ class MCTS():
         self.Es = {}        # stores game.getGameEnded ended for board s
         self.Vs = {}        # stores game.getValidMoves for board s
 
+        # nnet predictions shared with every other MCTS using the same nnet
+        cacheSize = getattr(args, 'predictionCacheSize', 0)
+        self.cache = PredictionCache.forNet(nnet, cacheSize) if cacheSize > 0 else None
+
     def getActionProb(self, canonicalBoard, temp=1):
         """
         This function performs numMCTSSims simulations of MCTS starting from
@@ -75,7 +80,10 @@ class MCTS():
 
         if s not in self.Ps:
             # leaf node
-            self.Ps[s], v = self.nnet.predict(canonicalBoard)
+            if self.cache is not None:
+                self.Ps[s], v = self.cache.predict(canonicalBoard, s)
+            else:
+                self.Ps[s], v = self.nnet.predict(canonicalBoard)
             valids = self.game.getValidMoves(canonicalBoard, 1)
             self.Ps[s] = self.Ps[s]*valids      # masking invalid moves
             sum_Ps_s = np.sum(self.Ps[s])
@@ -115,6 +123,9 @@ class MCTS():
         next_s = self.game.getCanonicalForm(next_s, next_player)
 
         v = self.search(next_s)
+        if next_player == 1:
+            # same player moves again (one unit after another in a turn), so its value isn't negated
+            v = -v
 
         if (s,a) in self.Qsa:
             self.Qsa[(s,a)] = (self.Nsa[(s,a)]*self.Qsa[(s,a)] + v)/(self.Nsa[(s,a)]+1)
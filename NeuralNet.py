@@ -5,8 +5,13 @@ class NeuralNet():
     network does not consider the current player, and instead only deals with
     the canonical form of the board.
 
+    train, load_checkpoint and set_weights must call weightsChanged, which
+    increments weightsVersion, so callers can tell when cached predictions are
+    stale (see PredictionCache.py).
+
     See othello/NNet.py for an example implementation.
     """
+    weightsVersion = 0
 
     def __init__(self, game):
         pass
@@ -43,8 +48,38 @@ class NeuralNet():
         """
         pass
 
+    def snapshot_checkpoint(self):
+        """
+        Returns a function write(folder, filename) that saves the current
+        parameters like save_checkpoint, from a snapshot that later training
+        doesn't change, so it can run on another thread. Returns None if the
+        network can only be saved on its own thread (e.g. tensorflow graphs).
+        """
+        return None
+
     def load_checkpoint(self, folder, filename):
         """
         Loads parameters of the neural network from folder/filename
         """
         pass
+
+    def get_weights(self):
+        """
+        Returns an in-memory snapshot of the parameters of the neural network.
+        The snapshot must not change when the network is trained further, so
+        it can later be restored with set_weights or copied into another
+        instance of the same network.
+        """
+        pass
+
+    def set_weights(self, weights):
+        """
+        Restores parameters from a snapshot returned by get_weights
+        """
+        pass
+
+    def weightsChanged(self):
+        """
+        Marks predictions made with the previous parameters as stale
+        """
+        self.weightsVersion += 1
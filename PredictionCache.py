@@ -0,0 +1,67 @@
+import weakref
+from collections import OrderedDict
+
+
+class PredictionCache():
+    """
+    A bounded LRU cache of nnet.predict results, keyed by the string
+    representation of the canonical board. There is one cache per network
+    (see forNet), so every MCTS instance searching with the same network
+    shares it, e.g. across the episodes of an iteration. All entries are
+    dropped as soon as the weightsVersion of the network changes.
+    """
+    _caches = weakref.WeakKeyDictionary()
+
+    def __init__(self, nnet, maxSize):
+        self.nnet = weakref.proxy(nnet)
+        self.maxSize = maxSize
+        self.entries = OrderedDict()    # stores (pi, v) for board s, least recently used first
+        self.version = nnet.weightsVersion
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def forNet(nnet, maxSize):
+        """
+        Returns the cache shared by all users of nnet, creating it on first use.
+        """
+        cache = PredictionCache._caches.get(nnet)
+        if cache is None:
+            cache = PredictionCache(nnet, maxSize)
+            PredictionCache._caches[nnet] = cache
+        cache.maxSize = maxSize
+        return cache
+
+    def predict(self, board, s):
+        """
+        Input:
+            board: canonical board, passed to nnet.predict on a miss
+            s: game.stringRepresentation(board)
+
+        Returns:
+            pi, v: as returned by nnet.predict. pi is a copy, so callers may
+                   modify it.
+        """
+        if self.version != self.nnet.weightsVersion:
+            self.entries.clear()
+            self.version = self.nnet.weightsVersion
+
+        if s in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(s)
+            pi, v = self.entries[s]
+            return pi.copy(), v
+
+        self.misses += 1
+        pi, v = self.nnet.predict(board)
+        self.entries[s] = (pi, v)
+        if len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+        return pi.copy(), v
+
+    def hitRate(self):
+        lookups = self.hits + self.misses
+        return float(self.hits)/lookups if lookups else 0.
+
+    def __str__(self):
+        return 'hits: %d, misses: %d, hit rate: %.3f, size: %d/%d' % (self.hits, self.misses, self.hitRate(), len(self.entries), self.maxSize)
@@ -0,0 +1,89 @@
+import numpy as np
+from Game import Game
+
+
+class SquareBoardGame(Game):
+    """
+    Shared Game implementation for games on an n x n numpy board where action
+    n*x+y puts a stone of the player on square (x,y) and action n*n passes,
+    e.g. Othello, Gobang and TicTacToe.
+
+    All methods work on the numpy board directly. Only getNextState copies
+    the board, once; valid moves are returned as int8 masks.
+    Subclasses implement getGameEnded and override the rules that differ.
+    """
+    def __init__(self, n):
+        self.n = n
+
+    def getInitBoard(self):
+        # return initial board (numpy board)
+        return np.zeros((self.n, self.n), dtype=int)
+
+    def getBoardSize(self):
+        # (a,b) tuple
+        return (self.n, self.n)
+
+    def getActionSize(self):
+        # return number of actions
+        return self.n*self.n + 1
+
+    def getNextState(self, board, player, action):
+        # if player takes action on board, return next (board,player)
+        # action must be a valid move
+        if action == self.n*self.n:
+            return (board, -player)
+        move = divmod(int(action), self.n)
+        assert board[move] == 0
+        b = np.copy(board)
+        b[move] = player
+        return (b, -player)
+
+    def getValidMoves(self, board, player):
+        # return a fixed size binary vector, every empty square or pass
+        valids = np.zeros(self.getActionSize(), dtype=np.int8)
+        np.equal(board.reshape(-1), 0, out=valids[:-1], casting='unsafe')
+        if not valids.any():
+            valids[-1] = 1
+        return valids
+
+    def getNextStateBatch(self, boards, players, actions):
+        # vectorized getNextState, one copy of all boards
+        players = np.asarray(players)
+        actions = np.asarray(actions, dtype=int)
+        nextBoards = np.copy(boards)
+        placed = np.nonzero(actions != self.n*self.n)[0]
+        x, y = np.divmod(actions[placed], self.n)
+        assert (nextBoards[placed, x, y] == 0).all()
+        nextBoards[placed, x, y] = players[placed]
+        return nextBoards, -players
+
+    def getValidMovesBatch(self, boards, players):
+        # vectorized getValidMoves, every empty square or pass
+        valids = np.zeros((len(boards), self.getActionSize()), dtype=np.int8)
+        np.equal(boards.reshape(len(boards), -1), 0, out=valids[:, :-1], casting='unsafe')
+        valids[:, -1] = ~valids[:, :-1].any(axis=1)
+        return valids
+
+    def getCanonicalForm(self, board, player):
+        # return state if player==1, else return -state if player==-1
+        return player*board
+
+    def getSymmetries(self, board, pi):
+        # mirror, rotational
+        assert(len(pi) == self.n**2+1)  # 1 for pass
+        pi_board = np.reshape(pi[:-1], (self.n, self.n))
+        l = []
+
+        for i in range(1, 5):
+            for j in [True, False]:
+                newB = np.rot90(board, i)
+                newPi = np.rot90(pi_board, i)
+                if j:
+                    newB = np.fliplr(newB)
+                    newPi = np.fliplr(newPi)
+                l += [(newB, list(newPi.ravel()) + [pi[-1]])]
+        return l
+
+    def stringRepresentation(self, board):
+        # nxn numpy array (canonical board)
+        return board.tobytes()
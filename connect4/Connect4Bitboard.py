@@ -0,0 +1,84 @@
+'''
+Bitboard representation of Connect4.
+Board data:
+  the classic layout with height+1 bits per column: bit col*(height+1)+row is
+  the square in column col, row rows above the bottom. The extra top bit of
+  every column stays empty, so shifted lines never wrap into the next column.
+  A position is held as (own, mask): the stones of one player and all stones.
+  Python ints are unbounded, so any size works; 7x6 fits in 64 bits.
+'''
+import numpy as np
+
+
+class Bitboard():
+
+    def __init__(self, height, width, win_length):
+        self.height = height
+        self.width = width
+        self.win_length = win_length
+
+        self.bottom = [1 << (col*(height+1)) for col in range(width)]
+        self.top = [1 << (col*(height+1) + height-1) for col in range(width)]
+        self.columns = [((1 << height) - 1) << (col*(height+1)) for col in range(width)]
+        self.full = sum(self.columns)
+
+        # shifts between neighbours on a line: vertical, horizontal and both diagonals
+        self.shifts = [1, height+1, height+2, height]
+
+    def from_numpy(self, board, color):
+        """Returns (own, mask) for the given color of a numpy board (row 0 at the top)."""
+        board = np.asarray(board)
+        bits = np.zeros((self.width, self.height+1), dtype=bool)
+        bits[:, :self.height] = (board != 0)[::-1].T
+        mask = int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+        bits[:, :self.height] = (board == color)[::-1].T
+        own = int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+        return own, mask
+
+    def can_play(self, mask, col):
+        return mask & self.top[col] == 0
+
+    def move(self, mask, col):
+        """Returns the bit of the stone played in col."""
+        return (mask + self.bottom[col]) & self.columns[col]
+
+    def play(self, own, mask, col):
+        """Plays col for own and returns the new (own, mask)."""
+        move = self.move(mask, col)
+        return own | move, mask | move
+
+    def row(self, move, col):
+        """Returns the numpy row (0 at the top) of a move bit in col."""
+        return self.height - move.bit_length() + col*(self.height+1)
+
+    def is_win(self, own):
+        """Checks if own has win_length stones in a row on any line."""
+        for shift in self.shifts:
+            # runs marks the squares starting a run of length stones towards lower bits
+            runs, length = own, 1
+            while 2*length <= self.win_length:
+                runs &= runs >> (length*shift)
+                length *= 2
+            if length < self.win_length:
+                runs &= runs >> ((self.win_length - length)*shift)
+            if runs:
+                return True
+        return False
+
+    def is_win_at(self, own, move):
+        """Checks if the stone at the move bit is part of win_length stones
+        in a row, only walking the four lines through it."""
+        for shift in self.shifts:
+            count, bit = 1, move << shift
+            while count < self.win_length and own & bit:
+                count, bit = count + 1, bit << shift
+            bit = move >> shift
+            while count < self.win_length and own & bit:
+                count, bit = count + 1, bit >> shift
+            if count >= self.win_length:
+                return True
+        return False
+
+    def key(self, own, mask):
+        """Unique integer key of the position."""
+        return own + mask
@@ -1,19 +1,26 @@
 import sys
 import numpy as np
+from collections import OrderedDict
 
 sys.path.append('..')
 from Game import Game
-from .Connect4Logic import Board
+from .Connect4Logic import Board, has_run_batch
+from .Connect4Bitboard import Bitboard
 
 
 class Connect4Game(Game):
     """
     Connect4 Game class implementing the alpha-zero-general Game interface.
+    Boards are numpy arrays; the rules run on their bitboard form.
     """
 
-    def __init__(self, height=None, width=None, win_length=None, np_pieces=None):
+    def __init__(self, height=None, width=None, win_length=None, np_pieces=None, positionCacheSize=10000):
         Game.__init__(self)
         self._base_board = Board(height, width, win_length, np_pieces)
+        self._bitboard = Bitboard(self._base_board.height, self._base_board.width, self._base_board.win_length)
+        # winner of boards returned by getNextState, checked from the last stone only
+        self.positionCache = OrderedDict()
+        self.positionCacheSize = positionCacheSize
 
     def getInitBoard(self):
         return self._base_board.np_pieces
@@ -26,30 +33,67 @@ class Connect4Game(Game):
 
     def getNextState(self, board, player, action):
         """Returns a copy of the board with updated move, original board is unmodified."""
-        b = self._base_board.with_np_pieces(np_pieces=np.copy(board))
-        b.add_stone(action, player)
-        return b.np_pieces, -player
+        if action < 0:
+            action += self._base_board.width
+        own, mask = self._bitboard.from_numpy(board, player)
+        if not self._bitboard.can_play(mask, action):
+            raise ValueError("Can't play column %s on board %s" % (action, board))
+        move = self._bitboard.move(mask, action)
+        b = np.copy(board)
+        b[self._bitboard.row(move, action)][action] = player
+        winner = self._cachedWinner(board)
+        if winner is None:
+            winner = player if self._bitboard.is_win(own) else -player if self._bitboard.is_win(mask ^ own) else 0
+        if winner == 0 and self._bitboard.is_win_at(own | move, move):
+            winner = player
+        key, _ = self._positionKeys(b)
+        self.positionCache[key] = winner
+        if len(self.positionCache) > self.positionCacheSize:
+            self.positionCache.popitem(last=False)
+        return b, -player
 
     def getValidMoves(self, board, player):
         "Any zero value in top row in a valid move"
-        return self._base_board.with_np_pieces(np_pieces=board).get_valid_moves()
+        return board[0] == 0
 
     def getGameEnded(self, board, player):
-        b = self._base_board.with_np_pieces(np_pieces=board)
-        winstate = b.get_win_state()
-        if winstate.is_ended:
-            if winstate.winner is None:
-                # draw has very little value.
-                return 1e-4
-            elif winstate.winner == player:
+        winner = self._cachedWinner(board)
+        if winner is None:
+            own, mask = self._bitboard.from_numpy(board, player)
+            if self._bitboard.is_win(own):
                 return +1
-            elif winstate.winner == -player:
+            if self._bitboard.is_win(mask ^ own):
                 return -1
-            else:
-                raise ValueError('Unexpected winstate found: ', winstate)
-        else:
-            # 0 used to represent unfinished game.
-            return 0
+        elif winner != 0:
+            return +1 if winner == player else -1
+        if (board[0] != 0).all():
+            # draw has very little value.
+            return 1e-4
+        # 0 used to represent unfinished game.
+        return 0
+
+    def getNextStateBatch(self, boards, players, actions):
+        height, width = self.getBoardSize()
+        players = np.asarray(players)
+        actions = np.asarray(actions, dtype=int)
+        actions = np.where(actions < 0, actions + width, actions)
+        index = np.arange(len(boards))
+        rows = height - 1 - np.count_nonzero(boards[index, :, actions], axis=1)
+        if (rows < 0).any():
+            raise ValueError("Can't play full columns %s" % actions[rows < 0])
+        nextBoards = np.copy(boards)
+        nextBoards[index, rows, actions] = players
+        return nextBoards, -players
+
+    def getValidMovesBatch(self, boards, players):
+        return boards[:, 0, :] == 0
+
+    def getGameEndedBatch(self, boards, players):
+        players = np.asarray(players).reshape(-1, 1, 1)
+        won = has_run_batch(boards == players, self._base_board.win_length)
+        lost = has_run_batch(boards == -players, self._base_board.win_length)
+        full = (boards[:, 0, :] != 0).all(axis=1)
+        return np.where(won, 1., np.where(lost, -1., np.where(full, 1e-4, 0.)))
 
     def getCanonicalForm(self, board, player):
         # Flip player from 1 to -1
@@ -60,7 +104,24 @@ class Connect4Game(Game):
         return [(board, pi), (board[:, ::-1], pi[::-1])]
 
     def stringRepresentation(self, board):
-        return str(self._base_board.with_np_pieces(np_pieces=board))
+        """Returns the integer key of the bitboard position (for player 1)."""
+        return self._bitboard.key(*self._bitboard.from_numpy(board, 1))
+
+    def _positionKeys(self, board):
+        # keys of board and of its negation (the canonical form for the other player)
+        white, black = (board > 0).tobytes(), (board < 0).tobytes()
+        return white + black, black + white
+
+    def _cachedWinner(self, board):
+        # winner remembered by getNextState for board or -board, None if unknown
+        key, negatedKey = self._positionKeys(board)
+        winner = self.positionCache.get(key)
+        if winner is not None:
+            return winner
+        winner = self.positionCache.get(negatedKey)
+        if winner is not None:
+            return -winner
+        return None
 
 
 def display(board):
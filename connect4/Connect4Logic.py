@@ -1,16 +1,35 @@
-from collections import namedtuple
 import numpy as np
 
 DEFAULT_HEIGHT = 6
 DEFAULT_WIDTH = 7
 DEFAULT_WIN_LENGTH = 4
 
-WinState = namedtuple('WinState', 'is_ended winner')
+
+def has_run_batch(pieces, win_length):
+    """Returns for each boolean board of the stack pieces (B, height, width)
+    whether it has win_length True squares in a row."""
+    b, height, width = pieces.shape
+    h, w = height - win_length + 1, width - win_length + 1
+    found = np.zeros(b, dtype=bool)
+    if h > 0:
+        run = np.logical_and.reduce([pieces[:, i:h + i, :] for i in range(win_length)])
+        found |= run.reshape(b, -1).any(axis=1)
+    if w > 0:
+        run = np.logical_and.reduce([pieces[:, :, i:w + i] for i in range(win_length)])
+        found |= run.reshape(b, -1).any(axis=1)
+    if h > 0 and w > 0:
+        run = np.logical_and.reduce([pieces[:, i:h + i, i:w + i] for i in range(win_length)])
+        found |= run.reshape(b, -1).any(axis=1)
+        run = np.logical_and.reduce([pieces[:, i:h + i, win_length - 1 - i:width - i] for i in range(win_length)])
+        found |= run.reshape(b, -1).any(axis=1)
+    return found
 
 
 class Board():
     """
-    Connect4 Board.
+    Connect4 Board. It holds the board size and the initial pieces; the rules
+    run on the bitboard form (see Connect4Bitboard) and on stacks of boards
+    (see has_run_batch).
     """
 
     def __init__(self, height=None, width=None, win_length=None, np_pieces=None):
@@ -25,57 +44,5 @@ class Board():
             self.np_pieces = np_pieces
             assert self.np_pieces.shape == (self.height, self.width)
 
-    def add_stone(self, column, player):
-        "Create copy of board containing new stone."
-        available_idx, = np.where(self.np_pieces[:, column] == 0)
-        if len(available_idx) == 0:
-            raise ValueError("Can't play column %s on board %s" % (column, self))
-
-        self.np_pieces[available_idx[-1]][column] = player
-
-    def get_valid_moves(self):
-        "Any zero value in top row in a valid move"
-        return self.np_pieces[0] == 0
-
-    def get_win_state(self):
-        for player in [-1, 1]:
-            player_pieces = self.np_pieces == -player
-            # Check rows & columns for win
-            if (self._is_straight_winner(player_pieces) or
-                self._is_straight_winner(player_pieces.transpose()) or
-                self._is_diagonal_winner(player_pieces)):
-                return WinState(True, -player)
-
-        # draw has very little value.
-        if not self.get_valid_moves().any():
-            return WinState(True, None)
-
-        # Game is not ended yet.
-        return WinState(False, None)
-
-    def with_np_pieces(self, np_pieces):
-        """Create copy of board with specified pieces."""
-        if np_pieces is None:
-            np_pieces = self.np_pieces
-        return Board(self.height, self.width, self.win_length, np_pieces)
-
-    def _is_diagonal_winner(self, player_pieces):
-        """Checks if player_pieces contains a diagonal win."""
-        win_length = self.win_length
-        for i in range(len(player_pieces) - win_length + 1):
-            for j in range(len(player_pieces[0]) - win_length + 1):
-                if all(player_pieces[i + x][j + x] for x in range(win_length)):
-                    return True
-            for j in range(win_length - 1, len(player_pieces[0])):
-                if all(player_pieces[i + x][j - x] for x in range(win_length)):
-                    return True
-        return False
-
-    def _is_straight_winner(self, player_pieces):
-        """Checks if player_pieces contains a vertical or horizontal win."""
-        run_lengths = [player_pieces[:, i:i + self.win_length].sum(axis=1)
-                       for i in range(len(player_pieces) - self.win_length + 2)]
-        return max([x.max() for x in run_lengths]) >= self.win_length
-
     def __str__(self):
         return str(self.np_pieces)
@@ -1,5 +1,7 @@
 import numpy as np
 
+from .Connect4Solver import Connect4Solver
+
 
 class RandomPlayer():
     def __init__(self, game):
@@ -62,3 +64,25 @@ class OneStepLookaheadConnect4Player():
             raise Exception('No valid moves remaining: %s' % game.stringRepresentation(board))
 
         return ret_move
+
+
+class PerfectConnect4Player():
+    """Plays an exactly best move with Connect4Solver, preferring the center among equal scores."""
+    def __init__(self, game, book=None):
+        # the solver only knows 4 in a row and would return wrong moves for other games
+        assert game._base_board.win_length == 4, "Connect4Solver needs win_length 4, not %s" % game._base_board.win_length
+        height, width = game.getBoardSize()
+        self.game = game
+        self.solver = Connect4Solver(height, width, book)
+
+    def play(self, board):
+        scores = self.scores(board)
+        best = max(s for s in scores if s is not None)
+        for col in self.solver.column_order:
+            if scores[col] == best:
+                return col
+
+    def scores(self, board):
+        """Returns the exact score of each column of a canonical board, None for full columns."""
+        own, mask = self.solver.bitboard.from_numpy(board, 1)
+        return self.solver.column_scores(own, mask)
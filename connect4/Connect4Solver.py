@@ -0,0 +1,248 @@
+'''
+Exact Connect4 solver (4 in a row, default 7x6 board), see
+PerfectConnect4Player in Connect4Players.py to use it in the Arena.
+
+Negamax with alpha-beta pruning, null window search, center-first move
+ordering refined by the number of threats a move creates, a transposition
+table and an optional opening book, following the approach described in
+http://blog.gamesolver.org.
+
+Scores are from the point of view of the player to move: positive if that
+player wins, (height*width+1 - moves)/2 when winning with the next stone and
+one less for every stone of that player played later; 0 is a draw.
+
+Positions are written as move sequences of 1-based column digits, e.g.
+"4453". Batch mode labels a file with one sequence per line:
+
+    python -m connect4.Connect4Solver positions.txt labels.txt [book.txt]
+
+Every output line is "sequence score s1 .. sw" with the score of each column
+("-" for a full column), so the argmax columns are the exact best moves. The
+first two fields are also the opening book format.
+'''
+import sys
+
+from .Connect4Bitboard import Bitboard
+
+
+class Connect4Solver():
+
+    def __init__(self, height=6, width=7, book=None, table_size=4000000):
+        """
+        Input:
+            book: optional path to a file of "sequence score" lines
+            table_size: the transposition table is cleared when it holds more
+                        entries than this
+        """
+        self.height = height
+        self.width = width
+        self.bitboard = Bitboard(height, width, 4)
+        self.size = height*width
+
+        self.board_mask = self.bitboard.full
+        self.bottom_mask = sum(self.bitboard.bottom)
+        # center columns first
+        self.column_order = sorted(range(width), key=lambda col: abs(2*col - (width-1)))
+
+        self.table = {}     # stores (is_lower_bound, score) for position key
+        self.table_size = table_size
+        self.book = {}      # stores exact score for position key
+        if book is not None:
+            self.load_book(book)
+        self.nodes = 0
+
+    def load_book(self, filename):
+        with open(filename) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 2:
+                    continue
+                own, mask = self.from_sequence(fields[0])
+                self.book[self.bitboard.key(own, mask)] = int(fields[1])
+                own, mask = self.mirror(own), self.mirror(mask)
+                self.book[self.bitboard.key(own, mask)] = int(fields[1])
+
+    def from_sequence(self, sequence):
+        """Returns (own, mask) of the player to move after playing the 1-based column digits."""
+        own, mask = 0, 0
+        for digit in sequence:
+            col = int(digit) - 1
+            if not 0 <= col < self.width or not self.bitboard.can_play(mask, col):
+                raise ValueError('Invalid move %s in sequence %s' % (digit, sequence))
+            if self.is_winning_move(own, mask, col):
+                raise ValueError('Sequence %s continues after a win' % sequence)
+            own, mask = self.bitboard.play(own, mask, col)
+            own ^= mask
+        return own, mask
+
+    def mirror(self, bits):
+        """Returns bits with the columns in reverse order."""
+        step = self.height + 1
+        column = (1 << step) - 1
+        mirrored = 0
+        for col in range(self.width):
+            mirrored |= ((bits >> (col*step)) & column) << ((self.width-1-col)*step)
+        return mirrored
+
+    def winning_squares(self, own, mask):
+        """Returns the empty squares that would complete 4 in a row for own."""
+        h = self.height
+        # vertical
+        r = (own << 1) & (own << 2) & (own << 3)
+        # horizontal and both diagonals
+        for shift in (h+1, h, h+2):
+            p = (own << shift) & (own << 2*shift)
+            r |= p & (own << 3*shift)
+            r |= p & (own >> shift)
+            p = (own >> shift) & (own >> 2*shift)
+            r |= p & (own << shift)
+            r |= p & (own >> 3*shift)
+        return r & (self.board_mask ^ mask)
+
+    def possible(self, mask):
+        """Returns the squares playable next, one per non full column."""
+        return (mask + self.bottom_mask) & self.board_mask
+
+    def is_winning_move(self, own, mask, col):
+        return self.winning_squares(own, mask) & self.possible(mask) & self.bitboard.columns[col] != 0
+
+    def non_losing_moves(self, own, mask):
+        """Returns the playable squares that do not let the opponent win next move."""
+        possible = self.possible(mask)
+        opponent_win = self.winning_squares(own ^ mask, mask)
+        forced = possible & opponent_win
+        if forced:
+            if forced & (forced - 1):
+                # two threats cannot both be blocked
+                return 0
+            possible = forced
+        # never play just below a square the opponent needs
+        return possible & ~(opponent_win >> 1)
+
+    def negamax(self, own, mask, moves, alpha, beta):
+        """
+        Returns the exact score if it is within (alpha, beta), otherwise a
+        bound on the same side of the window. The player to move must not be
+        able to win with the next stone.
+        """
+        self.nodes += 1
+        possible = self.non_losing_moves(own, mask)
+        if possible == 0:
+            return -((self.size - moves) // 2)
+        if moves >= self.size - 2:
+            return 0
+
+        lower = -((self.size - 2 - moves) // 2)
+        if alpha < lower:
+            alpha = lower
+            if alpha >= beta:
+                return alpha
+        upper = (self.size - 1 - moves) // 2
+        if beta > upper:
+            beta = upper
+            if alpha >= beta:
+                return beta
+
+        key = self.bitboard.key(own, mask)
+        entry = self.table.get(key)
+        if entry is not None:
+            is_lower_bound, score = entry
+            if is_lower_bound:
+                if alpha < score:
+                    alpha = score
+                    if alpha >= beta:
+                        return alpha
+            elif beta > score:
+                beta = score
+                if alpha >= beta:
+                    return beta
+        score = self.book.get(key)
+        if score is not None:
+            return score
+
+        candidates = []
+        for i, col in enumerate(self.column_order):
+            move = possible & self.bitboard.columns[col]
+            if move:
+                threats = bin(self.winning_squares(own | move, mask)).count('1')
+                candidates.append((-threats, i, move))
+        candidates.sort()
+
+        for _, _, move in candidates:
+            # the opponent moves next, with the stones that are not own
+            score = -self.negamax(own ^ mask, mask | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                self._store(key, (True, score))
+                return score
+            if score > alpha:
+                alpha = score
+
+        self._store(key, (False, alpha))
+        return alpha
+
+    def _store(self, key, entry):
+        if len(self.table) >= self.table_size:
+            self.table.clear()
+        self.table[key] = entry
+
+    def solve(self, own, mask, weak=False):
+        """
+        Returns the exact score of the position for the player to move, or
+        only its sign (-1, 0, 1) if weak.
+        """
+        moves = bin(mask).count('1')
+        if self.winning_squares(own, mask) & self.possible(mask):
+            return 1 if weak else (self.size + 1 - moves) // 2
+        lower, upper = -((self.size - moves) // 2), (self.size + 1 - moves) // 2
+        if weak:
+            lower, upper = -1, 1
+        # null window searches, halving the interval towards 0 first
+        while lower < upper:
+            med = lower + (upper - lower) // 2
+            if med <= 0 and int(lower / 2) < med:
+                med = int(lower / 2)
+            elif med >= 0 and int(upper / 2) > med:
+                med = int(upper / 2)
+            score = self.negamax(own, mask, moves, med, med + 1)
+            if score <= med:
+                upper = score
+            else:
+                lower = score
+        if weak:
+            # the search may end on a bound beyond the -1..1 window
+            return (lower > 0) - (lower < 0)
+        return lower
+
+    def column_scores(self, own, mask, weak=False):
+        """Returns the score of playing each column for the player to move, None for full columns."""
+        moves = bin(mask).count('1')
+        scores = [None]*self.width
+        for col in range(self.width):
+            if not self.bitboard.can_play(mask, col):
+                continue
+            if self.is_winning_move(own, mask, col):
+                scores[col] = 1 if weak else (self.size + 1 - moves) // 2
+            else:
+                own2, mask2 = self.bitboard.play(own, mask, col)
+                scores[col] = -self.solve(own2 ^ mask2, mask2, weak)
+        return scores
+
+    def label_file(self, in_filename, out_filename, weak=False):
+        """Writes "sequence score s1 .. sw" for every sequence in in_filename."""
+        with open(in_filename) as f_in, open(out_filename, 'w') as f_out:
+            for line in f_in:
+                fields = line.split()
+                if not fields:
+                    continue
+                own, mask = self.from_sequence(fields[0])
+                scores = self.column_scores(own, mask, weak)
+                playable = [s for s in scores if s is not None]
+                score = max(playable) if playable else 0
+                f_out.write('%s %d %s\n' % (fields[0], score, ' '.join('-' if s is None else str(s) for s in scores)))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print('usage: python -m connect4.Connect4Solver positions.txt labels.txt [book.txt]')
+        sys.exit(1)
+    Connect4Solver(book=sys.argv[3] if len(sys.argv) == 4 else None).label_file(sys.argv[1], sys.argv[2])
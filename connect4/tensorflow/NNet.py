@@ -40,6 +40,7 @@ class NNetWrapper(NeuralNet):
         """
         examples: list of examples, each example is of form (board, pi, v)
         """
+        self.weightsChanged()
 
         for epoch in range(args.epochs):
             print('EPOCH ::: ' + str(epoch + 1))
@@ -105,6 +106,14 @@ class NNetWrapper(NeuralNet):
         #print('PREDICTION TIME TAKEN : {0:03f}'.format(time.time()-start))
         return prob[0], v[0]
 
+    def get_weights(self):
+        return self.sess.run(self.nnet.graph.get_collection('variables'))
+
+    def set_weights(self, weights):
+        self.weightsChanged()
+        for variable, value in zip(self.nnet.graph.get_collection('variables'), weights):
+            variable.load(value, self.sess)
+
     def save_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
         filepath = os.path.join(folder, filename)
         if not os.path.exists(folder):
@@ -118,6 +127,7 @@ class NNetWrapper(NeuralNet):
             self.saver.save(self.sess, filepath)
 
     def load_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
+        self.weightsChanged()
         filepath = os.path.join(folder, filename)
         if not os.path.exists(filepath + '.meta'):
             raise("No model in path {}".format(filepath))
@@ -6,8 +6,10 @@ pytest-3 connect4
 from collections import namedtuple
 import textwrap
 import numpy as np
+import pytest
 
 from .Connect4Game import Connect4Game
+from .Connect4Players import PerfectConnect4Player
 
 # Tuple of (Board, Player, Game) to simplify testing.
 BPGTuple = namedtuple('BPGTuple', 'board player game')
@@ -37,7 +39,19 @@ def test_simple_moves():
          [ 0.  0.  0.  0.  0.  0.  0.]
          [ 0.  0.  0.  0.  1.  0.  0.]
          [ 1.  0.  0. -1.  1. -1. -1.]]""")
-    assert expected == game.stringRepresentation(board)
+    assert expected == str(board)
+
+
+def test_string_representation():
+    """Tests the position key is an int that tells apart positions and players."""
+    keys = {}
+    for moves in [[], [3], [4], [3, 4], [4, 3], [3, 3]]:
+        board, player, game = init_board_from_moves(moves)
+        for b in [board, game.getCanonicalForm(board, -1)]:
+            key = game.stringRepresentation(b)
+            assert isinstance(key, int)
+            keys[str(b + 0.)] = key  # + 0. turns -0. into 0.
+    assert len(set(keys.values())) == len(keys)
 
 
 def test_overfull_column():
@@ -82,7 +96,7 @@ def test_symmetries():
          [-1.  0.  0.  0.  0.  0.  0.]
          [-1.  0.  0.  0.  0.  0.  0.]
          [ 1.  1.  0.  0.  0.  0.  1.]]""")
-    assert expected_board1 == game.stringRepresentation(board1)
+    assert expected_board1 == str(board1)
 
     expected_board2 = textwrap.dedent("""\
         [[ 0.  0.  0.  0.  0.  0.  0.]
@@ -91,7 +105,8 @@ def test_symmetries():
          [ 0.  0.  0.  0.  0.  0. -1.]
          [ 0.  0.  0.  0.  0.  0. -1.]
          [ 1.  0.  0.  0.  0.  1.  1.]]""")
-    assert expected_board2 == game.stringRepresentation(board2)
+    assert expected_board2 == str(board2)
+    assert game.stringRepresentation(board1) != game.stringRepresentation(board2)
 
 
 def test_game_ended():
@@ -165,3 +180,67 @@ def test_immutable_move():
 
     assert original_board_string == game.stringRepresentation(board)
     assert original_board_string != game.stringRepresentation(new_np_pieces)
+
+
+def test_game_ended_non_default_size():
+    """Tests bitboard wins on non-default sizes and canonical boards."""
+    game = Connect4Game(height=4, width=10, win_length=3)
+    board, player = game.getInitBoard(), 1
+    for move in [7, 7, 8, 8]:
+        board, player = game.getNextState(board, player, move)
+        assert game.getGameEnded(board, player) == 0
+    board, player = game.getNextState(board, player, 9)
+    assert game.getGameEnded(board, player) == -1
+    assert game.getGameEnded(game.getCanonicalForm(board, player), 1) == -1
+    assert game.getGameEnded(-board, -player) == -1
+
+
+def test_last_stone_win_matches_full_scan():
+    """Tests winners remembered from the last stone agree with a full scan of uncached boards."""
+    rng = np.random.RandomState(0)
+    for height, width, win_length in [(6, 7, 4), (4, 10, 3), (7, 5, 5)]:
+        game = Connect4Game(height, width, win_length)
+        uncached = Connect4Game(height, width, win_length, positionCacheSize=0)
+        for _ in range(20):
+            board, player = game.getInitBoard(), 1
+            while game.getGameEnded(board, player) == 0:
+                board, player = game.getNextState(board, player, rng.choice(np.nonzero(game.getValidMoves(board, player))[0]))
+                canonical = game.getCanonicalForm(board, player)
+                assert game.getGameEnded(board, player) == uncached.getGameEnded(board, player)
+                assert game.getGameEnded(canonical, 1) == uncached.getGameEnded(canonical, 1)
+
+
+def test_perfect_player():
+    """Tests the solver scores and best move of a position from move sequence 2567714646634572."""
+    board, player, game = init_board_from_moves([int(c) - 1 for c in "2567714646634572"])
+    perfect = PerfectConnect4Player(game)
+    canonical = game.getCanonicalForm(board, player)
+    assert perfect.scores(canonical) == [3, 4, -12, 13, 7, 3, 12]
+    assert perfect.play(canonical) == 3
+    with pytest.raises(AssertionError):
+        PerfectConnect4Player(Connect4Game(win_length=5))
+
+
+def test_batch_matches_single_board():
+    """Tests the batched rules agree with the single board methods."""
+    game = Connect4Game(height=5, width=6)
+    rng = np.random.RandomState(0)
+    boards, players = [], []
+    for _ in range(50):
+        board, player = game.getInitBoard(), 1
+        for _ in range(rng.randint(30)):
+            if game.getGameEnded(board, player) != 0:
+                break
+            board, player = game.getNextState(board, player, rng.choice(np.nonzero(game.getValidMoves(board, player))[0]))
+        boards.append(board)
+        players.append(player)
+    boards, players = np.array(boards), np.array(players)
+
+    assert (game.getGameEndedBatch(boards, players) == [game.getGameEnded(b, p) for b, p in zip(boards, players)]).all()
+    valids = game.getValidMovesBatch(boards, players)
+    assert (valids == [game.getValidMoves(b, p) for b, p in zip(boards, players)]).all()
+    actions = [np.nonzero(v)[0][-1] for v in valids]
+    nextBoards, nextPlayers = game.getNextStateBatch(boards, players, actions)
+    for i in range(len(boards)):
+        board, player = game.getNextState(boards[i], players[i], actions[i])
+        assert (nextBoards[i] == board).all() and nextPlayers[i] == player
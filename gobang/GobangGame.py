@@ -1,104 +1,113 @@
 from __future__ import print_function
 import sys
 sys.path.append('..')
-from Game import Game
-from .GobangLogic import Board
+from SquareBoardGame import SquareBoardGame
+from .GobangLogic import get_winner, get_winners, is_win_at, get_neighbourhood
 import numpy as np
+from collections import OrderedDict
 
 
-class GobangGame(Game):
-    def __init__(self, n=15, nir=5):
-        self.n = n
+class GobangGame(SquareBoardGame):
+    def __init__(self, n=15, nir=5, candidateDistance=0, positionCacheSize=10000):
+        """
+        Input:
+            candidateDistance: if > 0, getValidMoves only returns the empty
+                               squares within this distance of a stone
+        """
+        SquareBoardGame.__init__(self, n)
         self.n_in_row = nir
-
-    def getInitBoard(self):
-        # return initial board (numpy board)
-        b = Board(self.n)
-        return np.array(b.pieces)
-
-    def getBoardSize(self):
-        # (a,b) tuple
-        return (self.n, self.n)
-
-    def getActionSize(self):
-        # return number of actions
-        return self.n * self.n + 1
+        self.candidateDistance = candidateDistance
+        self._candidates = np.empty((n, n), dtype=bool)  # scratch buffer of getValidMoves
+        # (winner, squares near stones) of boards returned by getNextState,
+        # both updated from the last stone only
+        self.positionCache = OrderedDict()
+        self.positionCacheSize = positionCacheSize
 
     def getNextState(self, board, player, action):
         # if player takes action on board, return next (board,player)
         # action must be a valid move
         if action == self.n * self.n:
             return (board, -player)
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-        move = (int(action / self.n), action % self.n)
-        b.execute_move(move, player)
-        return (b.pieces, -player)
+        b, _ = SquareBoardGame.getNextState(self, board, player, action)
+        move = divmod(int(action), self.n)
+        near = None
+        if self.candidateDistance > 0:
+            near = np.copy(self._getNeighbourhood(board))
+            d = self.candidateDistance
+            near[max(move[0] - d, 0):move[0] + d + 1, max(move[1] - d, 0):move[1] + d + 1] = True
+        key, _ = self._positionKeys(b)
+        self.positionCache[key] = (player if is_win_at(b, move, self.n_in_row) else 0, near)
+        if len(self.positionCache) > self.positionCacheSize:
+            self.positionCache.popitem(last=False)
+        return (b, -player)
 
     # modified
     def getValidMoves(self, board, player):
         # return a fixed size binary vector
-        valids = [0] * self.getActionSize()
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-        legalMoves = b.get_legal_moves(player)
-        if len(legalMoves) == 0:
-            valids[-1] = 1
-            return np.array(valids)
-        for x, y in legalMoves:
-            valids[self.n * x + y] = 1
-        return np.array(valids)
+        # with candidateDistance, only the empty squares near stones
+        if self.candidateDistance > 0:
+            candidates = self._candidates
+            np.equal(board, 0, out=candidates)
+            np.logical_and(candidates, self._getNeighbourhood(board), out=candidates)
+            if candidates.any():
+                valids = np.zeros(self.getActionSize(), dtype=np.int8)
+                valids[:-1] = candidates.ravel()
+                return valids
+        return self.getAllValidMoves(board, player)
+
+    def getValidMovesBatch(self, boards, players):
+        valids = SquareBoardGame.getValidMovesBatch(self, boards, players)
+        if self.candidateDistance > 0:
+            candidates = valids[:, :-1].astype(bool)
+            candidates &= get_neighbourhood(boards, self.candidateDistance).reshape(len(boards), -1)
+            # boards without stones keep every empty square
+            restricted = candidates.any(axis=1)
+            valids[restricted, :-1] = candidates[restricted]
+        return valids
+
+    def getAllValidMoves(self, board, player):
+        # every empty square, whatever candidateDistance is
+        return SquareBoardGame.getValidMoves(self, board, player)
 
     # modified
     def getGameEnded(self, board, player):
         # return 0 if not ended, 1 if player 1 won, -1 if player 1 lost
         # player = 1
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-        n = self.n_in_row
-
-        for w in range(self.n):
-            for h in range(self.n):
-                if (w in range(self.n - n + 1) and board[w][h] != 0 and
-                        len(set(board[i][h] for i in range(w, w + n))) == 1):
-                    return board[w][h]
-                if (h in range(self.n - n + 1) and board[w][h] != 0 and
-                        len(set(board[w][j] for j in range(h, h + n))) == 1):
-                    return board[w][h]
-                if (w in range(self.n - n + 1) and h in range(self.n - n + 1) and board[w][h] != 0 and
-                        len(set(board[w + k][h + k] for k in range(n))) == 1):
-                    return board[w][h]
-                if (w in range(self.n - n + 1) and h in range(n - 1, self.n) and board[w][h] != 0 and
-                        len(set(board[w + l][h - l] for l in range(n))) == 1):
-                    return board[w][h]
-        if b.has_legal_moves():
+        winner = self._cachedPosition(board)[0]
+        if winner is None:
+            winner = get_winner(board, self.n_in_row)
+        if winner != 0:
+            return winner
+        if np.count_nonzero(board) < board.size:
             return 0
         return 1e-4
 
-    def getCanonicalForm(self, board, player):
-        # return state if player==1, else return -state if player==-1
-        return player * board
-
-    # modified
-    def getSymmetries(self, board, pi):
-        # mirror, rotational
-        assert(len(pi) == self.n**2 + 1)  # 1 for pass
-        pi_board = np.reshape(pi[:-1], (self.n, self.n))
-        l = []
-
-        for i in range(1, 5):
-            for j in [True, False]:
-                newB = np.rot90(board, i)
-                newPi = np.rot90(pi_board, i)
-                if j:
-                    newB = np.fliplr(newB)
-                    newPi = np.fliplr(newPi)
-                l += [(newB, list(newPi.ravel()) + [pi[-1]])]
-        return l
-
-    def stringRepresentation(self, board):
-        # 8x8 numpy array (canonical board)
-        return board.tostring()
+    def getGameEndedBatch(self, boards, players):
+        winners = get_winners(boards, self.n_in_row).astype(float)
+        draws = np.count_nonzero(boards.reshape(len(boards), -1), axis=1) == self.n * self.n
+        return np.where(winners != 0, winners, np.where(draws, 1e-4, 0.))
+
+    def _positionKeys(self, board):
+        # keys of board and of its negation (the canonical form for the other player)
+        white, black = (board > 0).tobytes(), (board < 0).tobytes()
+        return white + black, black + white
+
+    def _cachedPosition(self, board):
+        # (winner, near) remembered by getNextState for board or -board, (None, None) if unknown
+        key, negatedKey = self._positionKeys(board)
+        position = self.positionCache.get(key)
+        if position is not None:
+            return position
+        position = self.positionCache.get(negatedKey)
+        if position is not None:
+            return (-position[0], position[1])
+        return (None, None)
+
+    def _getNeighbourhood(self, board):
+        near = self._cachedPosition(board)[1]
+        if near is None:
+            near = get_neighbourhood(board, self.candidateDistance)
+        return near
 
 
 def display(board):
@@ -10,6 +10,10 @@ Board data:
 Squares are stored and manipulated as (x,y) tuples.
 x is the column, y is the row.
 '''
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+
 class Board():
     def __init__(self, n):
         "Set up initial board configuration."
@@ -54,3 +58,92 @@ class Board():
         assert self[x][y] == 0
         self[x][y] = color
 
+
+
+def get_winner(pieces, n_in_row):
+    """Returns the color (1 or -1) with n_in_row stones in a row on the numpy
+    board pieces, 0 if there is none.
+    Every window of n_in_row squares on a line is summed at once through
+    strided views, a window sums to n_in_row*color only if it is all color.
+    """
+    pieces = np.ascontiguousarray(pieces)
+    n = pieces.shape[0]
+    m = n - n_in_row + 1
+    if m <= 0:
+        return 0
+    s0, s1 = pieces.strides
+    windows = [
+        as_strided(pieces, (m, n, n_in_row), (s0, s1, s0)),                     # along x
+        as_strided(pieces, (n, m, n_in_row), (s0, s1, s1)),                     # along y
+        as_strided(pieces, (m, m, n_in_row), (s0, s1, s0 + s1)),                # diagonal
+        as_strided(pieces[:, n_in_row - 1:], (m, m, n_in_row), (s0, s1, s0 - s1)),  # anti-diagonal
+    ]
+    for w in windows:
+        sums = w.sum(axis=2)
+        if (sums == n_in_row).any():
+            return 1
+        if (sums == -n_in_row).any():
+            return -1
+    return 0
+
+
+def get_winners(boards, n_in_row):
+    """Returns get_winner of each board in the stack boards of shape (B, n, n)."""
+    boards = np.ascontiguousarray(boards)
+    b, n = boards.shape[0], boards.shape[1]
+    winners = np.zeros(b, dtype=int)
+    m = n - n_in_row + 1
+    if m <= 0:
+        return winners
+    sb, s0, s1 = boards.strides
+    windows = [
+        as_strided(boards, (b, m, n, n_in_row), (sb, s0, s1, s0)),
+        as_strided(boards, (b, n, m, n_in_row), (sb, s0, s1, s1)),
+        as_strided(boards, (b, m, m, n_in_row), (sb, s0, s1, s0 + s1)),
+        as_strided(boards[:, :, n_in_row - 1:], (b, m, m, n_in_row), (sb, s0, s1, s0 - s1)),
+    ]
+    for w in windows:
+        sums = w.sum(axis=3).reshape(b, -1)
+        # same precedence as get_winner: first direction, then white
+        found = np.where((sums == n_in_row).any(axis=1), 1, np.where((sums == -n_in_row).any(axis=1), -1, 0))
+        winners = np.where(winners == 0, found, winners)
+    return winners
+
+
+def is_win_at(pieces, move, n_in_row):
+    """Checks if the stone at move (x, y) is part of n_in_row in a row, only
+    looking at the 4 lines through it.
+    """
+    (x, y) = move
+    n = len(pieces)
+    color = pieces[x, y]
+    for dx, dy in [(1, 0), (0, 1), (1, 1), (1, -1)]:
+        count = 1
+        for sign in (1, -1):
+            i, j = x + sign*dx, y + sign*dy
+            while count < n_in_row and 0 <= i < n and 0 <= j < n and pieces[i, j] == color:
+                count += 1
+                i, j = i + sign*dx, j + sign*dy
+        if count >= n_in_row:
+            return True
+    return False
+
+
+def get_neighbourhood(pieces, distance):
+    """Returns the boolean mask of squares within distance (in both x and y)
+    of a stone on the numpy board pieces, stones included. pieces may also
+    be a stack of boards along its first axes.
+    """
+    near = np.asarray(pieces) != 0
+    for axis in (-2, -1):
+        # dilate along one axis at a time, the box is separable
+        grown = near.copy()
+        for shift in range(1, distance + 1):
+            if axis == -2:
+                grown[..., shift:, :] |= near[..., :-shift, :]
+                grown[..., :-shift, :] |= near[..., shift:, :]
+            else:
+                grown[..., shift:] |= near[..., :-shift]
+                grown[..., :-shift] |= near[..., shift:]
+        near = grown
+    return near
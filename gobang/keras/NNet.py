@@ -12,7 +12,7 @@ from utils import *
 from NeuralNet import NeuralNet
 
 import argparse
-from .GobangNNet import GobangNNet as onnet
+from .GobangNNet import GobangNNet as onnet, ResNet as resnet
 
 args = dotdict({
     'lr': 0.001,
@@ -21,6 +21,7 @@ args = dotdict({
     'batch_size': 64,
     'cuda': True,
     'num_channels': 512,
+    'num_res_blocks': 0,  # 0 keeps the 4-conv + 2-FC net, >0 uses a residual tower of that many blocks
 })
 
 
@@ -28,7 +29,7 @@ args = dotdict({
 class NNetWrapper(NeuralNet):
     def __init__(self, game):
         self.graph = tf.get_default_graph()
-        self.nnet = onnet(game, args)
+        self.nnet = resnet(game, args) if args.num_res_blocks > 0 else onnet(game, args)
         self.board_x, self.board_y = game.getBoardSize()
         self.action_size = game.getActionSize()
 
@@ -36,6 +37,7 @@ class NNetWrapper(NeuralNet):
         """
         examples: list of examples, each example is of form (board, pi, v)
         """
+        self.weightsChanged()
         input_boards, target_pis, target_vs = list(zip(*examples))
         input_boards = np.asarray(input_boards)
         target_pis = np.asarray(target_pis)
@@ -59,6 +61,13 @@ class NNetWrapper(NeuralNet):
         #print('PREDICTION TIME TAKEN : {0:03f}'.format(time.time()-start))
         return pi[0], v[0]
 
+    def get_weights(self):
+        return self.nnet.model.get_weights()
+
+    def set_weights(self, weights):
+        self.weightsChanged()
+        self.nnet.model.set_weights(weights)
+
     def save_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
         filepath = os.path.join(folder, filename)
         if not os.path.exists(folder):
@@ -69,6 +78,7 @@ class NNetWrapper(NeuralNet):
         self.nnet.model.save_weights(filepath)
 
     def load_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
+        self.weightsChanged()
         # https://github.com/pytorch/examples/blob/master/imagenet/main.py#L98
         filepath = os.path.join(folder, filename)
         if not os.path.exists(filepath):
@@ -0,0 +1,73 @@
+"""
+To run tests:
+pytest-3 gobang
+"""
+
+import numpy as np
+
+from .GobangGame import GobangGame
+from .GobangLogic import get_winner
+
+
+def play(game, moves):
+    board, player = game.getInitBoard(), 1
+    for x, y in moves:
+        board, player = game.getNextState(board, player, game.n * x + y)
+    return board, player
+
+
+def test_game_ended():
+    game = GobangGame(9, 5)
+    # white plays an anti-diagonal from (0, 8), black answers on row 8
+    moves = []
+    for i in range(5):
+        moves.append((i, 8 - i))
+        if i < 4:
+            moves.append((8, i))
+    board, player = play(game, moves[:-1])
+    assert game.getGameEnded(board, player) == 0
+    board, player = play(game, moves)
+    assert game.getGameEnded(board, player) == 1
+    assert game.getGameEnded(game.getCanonicalForm(board, player), 1) == -1
+    # boards not produced by getNextState are scanned
+    assert GobangGame(9, 5).getGameEnded(board, player) == 1
+    for k in range(4):
+        assert get_winner(np.rot90(-board, k), 5) == -1
+
+    full = np.array([[1, -1, 1, -1]] * 2 + [[-1, 1, -1, 1]] * 2)
+    assert GobangGame(4, 3).getGameEnded(full, 1) == 1e-4
+
+
+def test_candidate_moves():
+    game = GobangGame(9, 5, candidateDistance=1)
+    board = game.getInitBoard()
+    assert game.getValidMoves(board, 1)[:-1].all()
+
+    board, player = play(game, [(0, 0), (4, 4)])
+    valids = game.getValidMoves(board, player)[:-1].reshape(9, 9)
+    expected = np.zeros((9, 9), dtype=bool)
+    expected[0:2, 0:2] = True
+    expected[3:6, 3:6] = True
+    expected[0, 0] = expected[4, 4] = False
+    assert (valids == expected).all()
+    assert (game.getValidMoves(game.getCanonicalForm(board, player), 1)[:-1].reshape(9, 9) == expected).all()
+    assert game.getAllValidMoves(board, player)[:-1].sum() == 79
+
+
+def test_batch_matches_single_board():
+    game = GobangGame(7, 4, candidateDistance=1)
+    rng = np.random.RandomState(0)
+    boards, players = [game.getInitBoard()], [1]
+    for _ in range(40):
+        board, player = game.getInitBoard(), 1
+        for _ in range(rng.randint(40)):
+            if game.getGameEnded(board, player) != 0:
+                break
+            board, player = game.getNextState(board, player, rng.choice(np.nonzero(game.getValidMoves(board, player))[0]))
+        boards.append(board)
+        players.append(player)
+    boards, players = np.array(boards), np.array(players)
+
+    fresh = GobangGame(7, 4, candidateDistance=1)
+    assert (fresh.getGameEndedBatch(boards, players) == [game.getGameEnded(b, p) for b, p in zip(boards, players)]).all()
+    assert (fresh.getValidMovesBatch(boards, players) == [game.getValidMoves(b, p) for b, p in zip(boards, players)]).all()
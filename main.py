@@ -12,11 +12,13 @@ args = dotdict({
     'numMCTSSims': 25,
     'arenaCompare': 40,
     'cpuct': 1,
+    'predictionCacheSize': 20000,     # nnet predictions shared across MCTS instances, 0 disables
 
     'checkpoint': './temp/',
     'load_model': False,
     'load_folder_file': ('/dev/models/8x100x50','best.pth.tar'),
     'numItersForTrainExamplesHistory': 20,
+    'maxPendingWrites': 2,
 
 })
 
@@ -0,0 +1,92 @@
+'''
+Bitboard move generation for Othello.
+Board data:
+  a side is an int bitmask of n*n bits, bit x*n+y is set if the side has a
+  piece on square (x,y) of the numpy board, i.e. board[x][y]. The bit index
+  is the same as the action index used by OthelloGame.
+  Python ints are unbounded, so every even n works, not only 8x8.
+
+Legal moves and flips are computed for all squares at once by shifting the
+masks in each of the 8 directions.
+'''
+import numpy as np
+
+
+class Bitboard():
+
+    # list of all 8 directions on the board, as (x,y) offsets
+    __directions = [(1,1),(1,0),(1,-1),(0,-1),(-1,-1),(-1,0),(-1,1),(0,1)]
+
+    def __init__(self, n):
+        self.n = n
+        self.full = (1 << (n*n)) - 1
+        self.num_bytes = (n*n + 7) // 8
+
+        not_first_col = 0
+        not_last_col = 0
+        for x in range(n):
+            for y in range(n):
+                if y > 0: not_first_col |= 1 << (x*n + y)
+                if y < n-1: not_last_col |= 1 << (x*n + y)
+
+        # (shift, mask of squares that may move in that direction without wrapping a row)
+        self.shifts = []
+        for dx, dy in self.__directions:
+            mask = self.full
+            if dy == 1: mask &= not_last_col
+            if dy == -1: mask &= not_first_col
+            self.shifts.append((dx*n + dy, mask))
+
+    def _shift(self, bits, shift, mask):
+        bits &= mask
+        if shift > 0:
+            return (bits << shift) & self.full
+        return bits >> -shift
+
+    def from_numpy(self, board, color):
+        """Returns (own, opp) masks for the given color of a numpy board."""
+        flat = np.asarray(board).ravel()
+        own = int.from_bytes(np.packbits(flat == color, bitorder='little').tobytes(), 'little')
+        opp = int.from_bytes(np.packbits(flat == -color, bitorder='little').tobytes(), 'little')
+        return own, opp
+
+    def to_numpy(self, own, opp, color, dtype=int):
+        """Inverse of from_numpy."""
+        board = self.to_array(own, dtype) * color
+        board -= self.to_array(opp, dtype) * color
+        return board.reshape(self.n, self.n)
+
+    def to_array(self, bits, dtype=int):
+        """Returns a flat 0/1 array of length n*n with the bits of the mask."""
+        packed = np.frombuffer(bits.to_bytes(self.num_bytes, 'little'), dtype=np.uint8)
+        return np.unpackbits(packed, bitorder='little')[:self.n*self.n].astype(dtype)
+
+    def get_legal_moves(self, own, opp):
+        """Returns the mask of empty squares where own flips at least one opp piece."""
+        empty = self.full & ~(own | opp)
+        moves = 0
+        for shift, mask in self.shifts:
+            run = self._shift(own, shift, mask) & opp
+            for _ in range(self.n - 3):
+                run |= self._shift(run, shift, mask) & opp
+            moves |= self._shift(run, shift, mask) & empty
+        return moves
+
+    def get_flips(self, own, opp, move):
+        """Returns the mask of opp pieces flipped by playing the move bit."""
+        flips = 0
+        for shift, mask in self.shifts:
+            run = 0
+            square = self._shift(move, shift, mask)
+            while square & opp:
+                run |= square
+                square = self._shift(square, shift, mask)
+            if square & own:
+                flips |= run
+        return flips
+
+    def execute_move(self, own, opp, move):
+        """Plays the move bit for own and returns the new (own, opp) masks."""
+        flips = self.get_flips(own, opp, move)
+        assert flips
+        return own | move | flips, opp & ~flips
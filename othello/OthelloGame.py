@@ -2,92 +2,86 @@ from __future__ import print_function
 import sys
 sys.path.append('..')
 from Game import Game
-from .OthelloLogic import Board
+from SquareBoardGame import SquareBoardGame
+from .OthelloBitboard import Bitboard
 import numpy as np
+from collections import OrderedDict
 
 
-class OthelloGame(Game):
-    def __init__(self, n):
-        self.n = n
+class OthelloGame(SquareBoardGame):
+    def __init__(self, n, analysisCacheSize=10000):
+        SquareBoardGame.__init__(self, n)
+        self.bitboard = Bitboard(n)
+        self.analysisCacheSize = analysisCacheSize
+        self.analysisCache = OrderedDict()  # stores legal move masks of (white, black) for board bytes
 
-    def getInitBoard(self):
-        # return initial board (numpy board)
-        b = Board(self.n)
-        return np.array(b.pieces)
-
-    def getBoardSize(self):
-        # (a,b) tuple
-        return (self.n, self.n)
+    # moves flip pieces, so the placement-only batch versions do not apply
+    getNextStateBatch = Game.getNextStateBatch
+    getValidMovesBatch = Game.getValidMovesBatch
 
-    def getActionSize(self):
-        # return number of actions
-        return self.n*self.n + 1
+    def getInitBoard(self):
+        # return initial board (numpy board), 2 pieces of each color in the center
+        b = SquareBoardGame.getInitBoard(self)
+        c = self.n // 2
+        b[c-1][c] = b[c][c-1] = 1
+        b[c-1][c-1] = b[c][c] = -1
+        return b
 
     def getNextState(self, board, player, action):
         # if player takes action on board, return next (board,player)
         # action must be a valid move
         if action == self.n*self.n:
             return (board, -player)
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-        move = (int(action/self.n), action%self.n)
-        b.execute_move(move, player)
-        return (b.pieces, -player)
+        own, opp = self.bitboard.from_numpy(board, player)
+        move = 1 << int(action)
+        flips = self.bitboard.get_flips(own, opp, move)
+        assert flips
+        changed = self.bitboard.to_array(flips | move, bool).reshape(self.n, self.n)
+        return (np.where(changed, player, board), -player)
 
     def getValidMoves(self, board, player):
         # return a fixed size binary vector
-        valids = [0]*self.getActionSize()
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-        legalMoves =  b.get_legal_moves(player)
-        if len(legalMoves)==0:
+        valids = np.zeros(self.getActionSize(), dtype=np.int8)
+        legalMoves, _ = self.analyze(board, player)
+        if legalMoves == 0:
             valids[-1]=1
-            return np.array(valids)
-        for x, y in legalMoves:
-            valids[self.n*x+y]=1
-        return np.array(valids)
+            return valids
+        valids[:-1] = self.bitboard.to_array(legalMoves, np.int8)
+        return valids
 
     def getGameEnded(self, board, player):
         # return 0 if not ended, 1 if player 1 won, -1 if player 1 lost
         # player = 1
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-        if b.has_legal_moves(player):
-            return 0
-        if b.has_legal_moves(-player):
+        legalMoves, opponentMoves = self.analyze(board, player)
+        if legalMoves or opponentMoves:
             return 0
-        if b.countDiff(player) > 0:
+        if self.getScore(board, player) > 0:
             return 1
         return -1
 
-    def getCanonicalForm(self, board, player):
-        # return state if player==1, else return -state if player==-1
-        return player*board
-
-    def getSymmetries(self, board, pi):
-        # mirror, rotational
-        assert(len(pi) == self.n**2+1)  # 1 for pass
-        pi_board = np.reshape(pi[:-1], (self.n, self.n))
-        l = []
-
-        for i in range(1, 5):
-            for j in [True, False]:
-                newB = np.rot90(board, i)
-                newPi = np.rot90(pi_board, i)
-                if j:
-                    newB = np.fliplr(newB)
-                    newPi = np.fliplr(newPi)
-                l += [(newB, list(newPi.ravel()) + [pi[-1]])]
-        return l
-
-    def stringRepresentation(self, board):
-        # 8x8 numpy array (canonical board)
-        return board.tostring()
+    def analyze(self, board, player):
+        """
+        Returns:
+            (legalMoves, opponentMoves): bitmasks of the legal moves of player
+                                         and of -player on board.
+        Both masks are generated in one pass and cached by the board bytes,
+        so getGameEnded and getValidMoves on the same board share the work.
+        """
+        key = board.tobytes()
+        masks = self.analysisCache.get(key)
+        if masks is None:
+            white, black = self.bitboard.from_numpy(board, 1)
+            masks = (self.bitboard.get_legal_moves(white, black), self.bitboard.get_legal_moves(black, white))
+            self.analysisCache[key] = masks
+            if len(self.analysisCache) > self.analysisCacheSize:
+                self.analysisCache.popitem(last=False)
+        else:
+            self.analysisCache.move_to_end(key)
+        return masks if player == 1 else masks[::-1]
 
     def getScore(self, board, player):
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-        return b.countDiff(player)
+        # pieces of player minus pieces of the opponent
+        return player*int(np.sum(board))
 
 def display(board):
     n = board.shape[0]
@@ -15,7 +15,7 @@ from chainer.training import extensions
 sys.path.append('../../')
 from utils import dotdict
 from NeuralNet import NeuralNet
-from .OthelloNNet import OthelloNNet as onnet
+from .OthelloNNet import OthelloNNet as onnet, ResNet as resnet
 
 args = dotdict({
     'lr': 0.001,
@@ -24,6 +24,7 @@ args = dotdict({
     'batch_size': 64,
     'device': 0 if chainer.cuda.available else -1,  # GPU device id for training model, -1 indicates to use CPU.
     'num_channels': 512,
+    'num_res_blocks': 0,  # 0 keeps the 4-conv + 2-FC net, >0 uses a residual tower of that many blocks
     'out': 'result_chainer',  # Output directory for chainer
     'train_mode': 'trainer'  # 'trainer' or 'custom_loop' supported.
 })
@@ -41,7 +42,7 @@ class NNetWrapper(NeuralNet):
 
     def __init__(self, game):
         super(NNetWrapper, self).__init__(game)
-        self.nnet = onnet(game, args)
+        self.nnet = resnet(game, args) if args.num_res_blocks > 0 else onnet(game, args)
         self.board_x, self.board_y = game.getBoardSize()
         self.action_size = game.getActionSize()
 
@@ -51,6 +52,7 @@ class NNetWrapper(NeuralNet):
             self.nnet.to_gpu()
 
     def train(self, examples):
+        self.weightsChanged()
         if args.train_mode == 'trainer':
             self._train_trainer(examples)
         elif args.train_mode == 'custom_loop':
@@ -177,6 +179,15 @@ class NNetWrapper(NeuralNet):
     def loss_v(self, targets, outputs):
         return F.mean_squared_error(targets[:, None], outputs)
 
+    def get_weights(self):
+        serializer = serializers.DictionarySerializer()
+        serializer.save(self.nnet)
+        return {k: np.copy(v) for k, v in serializer.target.items()}
+
+    def set_weights(self, weights):
+        self.weightsChanged()
+        serializers.NpzDeserializer(weights).load(self.nnet)
+
     def save_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
         filepath = os.path.join(folder, filename)
         if not os.path.exists(folder):
@@ -189,6 +200,7 @@ class NNetWrapper(NeuralNet):
         serializers.save_npz(filepath, self.nnet)
 
     def load_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
+        self.weightsChanged()
         filepath = os.path.join(folder, filename)
         if not os.path.exists(filepath):
             raise("No model in path {}".format(filepath))
@@ -49,3 +49,63 @@ class OthelloNNet(chainer.Chain):
         v = self.fc4(s)                                              # batch_size x 1
 
         return F.log_softmax(pi, axis=1), F.tanh(v)
+
+
+class ResBlock(chainer.Chain):
+
+    def __init__(self, num_channels):
+        super(ResBlock, self).__init__()
+        with self.init_scope():
+            self.conv1 = L.Convolution2D(num_channels, num_channels, 3, stride=1, pad=1, nobias=True)
+            self.bn1 = L.BatchNormalization(num_channels)
+            self.conv2 = L.Convolution2D(num_channels, num_channels, 3, stride=1, pad=1, nobias=True)
+            self.bn2 = L.BatchNormalization(num_channels)
+
+    def forward(self, s):
+        out = F.relu(self.bn1(self.conv1(s)))
+        out = self.bn2(self.conv2(out))
+        return F.relu(out + s)
+
+
+class ResNet(chainer.Chain):
+    """
+    AlphaZero style residual tower: args.num_res_blocks blocks of width
+    args.num_channels followed by convolutional policy and value heads.
+    """
+
+    def __init__(self, game, args):
+        # game params
+        self.board_x, self.board_y = game.getBoardSize()
+        self.action_size = game.getActionSize()
+        self.args = args
+
+        super(ResNet, self).__init__()
+        with self.init_scope():
+            self.conv = L.Convolution2D(1, args.num_channels, 3, stride=1, pad=1, nobias=True)
+            self.bn = L.BatchNormalization(args.num_channels)
+            self.res_blocks = chainer.ChainList(*[ResBlock(args.num_channels) for _ in range(args.num_res_blocks)])
+
+            self.pi_conv = L.Convolution2D(args.num_channels, 2, 1, nobias=True)
+            self.pi_bn = L.BatchNormalization(2)
+            self.pi_fc = L.Linear(2*self.board_x*self.board_y, self.action_size)
+
+            self.v_conv = L.Convolution2D(args.num_channels, 1, 1, nobias=True)
+            self.v_bn = L.BatchNormalization(1)
+            self.v_fc1 = L.Linear(self.board_x*self.board_y, 256)
+            self.v_fc2 = L.Linear(256, 1)
+
+    def forward(self, s):
+        #                                                      s: batch_size x board_x x board_y
+        s = F.reshape(s, (-1, 1, self.board_x, self.board_y))  # batch_size x 1 x board_x x board_y
+        s = F.relu(self.bn(self.conv(s)))                      # batch_size x num_channels x board_x x board_y
+        for block in self.res_blocks:
+            s = block(s)                                       # batch_size x num_channels x board_x x board_y
+
+        pi = F.relu(self.pi_bn(self.pi_conv(s)))               # batch_size x 2 x board_x x board_y
+        pi = self.pi_fc(pi)                                    # batch_size x action_size
+
+        v = F.relu(self.v_bn(self.v_conv(s)))                  # batch_size x 1 x board_x x board_y
+        v = F.relu(self.v_fc1(v))                              # batch_size x 256
+        v = self.v_fc2(v)                                      # batch_size x 1
+
+        return F.log_softmax(pi, axis=1), F.tanh(v)
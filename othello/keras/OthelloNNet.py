@@ -30,3 +30,41 @@ class OthelloNNet():
 
         self.model = Model(inputs=self.input_boards, outputs=[self.pi, self.v])
         self.model.compile(loss=['categorical_crossentropy','mean_squared_error'], optimizer=Adam(args.lr))
+
+
+class ResNet():
+    """
+    AlphaZero style residual tower: args.num_res_blocks blocks of width
+    args.num_channels followed by convolutional policy and value heads. Same
+    inputs, outputs and losses as the plain conv net, without its large
+    fully connected layer.
+    """
+    def __init__(self, game, args):
+        # game params
+        self.board_x, self.board_y = game.getBoardSize()
+        self.action_size = game.getActionSize()
+        self.args = args
+
+        # Neural Net
+        self.input_boards = Input(shape=(self.board_x, self.board_y))    # s: batch_size x board_x x board_y
+
+        x_image = Reshape((self.board_x, self.board_y, 1))(self.input_boards)                # batch_size  x board_x x board_y x 1
+        h_conv = Activation('relu')(BatchNormalization(axis=3)(Conv2D(args.num_channels, 3, padding='same', use_bias=False)(x_image)))  # batch_size  x board_x x board_y x num_channels
+        for _ in range(args.num_res_blocks):
+            h_conv = self.residual_block(h_conv, args.num_channels)                          # batch_size  x board_x x board_y x num_channels
+
+        h_pi = Activation('relu')(BatchNormalization(axis=3)(Conv2D(2, 1, padding='same', use_bias=False)(h_conv)))    # batch_size  x board_x x board_y x 2
+        self.pi = Dense(self.action_size, activation='softmax', name='pi')(Flatten()(h_pi))                            # batch_size x self.action_size
+
+        h_v = Activation('relu')(BatchNormalization(axis=3)(Conv2D(1, 1, padding='same', use_bias=False)(h_conv)))     # batch_size  x board_x x board_y x 1
+        h_v = Dense(256, activation='relu')(Flatten()(h_v))                                                            # batch_size x 256
+        self.v = Dense(1, activation='tanh', name='v')(h_v)                                                            # batch_size x 1
+
+        self.model = Model(inputs=self.input_boards, outputs=[self.pi, self.v])
+        self.model.compile(loss=['categorical_crossentropy','mean_squared_error'], optimizer=Adam(args.lr))
+
+    def residual_block(self, x, filters):
+        shortcut = x
+        x = Activation('relu')(BatchNormalization(axis=3)(Conv2D(filters, 3, padding='same', use_bias=False)(x)))
+        x = BatchNormalization(axis=3)(Conv2D(filters, 3, padding='same', use_bias=False)(x))
+        return Activation('relu')(Add()([x, shortcut]))
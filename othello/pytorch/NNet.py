@@ -1,6 +1,8 @@
 import argparse
 import os
 import shutil
+import socket
+import tempfile
 import time
 import random
 import numpy as np
@@ -16,9 +18,13 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import torch.optim as optim
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from multiprocessing.connection import wait
+from torch.nn.parallel import DistributedDataParallel
 from torchvision import datasets, transforms
 
-from .OthelloNNet import OthelloNNet as onnet
+from .OthelloNNet import OthelloNNet as onnet, ResNet as resnet
 
 args = dotdict({
     'lr': 0.001,
@@ -27,11 +33,16 @@ args = dotdict({
     'batch_size': 64,
     'cuda': torch.cuda.is_available(),
     'num_channels': 512,
+    'num_res_blocks': 0,    # 0 keeps the 4-conv + 2-FC net, >0 uses a residual tower of that many blocks
+    'num_processes': 1,     # >1 trains data-parallel over that many local CPU processes (gloo), requires cuda False
 })
 
 class NNetWrapper(NeuralNet):
     def __init__(self, game):
-        self.nnet = onnet(game, args)
+        if args.num_processes > 1 and args.cuda:
+            raise ValueError("num_processes > 1 trains on CPU processes only, set cuda to False")
+        self.game = game
+        self.nnet = resnet(game, args) if args.num_res_blocks > 0 else onnet(game, args)
         self.board_x, self.board_y = game.getBoardSize()
         self.action_size = game.getActionSize()
 
@@ -42,21 +53,71 @@ class NNetWrapper(NeuralNet):
         """
         examples: list of examples, each example is of form (board, pi, v)
         """
+        self.weightsChanged()
+        if args.num_processes > 1:
+            self.train_distributed(examples, args.num_processes)
+            return
+
         optimizer = optim.Adam(self.nnet.parameters())
+        self.train_epochs(self.nnet, optimizer, examples, int(len(examples)/args.batch_size))
+
+    def train_distributed(self, examples, num_processes):
+        """
+        Trains on num_processes local CPU processes with DistributedDataParallel
+        over the gloo backend. Each process gets its own shard of examples and
+        gradients are all-reduced after every batch, so one step consumes
+        num_processes*batch_size examples. Rank 0 writes the trained weights as a
+        regular checkpoint, which is then loaded back into this wrapper.
+        """
+        num_batches = int(len(examples)/(args.batch_size*num_processes))
+        folder = tempfile.mkdtemp()
+        filename = 'distributed.pth.tar'
+        port = _free_port()
+
+        ctx = mp.get_context('spawn')
+        procs = []
+        for rank in range(num_processes):
+            p = ctx.Process(target=_train_worker,
+                            args=(rank, num_processes, port, dict(args), self.game, self.nnet.state_dict(),
+                                  examples[rank::num_processes], num_batches, folder, filename))
+            p.start()
+            procs.append(p)
+        # a failed worker leaves the others blocked in the process group rendezvous or in all-reduce, so they are stopped once any worker exits with an error
+        running = procs
+        while running:
+            wait([p.sentinel for p in running])
+            running = [p for p in running if p.is_alive()]
+            if any(p.exitcode for p in procs):
+                for p in running:
+                    p.terminate()
+        for p in procs:
+            p.join()
 
+        try:
+            if any(p.exitcode != 0 for p in procs):
+                raise RuntimeError("Distributed training failed, exit codes: {}".format([p.exitcode for p in procs]))
+            self.load_checkpoint(folder=folder, filename=filename)
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def train_epochs(self, model, optimizer, examples, num_batches, verbose=True):
+        """
+        Runs args.epochs epochs of num_batches randomly sampled batches each.
+        model is either self.nnet or a DistributedDataParallel wrapper around it.
+        """
         for epoch in range(args.epochs):
-            print('EPOCH ::: ' + str(epoch+1))
-            self.nnet.train()
+            if verbose: print('EPOCH ::: ' + str(epoch+1))
+            model.train()
             data_time = AverageMeter()
             batch_time = AverageMeter()
             pi_losses = AverageMeter()
             v_losses = AverageMeter()
             end = time.time()
 
-            bar = Bar('Training Net', max=int(len(examples)/args.batch_size))
+            bar = Bar('Training Net', max=num_batches) if verbose else None
             batch_idx = 0
 
-            while batch_idx < int(len(examples)/args.batch_size):
+            while batch_idx < num_batches:
                 sample_ids = np.random.randint(len(examples), size=args.batch_size)
                 boards, pis, vs = list(zip(*[examples[i] for i in sample_ids]))
                 boards = torch.FloatTensor(np.array(boards).astype(np.float64))
@@ -71,7 +132,7 @@ class NNetWrapper(NeuralNet):
                 data_time.update(time.time() - end)
 
                 # compute output
-                out_pi, out_v = self.nnet(boards)
+                out_pi, out_v = model(boards)
                 l_pi = self.loss_pi(target_pis, out_pi)
                 l_v = self.loss_v(target_vs, out_v)
                 total_loss = l_pi + l_v
@@ -91,9 +152,11 @@ class NNetWrapper(NeuralNet):
                 batch_idx += 1
 
                 # plot progress
+                if not verbose:
+                    continue
                 bar.suffix  = '({batch}/{size}) Data: {data:.3f}s | Batch: {bt:.3f}s | Total: {total:} | ETA: {eta:} | Loss_pi: {lpi:.4f} | Loss_v: {lv:.3f}'.format(
                             batch=batch_idx,
-                            size=int(len(examples)/args.batch_size),
+                            size=num_batches,
                             data=data_time.avg,
                             bt=batch_time.avg,
                             total=bar.elapsed_td,
@@ -102,7 +165,7 @@ class NNetWrapper(NeuralNet):
                             lv=v_losses.avg,
                             )
                 bar.next()
-            bar.finish()
+            if verbose: bar.finish()
 
 
     def predict(self, board):
@@ -129,6 +192,13 @@ class NNetWrapper(NeuralNet):
     def loss_v(self, targets, outputs):
         return torch.sum((targets-outputs.view(-1))**2)/targets.size()[0]
 
+    def get_weights(self):
+        return {k: v.clone() for k, v in self.nnet.state_dict().items()}
+
+    def set_weights(self, weights):
+        self.weightsChanged()
+        self.nnet.load_state_dict(weights)
+
     def save_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
         filepath = os.path.join(folder, filename)
         if not os.path.exists(folder):
@@ -140,7 +210,17 @@ class NNetWrapper(NeuralNet):
             'state_dict' : self.nnet.state_dict(),
         }, filepath)
 
+    def snapshot_checkpoint(self):
+        weights = self.get_weights()
+
+        def write(folder, filename):
+            torch.save({
+                'state_dict' : weights,
+            }, os.path.join(folder, filename))
+        return write
+
     def load_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
+        self.weightsChanged()
         # https://github.com/pytorch/examples/blob/master/imagenet/main.py#L98
         filepath = os.path.join(folder, filename)
         if not os.path.exists(filepath):
@@ -148,3 +228,33 @@ class NNetWrapper(NeuralNet):
         map_location = None if args.cuda else 'cpu'
         checkpoint = torch.load(filepath, map_location=map_location)
         self.nnet.load_state_dict(checkpoint['state_dict'])
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _train_worker(rank, world_size, port, parent_args, game, state_dict, examples, num_batches, folder, filename):
+    """
+    Entry point of one process of NNetWrapper.train_distributed. examples is
+    this rank's shard; every rank runs the same number of batches so the
+    gradient all-reduces stay in lockstep.
+    """
+    # spawned processes re-import this module, so carry over the parent's args
+    args.update(parent_args)
+    wrapper = NNetWrapper(game)
+    wrapper.nnet.load_state_dict(state_dict)
+
+    torch.set_num_threads(max(1, (os.cpu_count() or 1)//world_size))
+    dist.init_process_group('gloo', init_method='tcp://127.0.0.1:{}'.format(port), rank=rank, world_size=world_size)
+    try:
+        model = DistributedDataParallel(wrapper.nnet)
+        optimizer = optim.Adam(model.parameters())
+        wrapper.train_epochs(model, optimizer, examples, num_batches, verbose=rank == 0)
+        if rank == 0:
+            # wrapper.nnet holds the trained weights, without DDP's 'module.' prefix
+            wrapper.save_checkpoint(folder=folder, filename=filename)
+    finally:
+        dist.destroy_process_group()
@@ -54,3 +54,60 @@ class OthelloNNet(nn.Module):
         v = self.fc4(s)                                                                          # batch_size x 1
 
         return F.log_softmax(pi, dim=1), torch.tanh(v)
+
+
+class ResBlock(nn.Module):
+    def __init__(self, num_channels):
+        super(ResBlock, self).__init__()
+        self.conv1 = nn.Conv2d(num_channels, num_channels, 3, stride=1, padding=1, bias=False)
+        self.bn1 = nn.BatchNorm2d(num_channels)
+        self.conv2 = nn.Conv2d(num_channels, num_channels, 3, stride=1, padding=1, bias=False)
+        self.bn2 = nn.BatchNorm2d(num_channels)
+
+    def forward(self, s):
+        out = F.relu(self.bn1(self.conv1(s)))
+        out = self.bn2(self.conv2(out))
+        return F.relu(out + s)
+
+
+class ResNet(nn.Module):
+    """
+    AlphaZero style residual tower: args.num_res_blocks blocks of width
+    args.num_channels followed by convolutional policy and value heads. Takes
+    the same input and returns the same outputs as OthelloNNet, without the
+    num_channels*(board_x-4)*(board_y-4) x 1024 fully connected layer.
+    """
+    def __init__(self, game, args):
+        # game params
+        self.board_x, self.board_y = game.getBoardSize()
+        self.action_size = game.getActionSize()
+        self.args = args
+
+        super(ResNet, self).__init__()
+        self.conv = nn.Conv2d(1, args.num_channels, 3, stride=1, padding=1, bias=False)
+        self.bn = nn.BatchNorm2d(args.num_channels)
+        self.res_blocks = nn.Sequential(*[ResBlock(args.num_channels) for _ in range(args.num_res_blocks)])
+
+        self.pi_conv = nn.Conv2d(args.num_channels, 2, 1, bias=False)
+        self.pi_bn = nn.BatchNorm2d(2)
+        self.pi_fc = nn.Linear(2*self.board_x*self.board_y, self.action_size)
+
+        self.v_conv = nn.Conv2d(args.num_channels, 1, 1, bias=False)
+        self.v_bn = nn.BatchNorm2d(1)
+        self.v_fc1 = nn.Linear(self.board_x*self.board_y, 256)
+        self.v_fc2 = nn.Linear(256, 1)
+
+    def forward(self, s):
+        #                                                           s: batch_size x board_x x board_y
+        s = s.view(-1, 1, self.board_x, self.board_y)                # batch_size x 1 x board_x x board_y
+        s = F.relu(self.bn(self.conv(s)))                            # batch_size x num_channels x board_x x board_y
+        s = self.res_blocks(s)                                       # batch_size x num_channels x board_x x board_y
+
+        pi = F.relu(self.pi_bn(self.pi_conv(s)))                     # batch_size x 2 x board_x x board_y
+        pi = self.pi_fc(pi.view(-1, 2*self.board_x*self.board_y))    # batch_size x action_size
+
+        v = F.relu(self.v_bn(self.v_conv(s)))                        # batch_size x 1 x board_x x board_y
+        v = F.relu(self.v_fc1(v.view(-1, self.board_x*self.board_y)))  # batch_size x 256
+        v = self.v_fc2(v)                                            # batch_size x 1
+
+        return F.log_softmax(pi, dim=1), torch.tanh(v)
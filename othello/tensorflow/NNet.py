@@ -11,7 +11,7 @@ from pytorch_classification.utils import Bar, AverageMeter
 from NeuralNet import NeuralNet
 
 import tensorflow as tf
-from .OthelloNNet import OthelloNNet as onnet
+from .OthelloNNet import OthelloNNet as onnet, ResNet as resnet
 
 args = dotdict({
     'lr': 0.001,
@@ -19,11 +19,12 @@ args = dotdict({
     'epochs': 10,
     'batch_size': 64,
     'num_channels': 512,
+    'num_res_blocks': 0,  # 0 keeps the 4-conv + 2-FC net, >0 uses a residual tower of that many blocks
 })
 
 class NNetWrapper(NeuralNet):
     def __init__(self, game):
-        self.nnet = onnet(game, args)
+        self.nnet = resnet(game, args) if args.num_res_blocks > 0 else onnet(game, args)
         self.board_x, self.board_y = game.getBoardSize()
         self.action_size = game.getActionSize()
 
@@ -37,6 +38,7 @@ class NNetWrapper(NeuralNet):
         """
         examples: list of examples, each example is of form (board, pi, v)
         """
+        self.weightsChanged()
 
         for epoch in range(args.epochs):
             print('EPOCH ::: ' + str(epoch+1))
@@ -102,6 +104,14 @@ class NNetWrapper(NeuralNet):
         #print('PREDICTION TIME TAKEN : {0:03f}'.format(time.time()-start))
         return prob[0], v[0]
 
+    def get_weights(self):
+        return self.sess.run(self.nnet.graph.get_collection('variables'))
+
+    def set_weights(self, weights):
+        self.weightsChanged()
+        for variable, value in zip(self.nnet.graph.get_collection('variables'), weights):
+            variable.load(value, self.sess)
+
     def save_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
         filepath = os.path.join(folder, filename)
         if not os.path.exists(folder):
@@ -115,6 +125,7 @@ class NNetWrapper(NeuralNet):
             self.saver.save(self.sess, filepath)
 
     def load_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
+        self.weightsChanged()
         filepath = os.path.join(folder, filename)
         if not os.path.exists(filepath+'.meta'):
             raise("No model in path {}".format(filepath))
@@ -0,0 +1,107 @@
+"""
+To run tests:
+pytest-3 othello
+"""
+
+import numpy as np
+import pytest
+
+from .OthelloGame import OthelloGame
+from .OthelloLogic import Board
+
+
+def legacy_valid_moves(board, player, n):
+    """Returns getValidMoves as computed by the reference Board class."""
+    b = Board(n)
+    b.pieces = np.copy(board)
+    valids = np.zeros(n*n + 1, dtype=int)
+    legalMoves = b.get_legal_moves(player)
+    if not legalMoves:
+        valids[-1] = 1
+    for x, y in legalMoves:
+        valids[n*x + y] = 1
+    return valids
+
+
+def test_bitboard_matches_reference_logic():
+    rng = np.random.RandomState(0)
+    for n in (4, 6, 8, 10):
+        game = OthelloGame(n)
+        for _ in range(10):
+            board, player = game.getInitBoard(), 1
+            while game.getGameEnded(board, player) == 0:
+                valids = game.getValidMoves(board, player)
+                assert (valids == legacy_valid_moves(board, player, n)).all()
+                action = rng.choice(np.nonzero(valids)[0])
+                nextBoard, nextPlayer = game.getNextState(board, player, action)
+                if action != n*n:
+                    b = Board(n)
+                    b.pieces = np.copy(board)
+                    b.execute_move((action // n, action % n), player)
+                    assert (nextBoard == b.pieces).all()
+                board, player = nextBoard, nextPlayer
+            assert not (game.getValidMoves(board, player)[:-1].any() or game.getValidMoves(board, -player)[:-1].any())
+
+
+def test_game_ended_scores():
+    game = OthelloGame(4)
+    board = np.ones((4, 4), dtype=int)
+    board[0, 0] = -1
+    assert game.getGameEnded(board, 1) == 1
+    assert game.getGameEnded(board, -1) == -1
+    assert game.getScore(board, 1) == 14
+
+
+class CrashOnLoad():
+    """Example that fails to unpickle in the worker process it is sent to."""
+    def __reduce__(self):
+        return (divmod, (1, 0))
+
+
+def tiny_pytorch_net(monkeypatch, **kwargs):
+    from .pytorch import NNet
+
+    for key, value in dict({'num_channels': 16, 'epochs': 1, 'batch_size': 8, 'cuda': False}, **kwargs).items():
+        monkeypatch.setitem(NNet.args, key, value)
+    return NNet, NNet.NNetWrapper(OthelloGame(6))
+
+
+def test_pytorch_snapshot_checkpoint(tmp_path, monkeypatch):
+    torch = pytest.importorskip('torch')
+    _, nnet = tiny_pytorch_net(monkeypatch)
+    weights = nnet.get_weights()
+    write = nnet.snapshot_checkpoint()
+    # later changes don't reach the snapshot written afterwards
+    with torch.no_grad():
+        for p in nnet.nnet.parameters():
+            p.add_(1.)
+    write(str(tmp_path), 'best.pth.tar')
+    nnet.load_checkpoint(str(tmp_path), 'best.pth.tar')
+    assert all(torch.equal(v, weights[k]) for k, v in nnet.nnet.state_dict().items())
+
+
+def test_pytorch_distributed_training(tmp_path, monkeypatch):
+    torch = pytest.importorskip('torch')
+    NNet, nnet = tiny_pytorch_net(monkeypatch, num_processes=2)
+    # keep the checkpoint that rank 0 writes
+    monkeypatch.setattr(NNet.tempfile, 'mkdtemp', lambda: str(tmp_path))
+    monkeypatch.setattr(NNet.shutil, 'rmtree', lambda *args, **kwargs: None)
+    rng = np.random.RandomState(0)
+    examples = [(rng.randint(-1, 2, (6, 6)), rng.dirichlet(np.ones(37)), rng.choice([-1, 1])) for _ in range(64)]
+    initial = nnet.get_weights()
+    nnet.train(examples)
+
+    trained = nnet.nnet.state_dict()
+    checkpoint = torch.load(str(tmp_path / 'distributed.pth.tar'))['state_dict']
+    assert all(torch.equal(v, checkpoint[k]) for k, v in trained.items())
+    assert any(not torch.equal(v, initial[k]) for k, v in trained.items() if v.is_floating_point())
+
+    # rank 1 fails before joining the process group, rank 0 is stopped instead of waiting for it
+    with pytest.raises(RuntimeError):
+        nnet.train([examples[0], CrashOnLoad()])
+
+
+def test_pytorch_distributed_requires_cpu(monkeypatch):
+    pytest.importorskip('torch')
+    with pytest.raises(ValueError):
+        tiny_pytorch_net(monkeypatch, num_processes=2, cuda=True)
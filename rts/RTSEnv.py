@@ -0,0 +1,195 @@
+import sys
+import time
+from typing import Callable, List, Tuple, Union
+
+import numpy as np
+
+sys.path.append('..')
+from rts.RTSGame import RTSGame
+from rts.src.config import Configuration
+
+"""
+RTSEnv.py
+
+Headless RTS simulator with reset, step and legal_actions, used for scripted-policy rollouts, data generation and profiling.
+RTSVecEnv steps many games at once through batched rules of RTSGame, for policies that choose actions of all games together.
+It only uses game logic - no display modules are imported and configuration is passed explicitly instead of global CONFIG.
+Run 'python -m rts.RTSEnv' from root folder to benchmark random and greedy rollouts, and batched random rollouts.
+"""
+
+
+class RTSEnv:
+
+    def __init__(self, config: Configuration = None) -> None:
+        """
+        :param config: game configuration. Default Configuration is used if not given
+        """
+        self.game = RTSGame(Configuration() if config is None else config)
+        self.board = None
+        self.player = 1
+        self.turn = 0
+        self.result = 0
+
+    def reset(self) -> np.ndarray:
+        """
+        Starts new game from initial board configuration
+        :return: canonical board of player 1, who is on turn
+        """
+        self.board = self.game.getInitBoard()
+        self.player = 1
+        self.turn = 0
+        self.result = 0
+        return self.observation()
+
+    def observation(self) -> np.ndarray:
+        """
+        :return: canonical board of player on turn, as players and nets see it
+        """
+        return self.game.getCanonicalForm(self.board, self.player)
+
+    def legal_actions(self) -> np.ndarray:
+        """
+        :return: indices of valid actions of player on turn (see RTSGame.getValidMoves)
+        """
+        return np.flatnonzero(self.game.getValidMoves(self.board, self.player))
+
+    def step(self, action: Union[int, List[int]]) -> Tuple[np.ndarray, float, bool]:
+        """
+        Executes action of player on turn. Action is not validated, so it should be one of legal_actions
+        :param action: action index, or list of them in simultaneous mode (see RTSGame.getJointAction)
+        :return: canonical board of next player, result of game for player 1 as in Arena (0 while game continues) and if game ended
+        """
+        assert self.result == 0, "game has ended, call reset"
+        self.board, self.player = self.game.getNextState(self.board, self.player, action)
+        self.turn += 1
+        self.result = self.game.getGameEnded(self.board, 1)
+        return self.observation(), self.result, self.result != 0
+
+    def rollout(self, player1: Callable, player2: Callable) -> float:
+        """
+        Plays one game between players, that take canonical board and return action, like players in RTSPlayers.py
+        :param player1: player that starts the game
+        :param player2: second player
+        :return: result of game for player1
+        """
+        players = {1: player1, -1: player2}
+        board, done = self.reset(), False
+        while not done:
+            board, _, done = self.step(players[self.player](board))
+        return self.result
+
+
+class RTSVecEnv:
+
+    def __init__(self, num_envs: int, config: Configuration = None) -> None:
+        """
+        :param num_envs: number of games that are played at once
+        :param config: game configuration. Default Configuration is used if not given. Simultaneous mode isn't batched, so its games are stepped one by one
+        """
+        self.game = RTSGame(Configuration() if config is None else config)
+        self.num_envs = num_envs
+        self.boards = None
+        self.players = None
+        self.turns = None
+        self.games = 0
+
+    def reset(self) -> np.ndarray:
+        """
+        Starts new games in all environments
+        :return: canonical boards of players on turn
+        """
+        self.boards = np.array([self.game.getInitBoard() for _ in range(self.num_envs)])
+        self.players = np.ones(self.num_envs, dtype=int)
+        self.turns = np.zeros(self.num_envs, dtype=int)
+        return self.observation()
+
+    def observation(self) -> np.ndarray:
+        """
+        :return: array of canonical boards of players on turn, as players and nets see them
+        """
+        boards = np.copy(self.boards)
+        second = self.players == -1
+        boards[second] = self.game.getCanonicalForm(self.boards[second], -1)
+        return boards
+
+    def legal_actions(self) -> np.ndarray:
+        """
+        :return: valid actions of players on turn, as int8 array of shape (num_envs, getActionSize)
+        """
+        return self.game.getValidMovesBatch(self.boards, self.players)
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Executes action of player on turn in every environment. Actions are not validated. Games that end are started again, so every environment always has a game in progress
+        :param actions: array of valid action indices, one for every environment
+        :return: canonical boards of next players (new games where games ended), results of games for player 1 as in Arena (0 while game continues) and which games ended
+        """
+        self.boards, self.players = self.game.getNextStateBatch(self.boards, self.players, actions)
+        self.turns += 1
+        results = self.game.getGameEndedBatch(self.boards, np.ones(self.num_envs, dtype=int))
+        done = results != 0
+        if done.any():
+            self.boards[done] = self.game.getInitBoard()
+            self.players[done] = 1
+            self.turns[done] = 0
+            self.games += np.count_nonzero(done)
+        return self.observation(), results, done
+
+
+def random_actions(valids: np.ndarray) -> np.ndarray:
+    """
+    Chooses uniformly random valid action in every row, as batched random player
+    :param valids: valid actions of many boards, as returned by legal_actions
+    :return: array of chosen action indices
+    """
+    rows, actions = np.nonzero(valids)
+    counts = np.bincount(rows, minlength=len(valids))
+    # valid actions of each row follow each other, so one random offset per row picks among them
+    starts = np.cumsum(counts) - counts
+    return actions[starts + (np.random.rand(len(valids)) * counts).astype(int)]
+
+
+def benchmark(env: RTSEnv, player: Callable, num_games: int) -> Tuple[float, float]:
+    """
+    Plays games of player against itself
+    :param env: environment to play in
+    :param player: player used for both sides
+    :param num_games: number of games
+    :return: games and turns per second
+    """
+    turns = 0
+    start = time.perf_counter()
+    for _ in range(num_games):
+        env.rollout(player, player)
+        turns += env.turn
+    elapsed = time.perf_counter() - start
+    return num_games / elapsed, turns / elapsed
+
+
+def benchmark_batch(vec_env: RTSVecEnv, num_games: int) -> Tuple[float, float]:
+    """
+    Plays random games in all environments at once until num_games of them end
+    :param vec_env: environments to play in
+    :param num_games: number of games
+    :return: games and turns per second
+    """
+    vec_env.reset()
+    games, turns = vec_env.games, 0
+    start = time.perf_counter()
+    while vec_env.games - games < num_games:
+        vec_env.step(random_actions(vec_env.legal_actions()))
+        turns += vec_env.num_envs
+    elapsed = time.perf_counter() - start
+    return (vec_env.games - games) / elapsed, turns / elapsed
+
+
+if __name__ == "__main__":
+    from rts.RTSPlayers import RandomPlayer, GreedyRTSPlayer
+
+    env = RTSEnv()
+    for name, player, num_games in [('random', RandomPlayer(env.game).play, 20), ('greedy', GreedyRTSPlayer(env.game, verbose=False).play, 5)]:
+        games_per_second, turns_per_second = benchmark(env, player, num_games)
+        print("%s: %.1f games/s, %.0f turns/s" % (name, games_per_second, turns_per_second))
+    for num_envs in (64, 256):
+        games_per_second, turns_per_second = benchmark_batch(RTSVecEnv(num_envs), 2 * num_envs)
+        print("random, %d games at once: %.1f games/s, %.0f turns/s" % (num_envs, games_per_second, turns_per_second))
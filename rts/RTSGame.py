@@ -1,13 +1,11 @@
 import sys
-from typing import Tuple
+from typing import List, Tuple
 
 import numpy as np
 
-from rts.src.config_class import CONFIG
-
 sys.path.append('..')
-from rts.src.Board import Board
-from rts.src.config import NUM_ENCODERS, NUM_ACTS, P_NAME_IDX, A_TYPE_IDX, TIME_IDX, FPS
+from rts.src.Board import Board, MONEY_SLOT, copy_state, get_valid_moves_batch, has_valid_moves_batch, execute_move_batch, time_killer_batch
+from rts.src.config import Configuration, NUM_ENCODERS, NUM_ACTS, P_NAME_IDX, A_TYPE_IDX, HEALTH_IDX, FPS
 
 """ USE_TIMEOUT, MAX_TIME, d_a_type, a_max_health, INITIAL_GOLD, TIMEOUT, visibility"""
 
@@ -22,10 +20,30 @@ Includes:
 # noinspection PyPep8Naming,PyMethodMayBeStatic
 class RTSGame:
 
-    def __init__(self) -> None:
-        self.n = CONFIG.grid_size
+    def __init__(self, config: Configuration = None) -> None:
+        """
+        :param config: game configuration. Global CONFIG from config_class is used if not given
+        """
+        if config is None:
+            from rts.src.config_class import CONFIG
+            config = CONFIG
+        self.config = config
+
+        self.n = config.grid_size
 
-        self.initial_board_config = CONFIG.initial_board_config
+        self.initial_board_config = config.initial_board_config
+
+        # if every actor of player acts each turn, see getNextState
+        self.simultaneous = config.simultaneous_moves
+
+    def getPlayerConfig(self, player: int):
+        """
+        :param player: player 1 or -1
+        :return: configuration of actions, costs, timeout and score function for that player
+        """
+        if player == 1:
+            return self.config.player1_config
+        return self.config.player2_config
 
     def setInitBoard(self, board_config) -> None:
         """
@@ -36,76 +54,171 @@ class RTSGame:
 
     def getInitBoard(self) -> np.ndarray:
         """
-        :return: Returns new board from initial_board_config. That config can be dynamically changed as game progresses.
+        :return: Returns new board state (see Board.state_dtype) from initial_board_config. That config can be dynamically changed as game progresses.
         """
         b = Board(self.n)
-        remaining_time = None  # when setting initial board, remaining time might be different
         for e in self.initial_board_config:
-            b.pieces[e.x, e.y] = [e.player, e.a_type, e.health, e.carry, e.gold, e.timeout]
-            remaining_time = e.timeout
-        # remaining time is stored in all squares
-        b.pieces[:, :, TIME_IDX] = remaining_time
-        return np.array(b.pieces)
+            b.pieces[e.x, e.y] = [e.player, e.a_type, e.health, e.carry]
+            # when setting initial board, remaining time might be different. Remaining time and money are stored once
+            b.state['time'] = e.timeout
+            b.state['money'][MONEY_SLOT[e.player]] = e.gold
+        return b.state
 
     def getBoardSize(self) -> Tuple[int, int, int]:
-        # (a,b) tuple
-        return self.n, self.n, NUM_ENCODERS
+        # (a,b) tuple, with plane of actors that acted in simultaneous mode (see Board.to_tensor)
+        return self.n, self.n, NUM_ENCODERS + 1 if self.simultaneous else NUM_ENCODERS
 
     def getActionSize(self) -> int:
         return self.n * self.n * NUM_ACTS + 1
 
     def getNextState(self, board: np.ndarray, player: int, action: int) -> Tuple[np.ndarray, int]:
         """
-        Gets next state for board. It also updates tick for board as game tick iterations are transfered within board as 6. parameter
+        Gets next state for board. It also updates tick for board as game tick iterations are transfered within board state
+        In simultaneous mode, single action is executed by next actor of player (see getValidMoves) and player stays on turn until all of its actors acted, so search expands actions of one actor at a time
         :param board: current board
         :param player: player executing action
-        :param action: action to apply to new board
-        :return: new board with applied action
+        :param action: action to apply to new board, or list of actions of different actors that are all executed in this turn (see getJointAction). These are executed in order and actions, that previous ones made invalid, are skipped
+        :return: new board with applied action and player on turn
         """
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-
-        y, x, action_index = np.unravel_index(action, [self.n, self.n, NUM_ACTS])
-        move = (x, y, action_index)
-
-        # first execute move, then run time function to destroy any actors if needed
-        b.execute_move(move, player)
+        b = Board(self.n, copy_state(board))
 
         # get config for timeout
-        if player == 1:
-            USE_TIMEOUT = CONFIG.player1_config.USE_TIMEOUT
+        config = self.getPlayerConfig(player)
+        USE_TIMEOUT = config.USE_TIMEOUT
+
+        # first execute moves, then run time function to destroy any actors if needed
+        if np.ndim(action) == 0:
+            y, x, action_index = np.unravel_index(action, [self.n, self.n, NUM_ACTS])
+            b.execute_move((x, y, action_index), player, config=config)
+            if self.simultaneous:
+                b.mark_acted((x, y, action_index))
+                if self._turnValids(b, player).any():
+                    return b.state, player
         else:
-            USE_TIMEOUT = CONFIG.player2_config.USE_TIMEOUT
+            for a in action:
+                y, x, action_index = np.unravel_index(a, [self.n, self.n, NUM_ACTS])
+                if self._turnValids(b, player)[x, y, action_index]:
+                    b.execute_move((x, y, action_index), player, config=config)
+                    b.mark_acted((x, y, action_index))
+
+        # turn ends, all actors can act in the next one
+        b.state['acted'] = False
 
-        # update timer on every tile:
+        # update timer:
         if USE_TIMEOUT:
-            b.pieces[:, :, TIME_IDX] -= 1
+            b.state['time'] -= 1
         else:
-            b.pieces[:, :, TIME_IDX] += 1
+            b.state['time'] += 1
             b.time_killer(player)
 
-        return b.pieces, -player
+        return b.state, -player
 
-    def getValidMoves(self, board: np.ndarray, player: int):
+    def getNextStateBatch(self, boards: np.ndarray, players: np.ndarray, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Applies getNextState to every board of array. Boards of each player are executed together (see Board.execute_move_batch), as players can have different configurations
+        :param boards: array of B board states
+        :param players: array of B players executing actions
+        :param actions: array of B valid action indices
+        :return: new boards and players on turn
+        """
+        players = np.asarray(players)
+        if self.simultaneous:
+            results = [self.getNextState(board, player, action) for board, player, action in zip(boards, players, actions)]
+            return np.array([r[0] for r in results]), np.array([r[1] for r in results])
+
+        boards = np.copy(boards)
+        y, x, action_index = np.unravel_index(np.asarray(actions), [self.n, self.n, NUM_ACTS])
+        for player in (1, -1):
+            group = np.flatnonzero(players == player)
+            if not len(group):
+                continue
+            config = self.getPlayerConfig(player)
+            states = boards[group]
+            execute_move_batch(states, (x[group], y[group], action_index[group]), player, config)
+            if config.USE_TIMEOUT:
+                states['time'] -= 1
+            else:
+                states['time'] += 1
+                time_killer_batch(states, player)
+            boards[group] = states
+        return boards, -players
 
-        valids = []
-        b = Board(self.n)
-        b.pieces = np.copy(board)
+    def getValidMoves(self, board: np.ndarray, player: int):
+        """
+        Returns valid moves of all actors of player, computed for whole board at once
+        In simultaneous mode, actors act one after another in order of tiles, so only moves of first actor that didn't act in this turn yet are valid
+        :param board: current board
+        :param player: player executing action
+        :return: vector of size getActionSize with 1 for valid actions. Actions are ordered by y, x and action index
+        """
+        n = self.n
+        moves = self._turnValids(Board(n, board), player).transpose(1, 0, 2).reshape(n * n, NUM_ACTS)
 
-        if player == 1:
-            config = CONFIG.player1_config
+        valids = np.zeros(self.getActionSize(), dtype=int)  # +1 in action size stays 0
+        if self.simultaneous:
+            tile = moves.any(axis=1).argmax()
+            valids[tile * NUM_ACTS:(tile + 1) * NUM_ACTS] = moves[tile]
         else:
-            config = CONFIG.player2_config
+            valids[:-1] = moves.ravel()
+        return valids
 
-        for y in range(self.n):
-            for x in range(self.n):
-                if b[x][y][P_NAME_IDX] == player and b[x][y][A_TYPE_IDX] != 1:  # for this player and not Gold
-                    valids.extend(b.get_moves_for_square(x, y, config=config))
-                else:
-                    valids.extend([0] * NUM_ACTS)
-        valids.append(0)  # because of that +1 in action Size
+    def getValidMovesBatch(self, boards: np.ndarray, players: np.ndarray) -> np.ndarray:
+        """
+        Applies getValidMoves to every board of array, computing valid moves of all boards of each player at once
+        :param boards: array of B board states
+        :param players: array of B players executing actions
+        :return: int8 array of shape (B, getActionSize())
+        """
+        players = np.asarray(players)
+        if self.simultaneous:
+            return np.array([self.getValidMoves(board, player) for board, player in zip(boards, players)])
+
+        valids = np.zeros((len(boards), self.getActionSize()), dtype=np.int8)  # +1 in action size stays 0
+        for player in (1, -1):
+            group = np.flatnonzero(players == player)
+            if len(group):
+                moves = get_valid_moves_batch(boards[group], player, config=self.getPlayerConfig(player))
+                valids[group, :-1] = moves.transpose(0, 2, 1, 3).reshape(len(group), -1)
+        return valids
+
+    def _turnValids(self, b: Board, player: int) -> np.ndarray:
+        """
+        :param b: current board
+        :param player: player executing action
+        :return: valid moves of actors of player that didn't act in this turn yet, indexed [x, y, action_index]
+        """
+        valid = b.get_valid_moves(player, config=self.getPlayerConfig(player))
+        valid &= ~b.state['acted'][:, :, None]
+        return valid
 
-        return np.array(valids)
+    def getJointAction(self, board: np.ndarray, player: int, pi, temp=1, prior=None) -> List[int]:
+        """
+        Chooses one action for every actor of player, as used in simultaneous mode. Policy is factorized per tile: each actor gets its action from its own tile of pi, restricted to actions that are valid for it
+        :param board: current board
+        :param player: player executing actions
+        :param pi: policy vector of size getActionSize, usually search policy
+        :param temp: 1 samples action of each actor, 0 takes its most probable action
+        :param prior: policy for actors whose tile of pi has no probability on valid actions (for example network policy, as search didn't visit them). If not given, their valid actions are equally probable
+        :return: list of actions, one for every actor that has any valid action and didn't act in this turn yet, in order of tiles
+        """
+        n = self.n
+        valids = self._turnValids(Board(n, board), player).transpose(1, 0, 2).reshape(n * n, NUM_ACTS).astype(int)
+        tiles = np.flatnonzero(valids.any(axis=1))
+        valids = valids[tiles]
+
+        probs = np.reshape(pi[:-1], (n * n, NUM_ACTS))[tiles] * valids
+        # actors without probability in pi fall back to prior and then to equally probable valid actions
+        fallbacks = [valids] if prior is None else [np.reshape(prior[:-1], (n * n, NUM_ACTS))[tiles] * valids, valids]
+        for fallback in fallbacks:
+            unvisited = probs.sum(axis=1) == 0
+            probs[unvisited] = fallback[unvisited]
+
+        if temp == 0:
+            acts = probs.argmax(axis=1)
+        else:
+            cumulative = probs.cumsum(axis=1)
+            acts = (cumulative <= np.random.rand(len(tiles), 1) * cumulative[:, -1:]).sum(axis=1)
+        return (tiles * NUM_ACTS + acts).tolist()
 
     # noinspection PyUnusedLocal
     def getGameEnded(self, board: np.ndarray, player) -> float:
@@ -119,16 +232,11 @@ class RTSGame:
         :return: real number on interval [-1,1] - return 0 if not ended, 1 if player 1 won, -1 if player 1 lost, 0.001 if tie
         """
 
-        n = board.shape[0]
-
         # detect timeout
-        if player == 1:
-            USE_TIMEOUT = CONFIG.player1_config.USE_TIMEOUT
-        else:
-            USE_TIMEOUT = CONFIG.player2_config.USE_TIMEOUT
+        USE_TIMEOUT = self.getPlayerConfig(player).USE_TIMEOUT
 
         if USE_TIMEOUT:
-            if board[0, 0, TIME_IDX] < 1:
+            if board['time'] < 1:
 
                 score_player1 = self.getScore(board, player)
                 score_player2 = self.getScore(board, -player)
@@ -138,23 +246,14 @@ class RTSGame:
                 better_player = 1 if score_player1 > score_player2 else -1
                 return better_player
         else:
-            if player == 1:
-                MAX_TIME = CONFIG.player1_config.MAX_TIME
-            else:
-                MAX_TIME = CONFIG.player2_config.MAX_TIME
+            MAX_TIME = self.getPlayerConfig(player).MAX_TIME
 
-            if board[0, 0, TIME_IDX] >= MAX_TIME:
+            if board['time'] >= MAX_TIME:
                 return 0.001
 
         # detect win condition
-        sum_p1 = 0
-        sum_p2 = 0
-        for y in range(n):
-            for x in range(n):
-                if board[x][y][P_NAME_IDX] == 1:
-                    sum_p1 += 1
-                if board[x][y][P_NAME_IDX] == -1:
-                    sum_p2 += 1
+        sum_p1 = np.count_nonzero(board['pieces'][:, :, P_NAME_IDX] == 1)
+        sum_p2 = np.count_nonzero(board['pieces'][:, :, P_NAME_IDX] == -1)
 
         if sum_p1 < 2:  # SUM IS 1 WHEN PLAYER ONLY HAS MINERALS LEFT
             return -1
@@ -162,17 +261,70 @@ class RTSGame:
             return +1
 
         # detect no valid actions - possible tie by overpopulating on non-attacking units and buildings - all fields are full or one player is surrounded:
-        if sum(self.getValidMoves(board, 1)) == 0:
+        b = Board(self.n, board)
+        if not b.has_valid_moves(1, config=self.config.player1_config):
             return -1
 
-        if sum(self.getValidMoves(board, -1)) == 0:
+        if not b.has_valid_moves(-1, config=self.config.player2_config):
             return 1
         # continue game
         return 0
 
+    def getGameEndedBatch(self, boards: np.ndarray, players: np.ndarray) -> np.ndarray:
+        """
+        Applies getGameEnded to every board of array. Checks run on all boards of each player at once, and only boards that earlier checks didn't decide check valid moves
+        :param boards: array of B board states
+        :param players: array of B current players
+        :return: float array of B results, as returned by getGameEnded
+        """
+        players = np.asarray(players)
+        results = np.zeros(len(boards))
+        for player in (1, -1):
+            group = np.flatnonzero(players == player)
+            if len(group):
+                results[group] = self._gameEndedBatch(boards[group], player)
+        return results
+
+    def _gameEndedBatch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        """
+        :param boards: array of board states
+        :param player: current player of all boards
+        :return: float array of results, as returned by getGameEnded
+        """
+        config = self.getPlayerConfig(player)
+        results = np.zeros(len(boards))
+
+        if config.USE_TIMEOUT:
+            ended = boards['time'] < 1
+            score_player1 = self._getScoreBatch(boards, player)
+            score_player2 = self._getScoreBatch(boards, -player)
+            results[ended] = np.where(score_player1 == score_player2, 0.001, np.where(score_player1 > score_player2, 1, -1))[ended]
+        else:
+            ended = boards['time'] >= config.MAX_TIME
+            results[ended] = 0.001
+
+        # win condition and no valid actions, in order of getGameEnded
+        p_name = boards['pieces'][..., P_NAME_IDX]
+        checks = [(lambda group: np.count_nonzero(p_name[group] == 1, axis=(1, 2)) < 2, -1),
+                  (lambda group: np.count_nonzero(p_name[group] == -1, axis=(1, 2)) < 2, 1),
+                  (lambda group: ~has_valid_moves_batch(boards[group], 1, config=self.config.player1_config), -1),
+                  (lambda group: ~has_valid_moves_batch(boards[group], -1, config=self.config.player2_config), 1)]
+        for check, result in checks:
+            group = np.flatnonzero(~ended)
+            if not len(group):
+                break
+            decided = group[check(group)]
+            results[decided] = result
+            ended[decided] = True
+        return results
+
     def getCanonicalForm(self, board: np.ndarray, player: int):
-        b = np.copy(board)
-        b[:, :, P_NAME_IDX] = b[:, :, P_NAME_IDX] * player
+        # works on arrays of boards of the same player too
+        b = np.asarray(board).copy()
+        b['pieces'][..., P_NAME_IDX] *= player
+        if player == -1:
+            # money of players swaps with their names
+            b['money'] = board['money'][..., ::-1]
         return b
 
     def getSymmetries(self, board: np.ndarray, pi):
@@ -182,16 +334,38 @@ class RTSGame:
         return_list = []
         for i in range(1, 5):
             for j in [True, False]:
-                newB = np.rot90(board, i)
+                newPieces = np.rot90(board['pieces'], i)
+                newActed = np.rot90(board['acted'], i)
                 newPi = np.rot90(pi_board, i)
                 if j:
-                    newB = np.fliplr(newB)
+                    newPieces = np.fliplr(newPieces)
+                    newActed = np.fliplr(newActed)
                     newPi = np.fliplr(newPi)
+                newB = copy_state(board)
+                newB['pieces'] = newPieces
+                newB['acted'] = newActed
                 return_list += [(newB, list(newPi.ravel()) + [pi[-1]])]
         return return_list
 
     def stringRepresentation(self, board: np.ndarray):
-        return board.tostring()
+        return board.tobytes()
+
+    def _getScoreBatch(self, boards: np.ndarray, player: int) -> np.ndarray:
+        """
+        :param boards: array of board states
+        :param player: player whose score is returned
+        :return: getScore of player on every board
+        """
+        score_function = self.getPlayerConfig(player).score_function
+        pieces = boards['pieces']
+        health = np.where(pieces[..., P_NAME_IDX] == player, pieces[..., HEALTH_IDX], 0).sum(axis=(1, 2))
+        money = boards['money'][:, MONEY_SLOT[player]]
+        if score_function == 1:
+            return health
+        elif score_function == 2:
+            return money
+        else:
+            return health + money
 
     def getScore(self, board: np.array, player: int):
         """
@@ -200,14 +374,10 @@ class RTSGame:
         :param player: current player
         :return: elo for current player on this board
         """
-        b = Board(self.n)
-        b.pieces = np.copy(board)
+        b = Board(self.n, board)
 
         # can use different score functions for each player
-        if player == 1:
-            score_function = CONFIG.player1_config.score_function
-        else:
-            score_function = CONFIG.player2_config.score_function
+        score_function = self.getPlayerConfig(player).score_function
 
         if score_function == 1:
             return b.get_health_score(player)
@@ -223,26 +393,28 @@ def display(board):
     :param board: game state
     :return: /
     """
-    from rts.visualization.rts_pygame import init_visuals, update_graphics
+    from rts.src.config_class import CONFIG
 
     if not CONFIG.visibility:
         return
 
-    n = board.shape[0]
+    n = board['pieces'].shape[0]
     if CONFIG.visibility > 3:
+        from rts.visualization.rts_pygame import init_visuals, update_graphics
+
         game_display, clock = init_visuals(n, n, CONFIG.visibility)
         update_graphics(board, game_display, clock, FPS)
     else:
         for y in range(n):
             print('-' * (n * 8 + 1))
             for x in range(n):
-                a_player = board[x][y][P_NAME_IDX]
+                a_player = board['pieces'][x, y, P_NAME_IDX]
                 if a_player == 1:
                     a_player = '+1'
                 if a_player == -1:
                     a_player = '-1'
                 if a_player == 0:
                     a_player = ' 0'
-                print("|" + a_player + " " + str(board[x][y][A_TYPE_IDX]) + " ", end="")
+                print("|" + a_player + " " + str(board['pieces'][x, y, A_TYPE_IDX]) + " ", end="")
             print("|")
         print('-' * (n * 8 + 1))
@@ -1,23 +1,19 @@
-import ctypes
 import os
 import sys
 from math import sqrt
 from typing import List
 
 import numpy as np
-import pygame
-from pygame.rect import Rect
 
 sys.path.append('..')
 from rts.src.config import NUM_ACTS, P_NAME_IDX, A_TYPE_IDX, d_user_shortcuts, FPS, ACTS, d_a_type, ACTS_REV, d_user_shortcuts_rev
-from rts.visualization.rts_pygame import init_visuals, update_graphics, message_display
 from utils import dotdict
 
 """
 RTSPlayers.py
 
 Contains 3 players (human player, random player, greedy player (if searching for nnet player, it is defined by pre-learnt model)
-Human player has defined input controls for Pygame and console
+Human player has defined input controls for Pygame and console. Pygame is only imported when it is used, so random and greedy players can run headless (see RTSEnv.py)
 """
 
 
@@ -26,11 +22,9 @@ class RandomPlayer:
         self.game = game
 
     def play(self, board):
-        a = np.random.randint(self.game.getActionSize())
-        valids = self.game.getValidMoves(board, 1)
-        while valids[a] != 1:
-            a = np.random.randint(self.game.getActionSize())
-        return a
+        # valid actions are few among all of them, so one is chosen directly
+        valids = np.flatnonzero(self.game.getValidMoves(board, 1))
+        return valids[np.random.randint(len(valids))]
 
 
 class HumanRTSPlayer:
@@ -44,14 +38,12 @@ class HumanRTSPlayer:
         :param board: current board
         :return: action to execute on current board
         """
-        from rts.src.config_class import CONFIG
-
-        n = board.shape[0]
+        n = board['pieces'].shape[0]
         valid = self.game.getValidMoves(board, 1)
         self.display_valid_moves(board, valid)
         while True:
 
-            if CONFIG.visibility > 3:
+            if self.game.config.visibility > 3:
                 a = self._manage_input(board)
                 x, y, action_index = a
 
@@ -83,7 +75,7 @@ class HumanRTSPlayer:
         """
         if valid is None:
             valid = self.game.getValidMoves(board, 1)
-        n = board.shape[0]
+        n = board['pieces'].shape[0]
         print("----------")
         for i in range(len(valid)):
             if valid[i]:
@@ -99,7 +91,9 @@ class HumanRTSPlayer:
         :param click_location: tuple (x,y) that represents canvas click location
         :return: game tile coordinate (x,y)
         """
-        n = board.shape[0]
+        import ctypes
+
+        n = board['pieces'].shape[0]
         canvas_scale = int(ctypes.windll.user32.GetSystemMetrics(1) * (16 / 30) / n)  # for drawing - it takes 2 thirds of screen height
 
         # select object by clicking on it - you can select only your objects
@@ -123,12 +117,18 @@ class HumanRTSPlayer:
         :param board: game state
         :return: /
         """
+        import ctypes
+
+        import pygame
+        from pygame.rect import Rect
+
         from rts.src.Board import Board
-        from rts.src.config_class import CONFIG
+        from rts.visualization.rts_pygame import init_visuals, update_graphics, message_display
 
-        n = board.shape[0]
+        n = board['pieces'].shape[0]
+        visibility = self.game.config.visibility
 
-        game_display, clock = init_visuals(n, n, CONFIG.visibility)
+        game_display, clock = init_visuals(n, n, visibility)
         update_graphics(board, game_display, clock, FPS)
 
         canvas_scale: int = int(ctypes.windll.user32.GetSystemMetrics(1) * (16 / 30) / n)
@@ -142,7 +142,7 @@ class HumanRTSPlayer:
                     raise SystemExit(0)
                 if event.type == pygame.KEYDOWN:
 
-                    if clicked_actor and (board[clicked_actor.x][clicked_actor.y][P_NAME_IDX] == self.USER_PLAYER):
+                    if clicked_actor and (board['pieces'][clicked_actor.x, clicked_actor.y, P_NAME_IDX] == self.USER_PLAYER):
                         try:
 
                             shortcut_pressed = d_user_shortcuts[event.unicode]
@@ -163,11 +163,11 @@ class HumanRTSPlayer:
 
                     if event.button == lmb:
                         clicked_actor = self.select_object(board, pos)
-                        if clicked_actor and board[clicked_actor.x][clicked_actor.y][P_NAME_IDX] == self.USER_PLAYER and board[clicked_actor.x][clicked_actor.y][A_TYPE_IDX] != d_a_type['Gold']:
+                        if clicked_actor and board['pieces'][clicked_actor.x, clicked_actor.y, P_NAME_IDX] == self.USER_PLAYER and board['pieces'][clicked_actor.x, clicked_actor.y, A_TYPE_IDX] != d_a_type['Gold']:
                             clicked_actor_index_arr = [clicked_actor.x, clicked_actor.y]
 
                             # draw selected bounding box
-                            game_display, clock = init_visuals(n, n, CONFIG.visibility)
+                            game_display, clock = init_visuals(n, n, visibility)
                             update_graphics(board, game_display, clock, FPS)
 
                             actor_size = int(canvas_scale / 3)
@@ -178,13 +178,9 @@ class HumanRTSPlayer:
                             pygame.draw.rect(game_display, blue, rect, int(canvas_scale / 20))
 
                             # display valid actions on canvas
-                            b = Board(n)
-                            b.pieces = np.copy(board)
+                            b = Board(n, np.copy(board))
 
-                            if self.USER_PLAYER == 1:
-                                config = CONFIG.player1_config
-                            else:
-                                config = CONFIG.player2_config
+                            config = self.game.getPlayerConfig(self.USER_PLAYER)
                             valids_square = b.get_moves_for_square(clicked_actor.x, clicked_actor.y, config=config)
 
                             printed_actions = 0
@@ -204,16 +200,16 @@ class HumanRTSPlayer:
 
                             l_x = clicked_actor.x
                             l_y = clicked_actor.y
-                            l_type = board[l_x][l_y][A_TYPE_IDX]
+                            l_type = board['pieces'][l_x, l_y, A_TYPE_IDX]
 
                             right_clicked_actor = self.select_object(board, pos)
 
                             # right clicked actor exists and (if player 1 or player -1) and not clicked self
-                            if right_clicked_actor and board[right_clicked_actor.x][right_clicked_actor.y][P_NAME_IDX] != 0 and right_clicked_actor != clicked_actor:
+                            if right_clicked_actor and board['pieces'][right_clicked_actor.x, right_clicked_actor.y, P_NAME_IDX] != 0 and right_clicked_actor != clicked_actor:
                                 r_x = right_clicked_actor.x
                                 r_y = right_clicked_actor.y
-                                r_type = board[r_x][r_y][A_TYPE_IDX]
-                                r_player = board[r_x][r_y][P_NAME_IDX]
+                                r_type = board['pieces'][r_x, r_y, A_TYPE_IDX]
+                                r_player = board['pieces'][r_x, r_y, P_NAME_IDX]
 
                                 # this is actor of type MyActor
                                 if l_type == d_a_type['Work']:
@@ -261,25 +257,29 @@ class HumanRTSPlayer:
 
 
 class GreedyRTSPlayer:
-    def __init__(self, game):
+    def __init__(self, game, verbose=True):
+        """
+        :param game: RTSGame
+        :param verbose: if chosen actions are printed. Turned off for headless rollouts
+        """
         self.game = game
+        self.verbose = verbose
 
     def play(self, board):
         valids = self.game.getValidMoves(board, 1)
 
-        print("sum valids", sum(valids))
+        if self.verbose:
+            print("sum valids", sum(valids))
         candidates = []
-        for a in range(self.game.getActionSize()):
-            if valids[a] == 0:
-                continue
+        for a in np.flatnonzero(valids):
             next_board, _ = self.game.getNextState(board, 1, a)
             score = self.game.getScore(next_board, 1)
             candidates += [(-score, a)]
         candidates.sort()
 
-        n = board.shape[0]
-        y, x, action_index = np.unravel_index(candidates[0][1], [n, n, NUM_ACTS])
-
-        print("returned act", x, y, ACTS_REV[action_index])
+        if self.verbose:
+            n = board['pieces'].shape[0]
+            y, x, action_index = np.unravel_index(candidates[0][1], [n, n, NUM_ACTS])
+            print("returned act", x, y, ACTS_REV[action_index])
 
         return candidates[0][1]
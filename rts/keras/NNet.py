@@ -41,6 +41,7 @@ class NNetWrapper(NeuralNet):
         Encodes examples using one of 2 encoders and starts fitting.
         :param examples: list of examples, each example is of form (board, pi, v)
         """
+        self.weightsChanged()
         from rts.src.config_class import CONFIG
 
         input_boards, target_pis, target_vs = list(zip(*examples))
@@ -72,6 +73,13 @@ class NNetWrapper(NeuralNet):
         pi, v = self.nnet.model.predict(board)
         return pi[0], v[0]
 
+    def get_weights(self):
+        return self.nnet.model.get_weights()
+
+    def set_weights(self, weights):
+        self.weightsChanged()
+        self.nnet.model.set_weights(weights)
+
     def save_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
         filepath = os.path.join(folder, filename)
         if not os.path.exists(folder):
@@ -82,5 +90,6 @@ class NNetWrapper(NeuralNet):
         self.nnet.model.save_weights(filepath)
 
     def load_checkpoint(self, folder='checkpoint', filename='checkpoint.pth.tar'):
+        self.weightsChanged()
         filepath = os.path.join(folder, filename)
         self.nnet.model.load_weights(filepath)
@@ -1,10 +1,11 @@
 import sys
+from functools import lru_cache
 from typing import Any
 
 import numpy as np
 
 sys.path.append('../..')
-from rts.src.config import d_a_type, d_acts, A_TYPE_IDX, P_NAME_IDX, CARRY_IDX, MONEY_IDX, NUM_ACTS, ACTS_REV, NUM_ENCODERS, HEALTH_IDX, TIME_IDX
+from rts.src.config import d_a_type, d_acts_int, A_TYPE_IDX, P_NAME_IDX, CARRY_IDX, MONEY_IDX, ACTED_IDX, NUM_ACTS, ACTS, ACTS_REV, NUM_ENCODERS, NUM_PLANES, HEALTH_IDX, TIME_IDX
 
 """
 Board.py
@@ -13,150 +14,336 @@ Defines game rules (action checking, end-game conditions)
 can_execute_move is checking if move can be executed and execute_move is applying this move to new board
 """
 
+# Offsets of tiles that directional actions target
+DIRECTIONS = {
+    'up': (0, -1),
+    'down': (0, 1),
+    'right': (1, 0),
+    'left': (-1, 0),
+}
+
+# Actor types spawned by directional spawn actions
+SPAWN_ACTS = {
+    'npc': d_a_type['Work'],
+    'barracks': d_a_type['Barr'],
+    'rifle_infantry': d_a_type['Rifl'],
+    'town_hall': d_a_type['Hall'],
+}
+
+# Keys in config.acts_enabled and key that enables each action
+_act_keys = [ACTS_REV[i].rsplit('_', 1)[0] if ACTS_REV[i].rsplit('_', 1)[-1] in DIRECTIONS else ACTS_REV[i] for i in range(NUM_ACTS)]
+ACTS_ENABLED_KEYS = sorted(set(_act_keys))
+ACTS_ENABLED_INDEX = np.array([ACTS_ENABLED_KEYS.index(key) for key in _act_keys])
+
+# Actions that each actor type can execute, indexed [a_type, action_index]
+A_TYPE_ACTS = np.zeros((len(d_a_type) + 1, NUM_ACTS), dtype=bool)
+for _a_type, _acts in d_acts_int.items():
+    A_TYPE_ACTS[_a_type, _acts] = True
+# Move actions of each actor type in order of DIRECTIONS, indexed [a_type, direction]
+A_TYPE_MOVES = A_TYPE_ACTS[:, [ACTS[_direction] for _direction in DIRECTIONS]]
+
+
+# Index of money of each player in board state
+MONEY_SLOT = {1: 0, -1: 1}
+
+# Kinds of action effects
+IDLE, MOVE, MINE, RETURN, ATTACK, HEAL, SPAWN = range(7)
+
+# Effect of each action, indexed by action index: (kind of effect, x offset, y offset of target tile, spawned actor type that gets paid for)
+ACT_EFFECTS = [(IDLE, 0, 0, 0)] * NUM_ACTS
+ACT_EFFECTS[ACTS['mine_resources']] = (MINE, 0, 0, 0)
+ACT_EFFECTS[ACTS['return_resources']] = (RETURN, 0, 0, 0)
+for _direction, (_dx, _dy) in DIRECTIONS.items():
+    ACT_EFFECTS[ACTS[_direction]] = (MOVE, _dx, _dy, 0)
+    ACT_EFFECTS[ACTS['attack_' + _direction]] = (ATTACK, _dx, _dy, 0)
+    ACT_EFFECTS[ACTS['heal_' + _direction]] = (HEAL, _dx, _dy, 0)
+    for _spawn, _spawn_type in SPAWN_ACTS.items():
+        ACT_EFFECTS[ACTS[_spawn + '_' + _direction]] = (SPAWN, _dx, _dy, _spawn_type)
+
+# Conditions that actions check on tile of actor (idle, mine, return) or on their target tile
+ALWAYS, EMPTY, ATTACKABLE, HEALABLE, MINABLE, RETURNABLE = range(6)
+_EFFECT_CONDITIONS = {IDLE: ALWAYS, MOVE: EMPTY, SPAWN: EMPTY, ATTACK: ATTACKABLE, HEAL: HEALABLE, MINE: MINABLE, RETURN: RETURNABLE}
+ACT_CONDITIONS = np.array([_EFFECT_CONDITIONS[_effect] for _effect, _, _, _ in ACT_EFFECTS])
+
+# Spawn actions and actor types they pay for
+SPAWN_ACT_INDICES = [_i for _i, (_effect, _, _, _) in enumerate(ACT_EFFECTS) if _effect == SPAWN]
+SPAWN_ACT_TYPES = [ACT_EFFECTS[_i][3] for _i in SPAWN_ACT_INDICES]
+
+# ACT_EFFECTS as array, so effects of actions on many boards are looked up at once, indexed [action_index, field]
+ACT_EFFECTS_TABLE = np.array(ACT_EFFECTS)
+
+
+@lru_cache()
+def state_dtype(n) -> np.dtype:
+    """
+    Board state is zero dimensional structured array of this type. Its fields are:
+    pieces - planes of actors on tiles (player name, actor type, health, carrying), indexed [x, y, plane]
+    time - remaining time (or elapsed time if timeout is not used)
+    money - money of player 1 and player -1, see MONEY_SLOT
+    acted - tiles of actors that already acted in current turn of simultaneous mode, indexed [x, y]
+    :param n: board size
+    :return: dtype of board states
+    """
+    return np.dtype([('pieces', np.int16, (n, n, NUM_PLANES)), ('time', np.int16), ('money', np.int16, (2,)), ('acted', np.bool_, (n, n))])
+
+
+def copy_state(state) -> np.ndarray:
+    """
+    Copies board state. Board taken from array of boards is numpy.void, which np.copy doesn't detach from the array
+    :param state: board state
+    :return: zero dimensional copy of state
+    """
+    return np.asarray(state).copy()
+
+
+def money_plane(boards) -> np.ndarray:
+    """
+    Money of tile owners on every tile, as nets see it
+    :param boards: board state or array of board states
+    :return: money plane of every board
+    """
+    p_name = boards['pieces'][..., P_NAME_IDX]
+    money = boards['money'][..., None, None, :]
+    return np.where(p_name == 1, money[..., MONEY_SLOT[1]], np.where(p_name == -1, money[..., MONEY_SLOT[-1]], 0))
+
+
+def to_tensor(boards, acted: bool = False) -> np.ndarray:
+    """
+    Converts board states to NUM_ENCODERS planes that nets get, with money of owner and remaining time on every tile
+    :param boards: board state or array of board states
+    :param acted: if plane of actors that already acted in current turn is added, as in simultaneous mode actor that acts next depends on it
+    :return: float array of shape boards.shape + (n, n, NUM_ENCODERS), or NUM_ENCODERS + 1 planes if acted is set
+    """
+    pieces = boards['pieces']
+    tensor = np.empty(pieces.shape[:-1] + (NUM_ENCODERS + acted,), dtype=np.float32)
+    # planes of board state are first encoders
+    tensor[..., :NUM_PLANES] = pieces
+    tensor[..., MONEY_IDX] = money_plane(boards)
+    tensor[..., TIME_IDX] = boards['time'][..., None, None]
+    if acted:
+        tensor[..., ACTED_IDX] = boards['acted']
+    return tensor
+
+
+@lru_cache()
+def _action_targets(n):
+    """
+    Indices of condition of every action on every tile in padded condition planes, so all of them are gathered at once
+    :param n: board size
+    :return: x, y and condition index arrays, indexed [x, y, action_index]
+    """
+    x, y = np.meshgrid(np.arange(n), np.arange(n), indexing='ij')
+    dx, dy = np.array([(dx, dy) for _, dx, dy, _ in ACT_EFFECTS]).T
+    return x[:, :, None] + 1 + dx, y[:, :, None] + 1 + dy, np.broadcast_to(ACT_CONDITIONS, (n, n, NUM_ACTS))
+
+
+def get_valid_moves_batch(states, player, config) -> np.ndarray:
+    """
+    Returns valid actions for all tiles of specified player at once, on one board state or on array of them.
+    Conditions of actions are evaluated on whole planes, padded by one tile. Every action then reads its condition from tile of actor or from its target tile in one gather
+    :param states: board state or array of board states
+    :param player: int - player that is executing actions
+    :param config: additional config that is separate for each player
+    :return: bool array of shape states.shape + (n, n, NUM_ACTS), indexed [..., x, y, action_index]
+    """
+    pieces = states['pieces']
+    n = pieces.shape[-2]
+    p_name = pieces[..., P_NAME_IDX]
+    a_type = pieces[..., A_TYPE_IDX].astype(int)
+    money = money_plane(states)
+    carry = pieces[..., CARRY_IDX]
+
+    # gold and friendly hall, to find them in 3x3 box around actor. Actor on tile itself is never gold or hall when checking these
+    nearby = np.zeros(states.shape + (n + 2, n + 2, 2), dtype=bool)
+    nearby[..., 1:-1, 1:-1, 0] = a_type == d_a_type['Gold']
+    nearby[..., 1:-1, 1:-1, 1] = (a_type == d_a_type['Hall']) & (p_name == player)
+    rows = nearby[..., :-2, :, :] | nearby[..., 1:-1, :, :] | nearby[..., 2:, :, :]
+    nearby = rows[..., :-2, :] | rows[..., 1:-1, :] | rows[..., 2:, :]
+
+    # padded tiles are outside of board, so all of their conditions are False
+    conditions = np.zeros(states.shape + (n + 2, n + 2, RETURNABLE + 1), dtype=bool)
+    inside = conditions[..., 1:-1, 1:-1, :]
+    inside[..., ALWAYS] = True
+    inside[..., EMPTY] = p_name == 0
+    inside[..., ATTACKABLE] = (p_name == -player) & (a_type != d_a_type['Gold'])
+    # heal checks target tile only, so enemy actors can be healed too
+    max_health = np.array([0] + [config.a_max_health[t] for t in range(1, len(d_a_type) + 1)])
+    inside[..., HEALABLE] = (a_type > d_a_type['Gold']) & (pieces[..., HEALTH_IDX] < max_health[a_type]) & (config.SACRIFICIAL_HEAL or (money - config.HEAL_COST >= 0))
+    inside[..., MINABLE] = (carry == 0) & nearby[..., 0]
+    inside[..., RETURNABLE] = (carry == 1) & nearby[..., 1] & (config.MAX_GOLD >= money + config.MONEY_INC)
+
+    # enabled actions of actor on every tile of player, other tiles read empty row 0 of table
+    enabled = np.array([config.acts_enabled[key] for key in ACTS_ENABLED_KEYS], dtype=bool)[ACTS_ENABLED_INDEX]
+    own = (p_name == player) & (a_type != d_a_type['Gold'])
+    valid = (A_TYPE_ACTS & enabled)[np.where(own, a_type, 0)]
+    # spawn actions must be affordable, other actions cost nothing
+    act_cost = np.zeros(NUM_ACTS, dtype=int)
+    act_cost[SPAWN_ACT_INDICES] = [config.a_cost[a] for a in SPAWN_ACT_TYPES]
+    valid &= money[..., None] >= act_cost
+
+    x, y, condition = _action_targets(n)
+    valid &= conditions[..., x, y, condition]
+    return valid
+
+
+def has_valid_moves_batch(states, player, config) -> np.ndarray:
+    """
+    Checks for every board if player has any valid action, like Board.has_valid_moves. Only boards that cheaper checks don't decide get their valid moves computed
+    :param states: array of board states
+    :param player: int - player that is executing actions
+    :param config: additional config that is separate for each player
+    :return: bool array of shape states.shape
+    """
+    pieces = states['pieces']
+    n = pieces.shape[-2]
+    p_name = pieces[..., P_NAME_IDX]
+    a_type = pieces[..., A_TYPE_IDX].astype(int)
+    own = (p_name == player) & (a_type != d_a_type['Gold'])
+    result = own.any(axis=(-2, -1))
+    # every actor type can idle
+    if config.acts_enabled.idle:
+        return result
+    # usually some actor can walk to empty tile next to it
+    empty = np.zeros(states.shape + (n + 2, n + 2), dtype=bool)
+    empty[..., 1:-1, 1:-1] = p_name == 0
+    movers = own[..., None] & A_TYPE_MOVES[a_type]
+    walks = np.zeros(states.shape, dtype=bool)
+    for i, (direction, (dx, dy)) in enumerate(DIRECTIONS.items()):
+        if config.acts_enabled[direction]:
+            walks |= (movers[..., i] & empty[..., 1 + dx:n + 1 + dx, 1 + dy:n + 1 + dy]).any(axis=(-2, -1))
+    undecided = result & ~walks
+    if undecided.any():
+        result[undecided] = get_valid_moves_batch(states[undecided], player, config).any(axis=(-3, -2, -1))
+    return result
+
+
+def execute_move_batch(states, moves, player, config) -> None:
+    """
+    Executes one move on every board of array, like Board.execute_move. Boards are grouped by effect of their action, so each kind of effect is applied to all of its boards at once
+    :param states: array of board states, changed in place
+    :param moves: (x, y, action_index) arrays with move of every board. Moves must be valid
+    :param player: int - player that is executing actions
+    :param config: configuration of that player
+    :return: /
+    """
+    pieces = states['pieces']
+    money = states['money']
+    x, y, action_index = (np.asarray(m) for m in moves)
+    effect, dx, dy, a_type = ACT_EFFECTS_TABLE[action_index].T
+    n_x, n_y = x + dx, y + dy
+    b = np.arange(len(states))
+    slot = MONEY_SLOT[player]
+    max_health = np.array([0] + [config.a_max_health[t] for t in range(1, len(d_a_type) + 1)])
+
+    m = effect == MOVE
+    pieces[b[m], n_x[m], n_y[m]] = pieces[b[m], x[m], y[m]]
+    pieces[b[m], x[m], y[m]] = 0
+
+    m = effect == SPAWN
+    cost = np.array([0] + [config.a_cost[t] for t in range(1, len(d_a_type) + 1)])
+    money[b[m], slot] -= cost[a_type[m]]
+    spawned = np.zeros((np.count_nonzero(m), NUM_PLANES), dtype=pieces.dtype)
+    spawned[:, P_NAME_IDX] = pieces[b[m], x[m], y[m], P_NAME_IDX]
+    spawned[:, A_TYPE_IDX] = a_type[m]
+    spawned[:, HEALTH_IDX] = max_health[a_type[m]]
+    pieces[b[m], n_x[m], n_y[m]] = spawned
+
+    m = effect == ATTACK
+    ab, ax, ay = b[m], n_x[m], n_y[m]
+    pieces[ab, ax, ay, HEALTH_IDX] -= config.DAMAGE
+    dead = pieces[ab, ax, ay, HEALTH_IDX] <= 0
+    pieces[ab[dead], ax[dead], ay[dead]] = 0
+
+    m = effect == HEAL
+    hb, hx, hy, tx, ty = b[m], x[m], y[m], n_x[m], n_y[m]
+    if config.SACRIFICIAL_HEAL:
+        pieces[hb, hx, hy, HEALTH_IDX] -= config.HEAL_COST
+        dead = pieces[hb, hx, hy, HEALTH_IDX] <= 0
+        pieces[hb[dead], hx[dead], hy[dead]] = 0
+    else:
+        # owner of healed actor pays for it
+        owner_slot = (1 - pieces[hb, tx, ty, P_NAME_IDX]) // 2
+        paid = money[hb, owner_slot] - config.HEAL_AMOUNT >= 0
+        pieces[hb[paid], tx[paid], ty[paid], HEALTH_IDX] += config.HEAL_AMOUNT
+        money[hb[paid], owner_slot[paid]] -= config.HEAL_COST
+    # clamp value to max
+    pieces[hb, tx, ty, HEALTH_IDX] = np.clip(pieces[hb, tx, ty, HEALTH_IDX] + config.HEAL_AMOUNT, 0, max_health[pieces[hb, tx, ty, A_TYPE_IDX]])
+
+    m = effect == MINE
+    pieces[b[m], x[m], y[m], CARRY_IDX] = 1
+
+    m = effect == RETURN
+    pieces[b[m], x[m], y[m], CARRY_IDX] = 0
+    money[b[m], slot] += config.MONEY_INC
+    assert (money >= 0).all()
+
+
+def time_killer_batch(states, player) -> None:
+    """
+    Damages actors of player on every board of array, like Board.time_killer
+    :param states: array of board states, changed in place
+    :param player: which player is currently executing action
+    :return: /
+    """
+    pieces = states['pieces']
+    time = states['time'].astype(float)
+    destroys_per_round = ((time / 256) ** 2 + 1).astype(int)
+    damage_amount = ((time / 8) ** 2.718 / (time * 8)).astype(int)
+
+    # first actors of player in order of y, then x, as many as destroys_per_round of their board
+    actors = ((pieces[..., P_NAME_IDX] == player) & (pieces[..., A_TYPE_IDX] != d_a_type['Gold'])).transpose(0, 2, 1)
+    rank = actors.reshape(len(states), -1).cumsum(axis=1).reshape(actors.shape)
+    damaged = (actors & (rank <= destroys_per_round[:, None, None])).transpose(0, 2, 1)
+    pieces[..., HEALTH_IDX] -= (damaged * damage_amount[:, None, None]).astype(pieces.dtype)
+
+    destroyed = damaged & (pieces[..., HEALTH_IDX] <= 0)
+    pieces[destroyed] = 0
+
 
 class Board:
 
-    def __init__(self, n) -> None:
+    def __init__(self, n, state=None) -> None:
+        """
+        :param n: board size
+        :param state: board state that this board works on (it is not copied). New empty state if not given
+        """
         self.n = n
-        self.pieces = np.zeros((self.n, self.n, NUM_ENCODERS))
+        self.state = np.zeros((), dtype=state_dtype(n)) if state is None else state
+        self.pieces = self.state['pieces']
 
     def __getitem__(self, index: int) -> np.array:
         return self.pieces[index]
 
-    def execute_move(self, move, player) -> None:
+    def execute_move(self, move, player, config=None) -> None:
         """
-        Executes move on this board for specified player
+        Executes move on this board for specified player. Effect of action is looked up in ACT_EFFECTS by action index
         :param move: (x, y, action_index), that define which action should be executed on which tile
         :param player: int - player that is executing action
+        :param config: configuration of that player. Taken from global CONFIG if not given
         :return: /
         """
-        from rts.src.config_class import CONFIG
+        if config is None:
+            from rts.src.config_class import CONFIG
 
-        if player == 1:
-            config = CONFIG.player1_config
-        else:
-            config = CONFIG.player2_config
+            config = CONFIG.player1_config if player == 1 else CONFIG.player2_config
 
         x, y, action_index = move
-        act = ACTS_REV[action_index]
-        if act == "idle":
-            return
-        if act == "up":
-            new_x, new_y = x, y - 1
-            self._move(x, y, new_x, new_y)
-            return
-        if act == "down":
-            new_x, new_y = x, y + 1
-            self._move(x, y, new_x, new_y)
-            return
-        if act == "right":
-            new_x, new_y = x + 1, y
-            self._move(x, y, new_x, new_y)
-            return
-        if act == "left":
-            new_x, new_y = x - 1, y
-            self._move(x, y, new_x, new_y)
-            return
-        if act == "mine_resources":
-            self[x][y][CARRY_IDX] = 1
-            return
-        if act == "return_resources":
-            self[x][y][CARRY_IDX] = 0
+        effect, dx, dy, a_type = ACT_EFFECTS[action_index]
+        n_x, n_y = x + dx, y + dy
+        if effect == MOVE:
+            self._move(x, y, n_x, n_y)
+        elif effect == SPAWN:
+            self._update_money(player, -config.a_cost[a_type])
+            self._spawn(x, y, n_x, n_y, a_type, config=config)
+        elif effect == ATTACK:
+            self._attack(x, y, n_x, n_y, config=config)
+        elif effect == HEAL:
+            self._heal(x, y, n_x, n_y, config=config)
+        elif effect == MINE:
+            self.pieces[x, y, CARRY_IDX] = 1
+        elif effect == RETURN:
+            self.pieces[x, y, CARRY_IDX] = 0
             self._update_money(player, config.MONEY_INC)
-            return
-        if act == "attack_up":
-            self._attack(x, y, x, y - 1, config=config)
-            return
-        if act == "attack_down":
-            self._attack(x, y, x, y + 1, config=config)
-            return
-        if act == "attack_left":
-            self._attack(x, y, x - 1, y, config=config)
-            return
-        if act == "attack_right":
-            self._attack(x, y, x + 1, y, config=config)
-            return
-
-        if act == "heal_up":
-            self._heal(x, y, x, y - 1, config=config)
-            return
-        if act == "heal_down":
-            self._heal(x, y, x, y + 1, config=config)
-            return
-        if act == "heal_left":
-            self._heal(x, y, x - 1, y, config=config)
-            return
-        if act == "heal_right":
-            self._heal(x, y, x + 1, y, config=config)
-            return
-
-        if act == "npc_up":
-            self._update_money(player, -config.a_cost[2])
-            self._spawn(x, y, x, y - 1, 2, config=config)
-            return
-        if act == "npc_down":
-            self._update_money(player, -config.a_cost[2])
-            self._spawn(x, y, x, y + 1, 2, config=config)
-            return
-        if act == "npc_left":
-            self._update_money(player, -config.a_cost[2])
-            self._spawn(x, y, x - 1, y, 2, config=config)
-            return
-        if act == "npc_right":
-            self._update_money(player, -config.a_cost[2])
-            self._spawn(x, y, x + 1, y, 2, config=config)
-            return
-
-        if act == "barracks_up":
-            self._update_money(player, -config.a_cost[3])
-            self._spawn(x, y, x, y - 1, 3, config=config)
-            return
-        if act == "barracks_down":
-            self._update_money(player, -config.a_cost[3])
-            self._spawn(x, y, x, y + 1, 3, config=config)
-            return
-        if act == "barracks_left":
-            self._update_money(player, -config.a_cost[3])
-            self._spawn(x, y, x - 1, y, 3, config=config)
-            return
-        if act == "barracks_right":
-            self._update_money(player, -config.a_cost[3])
-            self._spawn(x, y, x + 1, y, 3, config=config)
-            return
-
-        if act == "rifle_infantry_up":
-            self._update_money(player, -config.a_cost[4])
-            self._spawn(x, y, x, y - 1, 4, config=config)
-            return
-        if act == "rifle_infantry_down":
-            self._update_money(player, -config.a_cost[4])
-            self._spawn(x, y, x, y + 1, 4, config=config)
-            return
-        if act == "rifle_infantry_left":
-            self._update_money(player, -config.a_cost[4])
-            self._spawn(x, y, x - 1, y, 4, config=config)
-            return
-        if act == "rifle_infantry_right":
-            self._update_money(player, -config.a_cost[4])
-            self._spawn(x, y, x + 1, y, 4, config=config)
-            return
-
-        if act == "town_hall_up":
-            self._update_money(player, -config.a_cost[5])
-            self._spawn(x, y, x, y - 1, 5, config=config)
-            return
-        if act == "town_hall_down":
-            self._update_money(player, -config.a_cost[5])
-            self._spawn(x, y, x, y + 1, 5, config=config)
-            return
-        if act == "town_hall_left":
-            self._update_money(player, -config.a_cost[5])
-            self._spawn(x, y, x - 1, y, 5, config=config)
-            return
-        if act == "town_hall_right":
-            self._update_money(player, -config.a_cost[5])
-            self._spawn(x, y, x + 1, y, 5, config=config)
-            return
 
     def _move(self, x, y, new_x, new_y):
         """
@@ -166,20 +353,23 @@ class Board:
         :param new_x: int - coordinate x where actor needs to be moved to
         :param new_y: int - coordinate y where actor needs to be moved to
         """
-        self[new_x][new_y] = self[x][y]
-        self[x][y] = [0] * NUM_ENCODERS
-        self[x][y][TIME_IDX] = self[new_x][new_y][TIME_IDX]  # set time back to empty tile
+        self.pieces[new_x, new_y] = self.pieces[x, y]
+        self.pieces[x, y] = 0
+
+    def get_money(self, player):
+        """
+        :param player: int - player whose money is returned
+        :return: money of player
+        """
+        return self.state['money'][MONEY_SLOT[player]]
 
     def _update_money(self, player, money_update):
         """
         :param player: int - player to which money gets appended/ decreased
         :param money_update: int - amount of money
         """
-        for y in range(self.n):
-            for x in range(self.n):
-                if self[x][y][P_NAME_IDX] == player:
-                    assert self[x][y][MONEY_IDX] + money_update >= 0
-                    self[x][y][MONEY_IDX] = self[x][y][MONEY_IDX] + money_update
+        assert self.get_money(player) + money_update >= 0
+        self.state['money'][MONEY_SLOT[player]] += money_update
 
     def _attack(self, x, y, n_x, n_y, config):
         """
@@ -190,10 +380,9 @@ class Board:
         :param n_y: attack new actor on coordinate n_x
         :param config: config that specifies damage - different config can be used for each player
         """
-        self[n_x][n_y][HEALTH_IDX] -= config.DAMAGE
-        if self[n_x][n_y][HEALTH_IDX] <= 0:
-            self[n_x][n_y] = [0] * NUM_ENCODERS
-            self[n_x][n_y][TIME_IDX] = self[x][y][TIME_IDX]  # set time back to empty tile just in case
+        self.pieces[n_x, n_y, HEALTH_IDX] -= config.DAMAGE
+        if self.pieces[n_x, n_y, HEALTH_IDX] <= 0:
+            self.pieces[n_x, n_y] = 0
 
     def _spawn(self, x, y, n_x, n_y, a_type, config):
         """
@@ -205,7 +394,7 @@ class Board:
         :param a_type: type of unit to spawn on new coordinate
         :param config: additional config that is separate for each player (maximum actor health for this type)
         """
-        self[n_x][n_y] = [self[x][y][P_NAME_IDX], a_type, config.a_max_health[a_type], 0, self[x][y][MONEY_IDX], self[x][y][TIME_IDX]]
+        self.pieces[n_x, n_y] = [self.pieces[x, y, P_NAME_IDX], a_type, config.a_max_health[a_type], 0]
 
     def _heal(self, x, y, n_x, n_y, config):
         """
@@ -217,16 +406,28 @@ class Board:
         :param config: additional config that is separate for each player (heal_cost, heal_amount, max_actor_health)
         """
         if config.SACRIFICIAL_HEAL:
-            self[x][x][HEALTH_IDX] -= config.HEAL_COST
-            if self[x][y][HEALTH_IDX] <= 0:
-                self[x][y] = [0] * NUM_ENCODERS
-                self[x][y][TIME_IDX] = self[x][y][TIME_IDX]
-        elif self[n_x][n_y][MONEY_IDX] - config.HEAL_AMOUNT >= 0:
-            self[n_x][n_y][HEALTH_IDX] += config.HEAL_AMOUNT
-            self._update_money(self[n_x][n_y][P_NAME_IDX], -config.HEAL_COST)
+            self.pieces[x, y, HEALTH_IDX] -= config.HEAL_COST
+            if self.pieces[x, y, HEALTH_IDX] <= 0:
+                self.pieces[x, y] = 0
+        elif self.get_money(self.pieces[n_x, n_y, P_NAME_IDX]) - config.HEAL_AMOUNT >= 0:
+            self.pieces[n_x, n_y, HEALTH_IDX] += config.HEAL_AMOUNT
+            self._update_money(self.pieces[n_x, n_y, P_NAME_IDX], -config.HEAL_COST)
 
         # clamp value to max
-        self[n_x][n_y][HEALTH_IDX] = self.clamp(self[n_x][n_y][HEALTH_IDX] + config.HEAL_AMOUNT, 0, config.a_max_health[self[n_x][n_y][A_TYPE_IDX]])
+        self.pieces[n_x, n_y, HEALTH_IDX] = self.clamp(self.pieces[n_x, n_y, HEALTH_IDX] + config.HEAL_AMOUNT, 0, config.a_max_health[self.pieces[n_x, n_y, A_TYPE_IDX]])
+
+    def mark_acted(self, move) -> None:
+        """
+        Marks actor that executed move as acted in current turn of simultaneous mode. Actor it spawned doesn't act in this turn either
+        :param move: (x, y, action_index) that was executed
+        :return: /
+        """
+        x, y, action_index = move
+        effect, dx, dy, _ = ACT_EFFECTS[action_index]
+        # actor that moved away leaves its tile free for others
+        self.state['acted'][x, y] = effect != MOVE
+        if effect == MOVE or effect == SPAWN:
+            self.state['acted'][x + dx, y + dy] = True
 
     def get_moves_for_square(self, x, y, config) -> Any:
         """
@@ -241,159 +442,41 @@ class Board:
 
         if player == 0:
             return None
-        a_type = self[x][y][A_TYPE_IDX]
-        acts = d_acts[a_type]
-        moves = [0] * NUM_ACTS
-        for i in range(NUM_ACTS):
-            act = ACTS_REV[i]
-
-            if act in acts:
-                # a is now string action
-                move = self._valid_act(x, y, act, config=config) * 1
-                if move:
-                    moves[i] = move
-        # return the generated move list
-        return moves
-
-    def _valid_act(self, x, y, act, config):
-        """
-        Returns true if action on specific tile is valid, false otherwise
-        :param x: tile x that action will be executing upon
-        :param y: tile y that action will be executing upon
-        :param act: str: action that will be executing on this tile
-        :param config: additional config that gets passed to functions
-        :return: true/false
-        """
-        money = self[x][y][MONEY_IDX]
-        if act == "idle":
-            return config.acts_enabled.idle
-        if act == "up":
-            return config.acts_enabled.up and self._check_if_empty(x, y - 1)
-        if act == "down":
-            return config.acts_enabled.down and self._check_if_empty(x, y + 1)
-        if act == "right":
-            return config.acts_enabled.right and self._check_if_empty(x + 1, y)
-        if act == "left":
-            return config.acts_enabled.left and self._check_if_empty(x - 1, y)
-
-        if act == "mine_resources":
-            return config.acts_enabled.mine_resources and self[x][y][CARRY_IDX] == 0 and self._check_if_nearby(x, y, d_a_type['Gold'])
-        if act == "return_resources":
-            return config.acts_enabled.return_resources and self[x][y][CARRY_IDX] == 1 and self._check_if_nearby(x, y, d_a_type['Hall'], check_friendly=True) and (config.MAX_GOLD >= self[x][y][MONEY_IDX] + config.MONEY_INC)
-
-        if act == "attack_up":
-            return config.acts_enabled.attack and self._check_if_attack(x, y, x, y - 1)
-        if act == "attack_down":
-            return config.acts_enabled.attack and self._check_if_attack(x, y, x, y + 1)
-        if act == "attack_right":
-            return config.acts_enabled.attack and self._check_if_attack(x, y, x + 1, y)
-        if act == "attack_left":
-            return config.acts_enabled.attack and self._check_if_attack(x, y, x - 1, y)
-
-        if act == "heal_up":
-            return config.acts_enabled.heal and self._check_if_heal(x, y - 1, config=config)
-        if act == "heal_down":
-            return config.acts_enabled.heal and self._check_if_heal(x, y + 1, config=config)
-        if act == "heal_right":
-            return config.acts_enabled.heal and self._check_if_heal(x + 1, y, config=config)
-        if act == "heal_left":
-            return config.acts_enabled.heal and self._check_if_heal(x - 1, y, config=config)
-
-        if act == "npc_up":
-            return config.acts_enabled.npc and config.a_cost[2] <= money and self._check_if_empty(x, y - 1)
-        if act == "npc_down":
-            return config.acts_enabled.npc and config.a_cost[2] <= money and self._check_if_empty(x, y + 1)
-        if act == "npc_right":
-            return config.acts_enabled.npc and config.a_cost[2] <= money and self._check_if_empty(x + 1, y)
-        if act == "npc_left":
-            return config.acts_enabled.npc and config.a_cost[2] <= money and self._check_if_empty(x - 1, y)
-
-        if act == "barracks_up":
-            return config.acts_enabled.barracks and config.a_cost[3] <= money and self._check_if_empty(x, y - 1)
-        if act == "barracks_down":
-            return config.acts_enabled.barracks and config.a_cost[3] <= money and self._check_if_empty(x, y + 1)
-        if act == "barracks_right":
-            return config.acts_enabled.barracks and config.a_cost[3] <= money and self._check_if_empty(x + 1, y)
-        if act == "barracks_left":
-            return config.acts_enabled.barracks and config.a_cost[3] <= money and self._check_if_empty(x - 1, y)
-
-        if act == "rifle_infantry_up":
-            return config.acts_enabled.rifle_infantry and config.a_cost[4] <= money and self._check_if_empty(x, y - 1)
-        if act == "rifle_infantry_down":
-            return config.acts_enabled.rifle_infantry and config.a_cost[4] <= money and self._check_if_empty(x, y + 1)
-        if act == "rifle_infantry_right":
-            return config.acts_enabled.rifle_infantry and config.a_cost[4] <= money and self._check_if_empty(x + 1, y)
-        if act == "rifle_infantry_left":
-            return config.acts_enabled.rifle_infantry and config.a_cost[4] <= money and self._check_if_empty(x - 1, y)
-
-        if act == "town_hall_up":
-            return config.acts_enabled.town_hall and config.a_cost[5] <= money and self._check_if_empty(x, y - 1)
-        if act == "town_hall_down":
-            return config.acts_enabled.town_hall and config.a_cost[5] <= money and self._check_if_empty(x, y + 1)
-        if act == "town_hall_right":
-            return config.acts_enabled.town_hall and config.a_cost[5] <= money and self._check_if_empty(x + 1, y)
-        if act == "town_hall_left":
-            return config.acts_enabled.town_hall and config.a_cost[5] <= money and self._check_if_empty(x - 1, y)
-        print("Unrecognised action", act)
-        sys.exit(0)
-
-    def _check_if_empty(self, x, y):
-        """
-        Checks if tile is empty
-        :param x: if x coordinate is empty
-        :param y: if y coordinate is empty
-        :return: true/false
-        """
-        # noinspection PyChainedComparisons
-        return self.n > x >= 0 and 0 <= y < self.n and self[x][y][P_NAME_IDX] == 0
-
-    def _check_if_attack(self, x, y, n_x, n_y):
-        """
-        Check if actor on x,y can attack actor on n_x,n_y
-        :param x: actor on coordinate x
-        :param y: actor on coordinate y
-        :param n_x: can attack actor on coordinate n_x
-        :param n_y: can attack actor on coordinate n_y
-        :return: true/false
-        """
-        return 0 <= n_x < self.n and 0 <= n_y < self.n and self[x][y][P_NAME_IDX] == -self[n_x][n_y][P_NAME_IDX] and self[n_x][n_y][A_TYPE_IDX] != d_a_type['Gold']
-
-    def _check_if_heal(self, x, y, config):
-        """
-        Check if actor on x,y can be healed
-        :param x: coordinate of actor that is getting to be healed
-        :param y: coordinate of actor that is getting to be healed
-        :param config: special config specific for each player (max_health, heal_cost)
-        :return: true/false
-        """
-        return 0 <= x < self.n and 0 <= y < self.n and self[x][y][P_NAME_IDX] == self[x][y][P_NAME_IDX] and self[x][y][A_TYPE_IDX] != d_a_type['Gold'] and self[x][y][A_TYPE_IDX] > 0 and self[x][y][HEALTH_IDX] < config.a_max_health[self[x][y][A_TYPE_IDX]] and (
-                config.SACRIFICIAL_HEAL or self[x][y][MONEY_IDX] - config.HEAL_COST >= 0)
-
-    def _check_if_nearby(self, x, y, a_type, check_friendly=False):
-        """
-        Checks if actor is nearby - friendly or foe
-        :param x: coordinate of current actor
-        :param y: coordinate of current actor
-        :param a_type: type of nearby actor
-        :param check_friendly: check if nearby actor should be friendly
-        :return: true/false
-        """
-        coordinates = [(x - 1, y + 1),
-                       (x, y + 1),
-                       (x + 1, y + 1),
-                       (x - 1, y),
-                       (x + 1, y),
-                       (x - 1, y - 1),
-                       (x, y - 1),
-                       (x + 1, y - 1)]
-        for n_x, n_y in coordinates:
-            if 0 <= n_x < self.n and 0 <= n_y < self.n:
-                if self[n_x][n_y][A_TYPE_IDX] == a_type:
-                    if not check_friendly:
-                        return True
-                    if self[n_x][n_y][P_NAME_IDX] == self[x][y][P_NAME_IDX]:
-                        return True
-        return False
+        return self.get_valid_moves(player, config=config)[x, y].astype(int).tolist()
+
+    def get_valid_moves(self, player, config) -> np.ndarray:
+        """
+        Returns valid actions for all tiles of specified player at once (see get_valid_moves_batch)
+        :param player: int - player that is executing actions
+        :param config: additional config that is separate for each player
+        :return: bool array of shape (n, n, NUM_ACTS), indexed [x, y, action_index]
+        """
+        return get_valid_moves_batch(self.state, player, config)
+
+    def has_valid_moves(self, player, config) -> bool:
+        """
+        Checks if player has any valid action, without building action vector
+        :param player: int - player that is executing actions
+        :param config: additional config that is separate for each player
+        :return: True if any actor of player can execute any action
+        """
+        n = self.n
+        p_name = self.pieces[:, :, P_NAME_IDX]
+        a_type = self.pieces[:, :, A_TYPE_IDX].astype(int)
+        own = (p_name == player) & (a_type != d_a_type['Gold'])
+        if not own.any():
+            return False
+        # every actor type can idle
+        if config.acts_enabled.idle:
+            return True
+        # usually some actor can walk to empty tile next to it
+        empty = np.zeros((n + 2, n + 2), dtype=bool)
+        empty[1:-1, 1:-1] = p_name == 0
+        movers = own[:, :, None] & A_TYPE_MOVES[a_type]
+        for i, (direction, (dx, dy)) in enumerate(DIRECTIONS.items()):
+            if config.acts_enabled[direction] and (movers[:, :, i] & empty[1 + dx:n + 1 + dx, 1 + dy:n + 1 + dy]).any():
+                return True
+        return bool(self.get_valid_moves(player, config=config).any())
 
     @staticmethod
     def _num_destroys(time):
@@ -422,25 +505,18 @@ class Board:
         """
         # I can pass player through, because this board is canonical board that this action gets executed upon
 
-        current_time = self[0][0][TIME_IDX]
+        current_time = int(self.state['time'])
 
         destroys_per_round = self._num_destroys(current_time)
         damage_amount = self._damage(current_time)
 
-        # Damage as many actors as "damage_amount" parameter provides
-        currently_damaged_actors = 0
-        for y in range(self.n):
-            for x in range(self.n):
-                if self[x][y][P_NAME_IDX] == player and self[x][y][A_TYPE_IDX] != 1:  # for current player and not gold
-                    if currently_damaged_actors >= destroys_per_round:
-                        return
-                    self[x][y][HEALTH_IDX] -= damage_amount
-
-                    if self[x][y][HEALTH_IDX] <= 0:
-                        time = self[x][y][TIME_IDX]
-                        self[x][y] = [0] * NUM_ENCODERS
-                        self[x][y][TIME_IDX] = time
-                    currently_damaged_actors += 1
+        # Damage as many actors as "destroys_per_round" parameter provides, for current player and not gold, in order of y, then x
+        actors = (self.pieces[:, :, P_NAME_IDX] == player) & (self.pieces[:, :, A_TYPE_IDX] != d_a_type['Gold'])
+        y, x = np.divmod(np.flatnonzero(actors.T)[:destroys_per_round], self.n)
+        self.pieces[x, y, HEALTH_IDX] -= damage_amount
+
+        destroyed = self.pieces[x, y, HEALTH_IDX] <= 0
+        self.pieces[x[destroyed], y[destroyed]] = 0
 
     @staticmethod
     def clamp(num, min_value, max_value):
@@ -452,7 +528,7 @@ class Board:
         :param player: player that requires to know his money count
         :return: money count for specified player
         """
-        return sum([self[x][y][MONEY_IDX] for x in range(self.n) for y in range(self.n) if self[x][y][P_NAME_IDX] == player])
+        return self.get_money(player)
 
     def get_health_score(self, player) -> int:
         """
@@ -460,7 +536,7 @@ class Board:
         :param player: player that requires to know sum of health for his units
         :return: sum of health for specified player
         """
-        return sum([self[x][y][HEALTH_IDX] for x in range(self.n) for y in range(self.n) if self[x][y][P_NAME_IDX] == player])
+        return self.pieces[:, :, HEALTH_IDX][self.pieces[:, :, P_NAME_IDX] == player].sum()
 
     def get_combined_score(self, player) -> int:
         """
@@ -469,4 +545,4 @@ class Board:
         :return: count of money + sum of health of specified players' units
         """
         # money is not worth more than 1hp because this forces players to spend money in order to create new units
-        return sum([self[x][y][HEALTH_IDX] + self[x][y][MONEY_IDX] for x in range(self.n) for y in range(self.n) if self[x][y][P_NAME_IDX] == player])
+        return self.get_health_score(player) + self.get_money(player)
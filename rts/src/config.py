@@ -44,6 +44,11 @@ HEALTH_IDX = 2
 CARRY_IDX = 3
 MONEY_IDX = 4
 TIME_IDX = 5
+# In simultaneous mode nets also get plane of actors that already acted in current turn (see Board.to_tensor)
+ACTED_IDX = 6
+
+# Board states store only first NUM_PLANES encoders on every tile. Money of each player and remaining time are stored once per board (see Board.state_dtype) and are added as planes for nets by Board.to_tensor
+NUM_PLANES = 4
 
 # ##################################
 # ########### ACTORS ###############
@@ -276,6 +281,7 @@ class Configuration:
     class _NNetArgs:
         def __init__(self,
                      use_one_hot_encoder,
+                     simultaneous_moves,
                      lr,
                      dropout,
                      epochs,
@@ -292,13 +298,14 @@ class Configuration:
 
             # Should one-hot encoder be used (recommended)
             if use_one_hot_encoder:
-                self.encoder = OneHotEncoder()
+                self.encoder = OneHotEncoder(acted=simultaneous_moves)
             else:
-                self.encoder = NumericEncoder()
+                self.encoder = NumericEncoder(acted=simultaneous_moves)
 
     class _GameConfig:
         def __init__(self,
                      onehot_encoder,
+                     simultaneous_moves,
                      money_increment,
                      initial_gold,
                      maximum_gold,
@@ -316,9 +323,9 @@ class Configuration:
                      timeout):
 
             if onehot_encoder:
-                self.encoder = OneHotEncoder()
+                self.encoder = OneHotEncoder(acted=simultaneous_moves)
             else:
-                self.encoder = NumericEncoder()
+                self.encoder = NumericEncoder(acted=simultaneous_moves)
 
             # ##################################
             # ############# GOLD ###############
@@ -467,9 +474,9 @@ class Configuration:
                 from MCTS import MCTS
 
                 if onehot_encoder:
-                    encoder = OneHotEncoder()
+                    encoder = OneHotEncoder(acted=g.simultaneous)
                 else:
-                    encoder = NumericEncoder()
+                    encoder = NumericEncoder(acted=g.simultaneous)
                 n1 = NNet(g, encoder)
                 n1.load_checkpoint('.\\..\\temp\\', player_model_file)
                 args1 = dotdict(player_config or {'numMCTSSims': 2, 'cpuct': 1.0})
@@ -491,7 +498,8 @@ class Configuration:
                      load_folder_file,
                      num_iters_for_train_examples_history,
                      save_train_examples,
-                     load_train_examples):
+                     load_train_examples,
+                     max_pending_writes):
             self.numIters = num_iters  # total number of games played from start to finish is numIters * numEps
             self.numEps = num_eps  # How may game is played in this episode
             self.tempThreshold = temp_threshold
@@ -508,6 +516,7 @@ class Configuration:
 
             self.save_train_examples = save_train_examples
             self.load_train_examples = load_train_examples
+            self.maxPendingWrites = max_pending_writes  # how many checkpoint/example writes may queue up in the background
 
     class BoardTile:
         def __init__(self,
@@ -524,6 +533,7 @@ class Configuration:
                  grid_size=8,
                  learn_visibility=0,
                  pit_visibility=4,
+                 simultaneous_moves: bool = False,
 
                  onehot_encoder_player1: bool = True,
                  money_increment_player1: int = 3,
@@ -575,6 +585,7 @@ class Configuration:
                  num_iters_for_train_examples_history: int = 8,
                  save_train_examples: bool = False,
                  load_train_examples: bool = False,
+                 max_pending_writes: int = 2,
 
                  player1_type: str = 'nnet',
                  player2_type: str = 'nnet',
@@ -595,6 +606,7 @@ class Configuration:
         :param grid_size: Grid size of game for example 8,6...
         :param learn_visibility: How much console should output while running learn. If visibility.verbose > 3, Pygame is shown
         :param pit_visibility: How much console should output while running pit. If visibility.verbose > 3, Pygame is shown
+        :param simultaneous_moves: If every actor of player should execute one action each turn, instead of only one actor per turn. Actors act one after another and player and time change once all of them acted
 
         :param onehot_encoder_player1: Which encoder should this player use while pitting
         :param money_increment_player1: How much money player should gain when worker returns gold coins
@@ -717,6 +729,7 @@ class Configuration:
         :param num_iters_for_train_examples_history: How many iterations of train examples should be kept for learning. If this number is exceeded, oldest iteration of train exaples is removed from queue
         :param save_train_examples: If train examples should be saved to file (Caution if choosing this, because of memory error)
         :param load_train_examples: If train examples should be loaded from file (Caution if choosing this, because of memory error)
+        :param max_pending_writes: How many checkpoint and train examples writes can be queued for the background writer before learning waits for them
 
         :param player1_type: What type should player 1 be ("nnet", "random", "greedy", "human")
         :param player2_type: What type should player 2 be ("nnet", "random", "greedy", "human")
@@ -747,12 +760,15 @@ class Configuration:
 
         self.grid_size = grid_size
 
+        self.simultaneous_moves = simultaneous_moves
+
         self.visibility = 4
         self._pit_visibility = pit_visibility
         self._learn_visibility = learn_visibility
 
         self.player1_config = self._GameConfig(
             onehot_encoder=onehot_encoder_player1,
+            simultaneous_moves=simultaneous_moves,
             money_increment=money_increment_player1,
             initial_gold=initial_gold_player1,
             maximum_gold=maximum_gold_player1,
@@ -771,6 +787,7 @@ class Configuration:
 
         self.player2_config = self._GameConfig(
             onehot_encoder=onehot_encoder_player2,
+            simultaneous_moves=simultaneous_moves,
             money_increment=money_increment_player2,
             initial_gold=initial_gold_player2,
             maximum_gold=maximum_gold_player2,
@@ -801,7 +818,8 @@ class Configuration:
             load_folder_file=load_folder_file,
             num_iters_for_train_examples_history=num_iters_for_train_examples_history,
             save_train_examples=save_train_examples,
-            load_train_examples=load_train_examples)
+            load_train_examples=load_train_examples,
+            max_pending_writes=max_pending_writes)
 
         self.pit_args = self._PitArgs(
             player1_type=player1_type,
@@ -816,6 +834,7 @@ class Configuration:
         )
         self.nnet_args = self._NNetArgs(
             use_one_hot_encoder=use_one_hot_encoder,
+            simultaneous_moves=simultaneous_moves,
             lr=lr,
             dropout=dropout,
             epochs=epochs,
@@ -1,5 +1,3 @@
-from typing import List
-
 import numpy as np
 
 """
@@ -13,8 +11,12 @@ One-hot encoder uses binary representation of integer numbers, with exception of
 
 
 class Encoder:
-    def __init__(self):
+    def __init__(self, acted: bool = False):
+        """
+        :param acted: if plane of actors that already acted in current turn is encoded too, as needed in simultaneous mode
+        """
         self.NUM_ENCODERS = None
+        self.acted = acted
 
     def encode(self, board) -> np.ndarray:
         pass
@@ -29,30 +31,34 @@ class Encoder:
 
 class NumericEncoder(Encoder):
 
-    def __init__(self) -> None:
-        super().__init__()
-        self.NUM_ENCODERS = 6  # player_name, act_type, health, carrying, money, remaining_time
+    def __init__(self, acted: bool = False) -> None:
+        super().__init__(acted)
+        self.NUM_ENCODERS = 6 + acted  # player_name, act_type, health, carrying, money, remaining_time (and acted)
 
     def encode_multiple(self, boards: np.ndarray) -> np.ndarray:
         """
-        Do nothing - already encoded numerically
-        :param boards: just boards
-        :return: same boards
+        Already encoded numerically, only converted to tensors
+        :param boards: array of board states
+        :return: tensors of boards
         """
-        return boards
+        from rts.src.Board import to_tensor
+
+        return to_tensor(np.asarray(boards), self.acted)
 
     def encode(self, board) -> np.ndarray:
         """
-        Do nothing - already encoded numerically
-        :param board: just board
-        :return: same board
+        Already encoded numerically, only converted to tensor
+        :param board: board state
+        :return: tensor of board
         """
-        return board
+        from rts.src.Board import to_tensor
+
+        return to_tensor(board, self.acted)
 
 
 class OneHotEncoder(Encoder):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, acted: bool = False) -> None:
+        super().__init__(acted)
         self._build_indexes()
 
     def _build_indexes(self):
@@ -66,6 +72,7 @@ class OneHotEncoder(Encoder):
         self.CARRY_IDX_INC_OH = 1  # carrying-> 1 bit,
         self.MONEY_IDX_INC_OH = 8  # money-> 8 bits (255) [every unit has the same for player]
         self.REMAIN_IDX_INC_OH = 11  # 2^11 2048(za total annihilation)
+        self.ACTED_IDX_INC_OH = 1 if self.acted else 0  # acted in current turn -> 1 bit, only in simultaneous mode
 
         # builds indexes for character encoding - if not using one hot encoding, max indexes are incremented by 1 from previous index, but for one hot encoding, its incremented by num bits
         self.P_NAME_IDX_OH = 0
@@ -86,69 +93,47 @@ class OneHotEncoder(Encoder):
         self.REMAIN_IDX_OH = self.MONEY_IDX_MAX_OH
         self.REMAIN_IDX_MAX_OH = self.REMAIN_IDX_OH + self.REMAIN_IDX_INC_OH
 
-        self.NUM_ENCODERS = self.REMAIN_IDX_MAX_OH
+        self.ACTED_IDX_OH = self.REMAIN_IDX_MAX_OH
+        self.ACTED_IDX_MAX_OH = self.ACTED_IDX_OH + self.ACTED_IDX_INC_OH
 
-    @staticmethod
-    def itb(num: int, length: int) -> List[int]:
-        """
-        Converts integer to bit array
-        Someone fix this please :D - it's horrible
-        :param num: number to convert to bits
-        :param length: length of bits to convert to
-        :return: bit array
-        """
-        num = int(num)
-        if length == 1:
-            return [int(i) for i in '{0:01b}'.format(num)]
-        if length == 2:
-            return [int(i) for i in '{0:02b}'.format(num)]
-        if length == 3:
-            return [int(i) for i in '{0:03b}'.format(num)]
-        if length == 4:
-            return [int(i) for i in '{0:04b}'.format(num)]
-        if length == 5:
-            return [int(i) for i in '{0:05b}'.format(num)]
-        if length == 8:
-            return [int(i) for i in '{0:08b}'.format(num)]
-        if length == 11:
-            return [int(i) for i in '{0:011b}'.format(num)]
-        raise TypeError("Length not supported:", length)
+        self.NUM_ENCODERS = self.ACTED_IDX_MAX_OH
 
     def encode_multiple(self, boards: np.ndarray) -> np.ndarray:
         """
-        Encodes and returns multiple boards using onehot encoder
+        Encodes and returns multiple boards using onehot encoder. Bits of all tiles of all boards are extracted at once, using shifts
         :param boards: array of boards to encode
         :return: new boards, encoded using onehot encoder
         """
-        new_boards = []
-        for board in boards:
-            new_boards.append(self.encode(board))
-        return np.asarray(new_boards)
+        from rts.src.Board import money_plane
+        from rts.src.config import P_NAME_IDX, A_TYPE_IDX, HEALTH_IDX, CARRY_IDX
+
+        boards = np.asarray(boards)
+        pieces = boards['pieces']
+        # switch player from -1 to 2
+        p_name = pieces[..., P_NAME_IDX]
+        player = (p_name == 1) + 2 * (p_name == -1)
+
+        fields = [
+            (player, self.P_NAME_IDX_OH, self.P_NAME_IDX_INC_OH),
+            (pieces[..., A_TYPE_IDX], self.A_TYPE_IDX_OH, self.A_TYPE_IDX_INC_OH),
+            (pieces[..., HEALTH_IDX], self.HEALTH_IDX_OH, self.HEALTH_IDX_INC_OH),
+            (pieces[..., CARRY_IDX], self.CARRY_IDX_OH, self.CARRY_IDX_INC_OH),
+            (money_plane(boards), self.MONEY_IDX_OH, self.MONEY_IDX_INC_OH),
+            (np.broadcast_to(boards['time'][..., None, None], p_name.shape), self.REMAIN_IDX_OH, self.REMAIN_IDX_INC_OH),
+        ]
+        if self.acted:
+            fields.append((boards['acted'], self.ACTED_IDX_OH, self.ACTED_IDX_INC_OH))
+        b = np.empty(p_name.shape + (self.NUM_ENCODERS,), dtype=np.float32)
+        for values, start, length in fields:
+            # most significant bit first
+            shifts = np.arange(length - 1, -1, -1)
+            b[..., start:start + length] = (values.astype(np.int64)[..., None] >> shifts) & 1
+        return b
 
     def encode(self, board) -> np.ndarray:
         """
         Encode single board using onehot encoder
-        :param board: normal board
+        :param board: board state
         :return: new encoded board
         """
-        from rts.src.config import P_NAME_IDX, A_TYPE_IDX, HEALTH_IDX, CARRY_IDX, MONEY_IDX, TIME_IDX
-
-        n = board.shape[0]
-
-        b = np.zeros((n, n, self.NUM_ENCODERS))
-        for y in range(n):
-            for x in range(n):
-                # switch player from -1 to 2
-                player = 0
-                if board[x, y, P_NAME_IDX] == 1:
-                    player = 1
-                elif board[x, y, P_NAME_IDX] == -1:
-                    player = 2
-
-                b[x, y][self.P_NAME_IDX_OH:self.P_NAME_IDX_MAX_OH] = self.itb(player, self.P_NAME_IDX_INC_OH)
-                b[x, y][self.A_TYPE_IDX_OH:self.A_TYPE_IDX_MAX_OH] = self.itb(board[x, y, A_TYPE_IDX], self.A_TYPE_IDX_INC_OH)
-                b[x, y][self.HEALTH_IDX_OH:self.HEALTH_IDX_MAX_OH] = self.itb(board[x, y, HEALTH_IDX], self.HEALTH_IDX_INC_OH)
-                b[x, y][self.CARRY_IDX_OH:self.CARRY_IDX_MAX_OH] = self.itb(board[x, y, CARRY_IDX], self.CARRY_IDX_INC_OH)
-                b[x, y][self.MONEY_IDX_OH:self.MONEY_IDX_MAX_OH] = self.itb(board[x, y, MONEY_IDX], self.MONEY_IDX_INC_OH)
-                b[x, y][self.REMAIN_IDX_OH:self.REMAIN_IDX_MAX_OH] = self.itb(board[x, y, TIME_IDX], self.REMAIN_IDX_INC_OH)
-        return b
+        return self.encode_multiple(board)
@@ -0,0 +1,229 @@
+"""
+To run tests:
+pytest-3 rts
+"""
+
+import numpy as np
+
+from Arena import Arena
+from rts.RTSEnv import RTSEnv, RTSVecEnv, random_actions
+from rts.RTSGame import RTSGame
+from rts.RTSPlayers import RandomPlayer, GreedyRTSPlayer
+from rts.src.Board import Board, MONEY_SLOT, to_tensor
+from rts.src.config import Configuration, ACTS, NUM_ACTS, d_a_type, P_NAME_IDX, A_TYPE_IDX, HEALTH_IDX, CARRY_IDX, MONEY_IDX, TIME_IDX, NUM_ENCODERS
+from rts.src.encoders import NumericEncoder, OneHotEncoder
+
+
+def action(game, x, y, act):
+    return np.ravel_multi_index((y, x, act), (game.n, game.n, NUM_ACTS))
+
+
+def money(board, player):
+    return board['money'][MONEY_SLOT[player]]
+
+
+def valid_actions(game, board, player):
+    return sorted((int(x), int(y), int(act)) for y, x, act in zip(*np.unravel_index(np.nonzero(game.getValidMoves(board, player))[0], (game.n, game.n, NUM_ACTS))))
+
+
+def test_valid_moves():
+    game = RTSGame()
+    board = game.getInitBoard()
+    board['money'] = 1
+    # town hall on (3, 3) can spawn a worker on empty tiles, gold is below it and enemy hall to its right
+    assert valid_actions(game, board, 1) == [(3, 3, ACTS['npc_up']), (3, 3, ACTS['npc_left'])]
+    assert valid_actions(game, board, -1) == [(4, 3, ACTS['npc_up']), (4, 3, ACTS['npc_right'])]
+
+    board, player = game.getNextState(board, 1, action(game, 3, 3, ACTS['npc_left']))
+    pieces = board['pieces']
+    assert pieces[2, 3, A_TYPE_IDX] == d_a_type['Work'] and money(board, 1) == 0
+    # worker next to gold can mine and walk, nothing is affordable anymore
+    assert valid_actions(game, board, 1) == [(2, 3, ACTS['up']), (2, 3, ACTS['down']), (2, 3, ACTS['left']), (2, 3, ACTS['mine_resources'])]
+
+    # carrying worker next to its hall returns resources and can attack the enemy worker
+    pieces[2, 3, CARRY_IDX] = 1
+    pieces[2, 2] = pieces[2, 3]
+    pieces[2, 2, P_NAME_IDX] = -1
+    pieces[2, 2, HEALTH_IDX] = 5
+    actions = valid_actions(game, board, 1)
+    assert (2, 3, ACTS['return_resources']) in actions and (2, 3, ACTS['mine_resources']) not in actions
+    assert (2, 3, ACTS['up']) not in actions
+    pieces[2, 3, A_TYPE_IDX] = d_a_type['Rifl']
+    assert (2, 3, ACTS['attack_up']) in valid_actions(game, board, 1)
+
+
+def test_board_state():
+    game = RTSGame()
+    board = game.getInitBoard()
+    # more than 5 times smaller than float64 planes of all encoders
+    assert board.shape == () and board['pieces'].dtype == np.int16 and board.nbytes * 5 < game.n * game.n * NUM_ENCODERS * 8
+    assert money(board, 1) == money(board, -1) == 10
+    time = board['time']
+    board, _ = game.getNextState(board, 1, action(game, 3, 3, ACTS['npc_left']))
+    board, _ = game.getNextState(board, 1, action(game, 2, 3, ACTS['up']))
+    assert money(board, 1) == 9 and money(board, -1) == 10 and board['time'] == time - 2
+    assert board['pieces'][2, 2, A_TYPE_IDX] == d_a_type['Work']
+    assert game.stringRepresentation(board) == board.tobytes() and len(game.stringRepresentation(board)) == board.nbytes
+
+    # canonical form swaps money with players and nets see it on every tile of its owner
+    canonical = game.getCanonicalForm(board, -1)
+    assert money(canonical, 1) == 10 and money(canonical, -1) == 9 and money(board, 1) == 9
+    p_name = canonical['pieces'][:, :, P_NAME_IDX]
+    tensor = to_tensor(canonical)
+    assert tensor.shape == (game.n, game.n, NUM_ENCODERS) and (tensor[:, :, :MONEY_IDX] == canonical['pieces']).all()
+    assert (tensor[:, :, MONEY_IDX] == np.select([p_name == 1, p_name == -1], [10, 9])).all() and (tensor[:, :, TIME_IDX] == time - 2).all()
+    assert (NumericEncoder().encode_multiple([board, canonical])[1] == tensor).all()
+    for symmetry, _ in game.getSymmetries(canonical, [0] * game.getActionSize()):
+        assert money(symmetry, 1) == 10 and money(symmetry, -1) == 9 and symmetry['time'] == time - 2
+        assert (np.sort(symmetry['pieces'], axis=None) == np.sort(canonical['pieces'], axis=None)).all()
+
+
+def test_game_ended():
+    game = RTSGame()
+    board = game.getInitBoard()
+    pieces = board['pieces']
+    assert game.getGameEnded(board, 1) == 0
+    # hall without money can't spawn anything
+    board['money'][MONEY_SLOT[1]] = 0
+    assert game.getGameEnded(board, 1) == -1
+    board['money'][MONEY_SLOT[1]] = 1
+    pieces[2, 3] = pieces[3, 3]
+    pieces[2, 3, A_TYPE_IDX] = d_a_type['Work']
+    pieces[3, 3] = 0
+    # only gold and worker, that can walk around
+    assert game.getGameEnded(board, 1) == 0
+    pieces[3, 4] = 0
+    assert game.getGameEnded(board, 1) == -1 and game.getGameEnded(game.getCanonicalForm(board, -1), 1) == 1
+
+
+def test_time_killer():
+    game = RTSGame()
+    board = game.getInitBoard()
+    pieces = board['pieces']
+    pieces[5, 0] = [1, d_a_type['Work'], 5, 0]
+    pieces[0, 2] = [1, d_a_type['Rifl'], 20, 0]
+    pieces[1, 2] = [1, d_a_type['Work'], 10, 0]
+    b = Board(game.n, board)
+    board['time'] = 300
+    assert b.get_health_score(1) == 5 + 20 + 10 + 30 + 10 and b._num_destroys(300) == 2 and b._damage(300) == 7
+    # first two actors in order of y, then x lose health and destroyed ones are removed
+    b.time_killer(1)
+    assert pieces[5, 0, P_NAME_IDX] == 0 and pieces[0, 2, HEALTH_IDX] == 13 and pieces[1, 2, HEALTH_IDX] == 10
+    assert b.get_health_score(1) == 13 + 10 + 30 + 10 and b.get_combined_score(1) == 63 + 10 and b.get_money_score(-1) == 10
+
+
+def test_onehot_encoder():
+    game = RTSGame()
+    encoder = OneHotEncoder()
+    board = game.getInitBoard()
+    board['time'] = 100
+    encoded = encoder.encode(board)
+    assert encoded.shape == (game.n, game.n, encoder.NUM_ENCODERS)
+    # player 1 hall: player, actor type, health, carrying, money of player and remaining time, most significant bit first
+    assert encoded[3, 3].tolist() == [0, 1] + [1, 0, 1] + [1, 1, 1, 1, 0] + [0] + [0, 0, 0, 0, 1, 0, 1, 0] + [0, 0, 0, 0, 1, 1, 0, 0, 1, 0, 0]
+    # player -1 is encoded as 2
+    assert encoded[4, 3, :2].tolist() == [1, 0] and not encoded[0, 0, :encoder.REMAIN_IDX_OH].any()
+    boards = np.array([board, game.getCanonicalForm(board, -1)])
+    assert (encoder.encode_multiple(boards) == [encoded, encoder.encode(boards[1])]).all()
+
+
+def test_simultaneous_moves():
+    game = RTSGame()
+    board = game.getInitBoard()
+    board['pieces'][2, 3] = [1, d_a_type['Work'], 10, 0]
+    board['pieces'][3, 1] = [1, d_a_type['Work'], 10, 0]
+    pi = np.zeros(game.getActionSize())
+    pi[action(game, 3, 3, ACTS['npc_up'])] = 1
+    pi[action(game, 2, 3, ACTS['up'])] = 1
+    pi[action(game, 2, 3, ACTS['down'])] = 2
+    # every actor gets most probable of its valid actions, actors without probability get any valid action
+    actions = game.getJointAction(board, 1, pi, temp=0)
+    assert len(actions) == 3 and actions[1:] == [action(game, 2, 3, ACTS['down']), action(game, 3, 3, ACTS['npc_up'])]
+    assert all(game.getValidMoves(board, 1)[a] for a in game.getJointAction(board, 1, pi))
+
+    # all actors act in one turn, worker can't walk to tile where hall spawned another worker
+    actions = [action(game, 3, 3, ACTS['npc_up']), action(game, 2, 3, ACTS['left']), action(game, 3, 1, ACTS['down'])]
+    next_board, player = game.getNextState(board, 1, actions)
+    pieces = next_board['pieces']
+    assert player == -1 and next_board['time'] == board['time'] - 1 and money(next_board, 1) == money(board, 1) - 1
+    assert pieces[3, 2, HEALTH_IDX] == 10 and pieces[1, 3, A_TYPE_IDX] == d_a_type['Work']
+    assert pieces[2, 3, A_TYPE_IDX] == 0 and pieces[3, 1, A_TYPE_IDX] == d_a_type['Work']
+
+    # in simultaneous mode single actions are taken by one actor after another in order of tiles, player and time change once all of them acted
+    game.simultaneous = True
+    steps = [(3, 1, ACTS['down']), (2, 3, ACTS['left']), (3, 3, ACTS['npc_left'])]
+    for i, (x, y, act) in enumerate(steps):
+        assert {(vx, vy) for vx, vy, _ in valid_actions(game, board, 1)} == {(x, y)}
+        board, player = game.getNextState(board, 1, action(game, x, y, act))
+        if i == 0:
+            # actor that moved is marked on its new tile and symmetries keep it
+            assert player == 1 and board['time'] == next_board['time'] + 1 and board['acted'].sum() == 1 and board['acted'][3, 2]
+            assert all(symmetry['acted'].sum() == 1 and symmetry['pieces'][symmetry['acted']][0, A_TYPE_IDX] == d_a_type['Work'] for symmetry, _ in game.getSymmetries(board, [0] * game.getActionSize()))
+    assert player == -1 and board['time'] == next_board['time'] and not board['acted'].any()
+    assert board['pieces'][2, 3, A_TYPE_IDX] == d_a_type['Work'] and board['pieces'][1, 3, A_TYPE_IDX] == d_a_type['Work']
+
+
+def test_acted_plane():
+    game = RTSGame(Configuration(simultaneous_moves=True))
+    board = game.getInitBoard()
+    board['pieces'][2, 3] = [1, d_a_type['Work'], 10, 0]
+    # worker idles, so only acted plane tells that hall acts next
+    next_board, player = game.getNextState(board, 1, action(game, 2, 3, ACTS['idle']))
+    assert player == 1 and (next_board['pieces'] == board['pieces']).all()
+    assert game.getBoardSize() == (game.n, game.n, NUM_ENCODERS + 1)
+    for encoder in (NumericEncoder(acted=True), OneHotEncoder(acted=True), game.config.nnet_args.encoder):
+        encoded = encoder.encode_multiple([board, next_board])
+        assert encoded.shape == (2, game.n, game.n, encoder.num_encoders)
+        assert (encoded[..., :-1] == encoder.encode(board)[..., :-1]).all()
+        assert not encoded[0, ..., -1].any() and encoded[1, ..., -1].sum() == 1 and encoded[1, 2, 3, -1] == 1
+    assert NumericEncoder(acted=True).num_encoders == NumericEncoder().num_encoders + 1 == game.getBoardSize()[2]
+
+
+def test_env():
+    # configuration is given to environment, global CONFIG stays as it is
+    env = RTSEnv(Configuration(timeout_player1=10, timeout_player2=10))
+    board = env.reset()
+    assert board['time'] == 10 and env.player == 1 and money(board, 1) == 1
+    assert (env.legal_actions() == np.flatnonzero(env.game.getValidMoves(board, 1))).all()
+    board, result, done = env.step(action(env.game, 3, 3, ACTS['npc_left']))
+    assert env.player == -1 and env.turn == 1 and not done and result == 0
+    assert board['pieces'][2, 3, P_NAME_IDX] == -1 and money(board, -1) == 0
+
+    # players don't need display, games end on timeout
+    for player in (RandomPlayer(env.game).play, GreedyRTSPlayer(env.game, verbose=False).play):
+        result = env.rollout(player, player)
+        assert result != 0 and result == env.result and env.turn <= 10
+
+
+def test_arena_simultaneous():
+    # players choose action of one actor at a time, so every turn with several actors takes several steps
+    np.random.seed(0)
+    game = RTSGame(Configuration(simultaneous_moves=True, timeout_player1=30, timeout_player2=30))
+    for player2 in (RandomPlayer(game).play, GreedyRTSPlayer(game, verbose=False).play):
+        one_won, two_won, draws = Arena(RandomPlayer(game).play, player2, game).playGames(2)
+        assert one_won + two_won + draws == 2
+
+
+def test_batch_matches_single_board():
+    # timeout with paid heal, and time killer with sacrificial heal
+    for config in (Configuration(), Configuration(use_timeout_player1=False, use_timeout_player2=False, sacrificial_heal_player1=True, sacrificial_heal_player2=True)):
+        np.random.seed(0)
+        env = RTSVecEnv(16, config)
+        game = env.game
+        observations = env.reset()
+        for _ in range(200):
+            boards, players = np.copy(env.boards), np.copy(env.players)
+            valids = env.legal_actions()
+            actions = random_actions(valids)
+            next_boards, next_players = game.getNextStateBatch(boards, players, actions)
+            results = game.getGameEndedBatch(next_boards, np.ones(len(boards), dtype=int))
+            for i in range(len(boards)):
+                assert (valids[i] == game.getValidMoves(boards[i], players[i])).all() and valids[i, actions[i]]
+                assert observations[i].tobytes() == game.getCanonicalForm(boards[i], players[i]).tobytes()
+                board, player = game.getNextState(boards[i], players[i], actions[i])
+                assert board.tobytes() == next_boards[i].tobytes() and player == next_players[i]
+                assert results[i] == game.getGameEnded(board, 1)
+            observations, step_results, done = env.step(actions)
+            # ended games start again
+            assert (step_results == results).all() and (done == (results != 0)).all() and (env.players[done] == 1).all()
+        assert env.games > 0
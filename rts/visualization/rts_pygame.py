@@ -5,7 +5,8 @@ from typing import Any, Tuple, Optional
 import numpy as np
 
 sys.path.append('../..')
-from rts.src.config import P_NAME_IDX, A_TYPE_IDX, d_a_color, d_type_rev, MONEY_IDX, TIME_IDX, CARRY_IDX, HEALTH_IDX
+from rts.src.Board import MONEY_SLOT
+from rts.src.config import P_NAME_IDX, A_TYPE_IDX, d_a_color, d_type_rev, CARRY_IDX, HEALTH_IDX
 
 """
 rts_pygame.py
@@ -70,7 +71,7 @@ def update_graphics(board: np.ndarray, game_display, clock, fps: int = 1) -> Non
     """
     import pygame
 
-    n = board.shape[0]
+    n = board['pieces'].shape[0]
 
     canvas_scale = int(ctypes.windll.user32.GetSystemMetrics(1) * (16 / 30) / n)  # for drawing - it takes 2 thirds of screen height
 
@@ -90,22 +91,22 @@ def update_graphics(board: np.ndarray, game_display, clock, fps: int = 1) -> Non
                 message_display(game_display, u"" + str(x / canvas_scale - 1) + ", " + str(y / canvas_scale - 1), ((x + canvas_scale / 4), (y + canvas_scale / 10)), int(canvas_scale / 8))
 
     # gold for each player:
-    gold_p1 = board[int(n / 2) - 1][int(n / 2)][MONEY_IDX]
-    gold_p2 = board[int(n / 2)][int(n / 2) - 1][MONEY_IDX]
+    gold_p1 = board['money'][MONEY_SLOT[1]]
+    gold_p2 = board['money'][MONEY_SLOT[-1]]
 
     message_display(game_display, u"" + 'Gold Player +1: ' + str(gold_p1), (int((n / 8) * canvas_scale), (n + 1) * canvas_scale + int(int(canvas_scale / 12) + canvas_scale * (0 / 4) + int(canvas_scale * (1 / 8)))), int(canvas_scale / 6))
     message_display(game_display, u"" + 'Gold Player -1: ' + str(gold_p2), (int((n / 8) * canvas_scale), (n + 1) * canvas_scale + int(int(canvas_scale / 12) + canvas_scale * (1 / 4) + int(canvas_scale * (1 / 8)))), int(canvas_scale / 6))
 
-    time_remaining = board[0][0][TIME_IDX]
+    time_remaining = board['time']
     message_display(game_display, u"" + 'Remaining ' + str(time_remaining), (int((n / 8) * canvas_scale), (n + 1) * canvas_scale + int(int(canvas_scale / 12) + canvas_scale * (2 / 4) + int(canvas_scale * (1 / 8)))), int(canvas_scale / 6))
 
     for y in range(n):
         for x in range(n):
-            a_player = board[x][y][P_NAME_IDX]
+            a_player = board['pieces'][x, y, P_NAME_IDX]
 
             if a_player == 1 or a_player == -1:
 
-                a_type = board[x][y][A_TYPE_IDX]
+                a_type = board['pieces'][x, y, A_TYPE_IDX]
                 actor_color = d_a_color[a_type]
 
                 actor_location = (int(x * canvas_scale + canvas_scale / 2 + canvas_scale), int(y * canvas_scale + canvas_scale / 2) + canvas_scale)
@@ -114,8 +115,8 @@ def update_graphics(board: np.ndarray, game_display, clock, fps: int = 1) -> Non
                 actor_size = int(canvas_scale / 3)
                 actor_short_name = d_type_rev[a_type]
 
-                actor_carry = board[x][y][CARRY_IDX]
-                actor_health = board[x][y][HEALTH_IDX]
+                actor_carry = board['pieces'][x, y, CARRY_IDX]
+                actor_health = board['pieces'][x, y, HEALTH_IDX]
 
                 pygame.draw.circle(game_display, actor_color, actor_location, actor_size)
 
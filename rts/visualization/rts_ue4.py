@@ -47,7 +47,7 @@ class TD2020LearnAPI(TFPluginAPI):
             with session.as_default():
                 current_directory = os.path.join(os.path.dirname(__file__), 'temp/')
                 self.g = RTSGame()
-                n1 = NNet(self.g, OneHotEncoder())
+                n1 = NNet(self.g, OneHotEncoder(acted=self.g.simultaneous))
                 n1.load_checkpoint(current_directory, 'best.pth.tar')
                 args = dotdict({'numMCTSSims': 2, 'cpuct': 1.0})
                 self.mcts = MCTS(self.g, n1, args)
@@ -96,7 +96,7 @@ class TD2020LearnAPI(TFPluginAPI):
                 canonical_board = self.g.getCanonicalForm(b, self.owning_player)
 
                 recommended_act = n1p(canonical_board)
-                y, x, action_index = np.unravel_index(recommended_act, [b.shape[0], b.shape[0], NUM_ACTS])
+                y, x, action_index = np.unravel_index(recommended_act, [self.g.n, self.g.n, NUM_ACTS])
 
                 # gc.collect()
                 act = {"x": str(x), "y": str(y), "action": ACTS_REV[action_index]}
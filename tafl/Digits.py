@@ -8,7 +8,7 @@ def int2base(x, base, length):
     if x < 0:
         sign = -1
     elif x == 0:
-        return digs[0]
+        return [0]*length
     else:
         sign = 1
 
@@ -25,6 +25,34 @@ def int2base(x, base, length):
     while len(digits)<length: digits.extend(["0"])
     
     return list(map(lambda x: int(x),digits))
+
+
+# Compact action encoding: origin square x1+y1*n, direction (+x, -x, +y, -y)
+# and distance 1..n-1, n*n*4*(n-1) actions instead of the n**4 of int2base.
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+def move2action(move, n):
+    x1, y1, x2, y2 = move
+    dx, dy = x2-x1, y2-y1
+    distance = abs(dx+dy)
+    direction = DIRECTIONS.index((dx//distance, dy//distance))
+    return ((x1+y1*n)*4 + direction)*(n-1) + distance-1
+
+def action2move(action, n):
+    square, rest = divmod(action, 4*(n-1))
+    y1, x1 = divmod(square, n)
+    direction, distance = divmod(rest, n-1)
+    dx, dy = DIRECTIONS[direction]
+    return [x1, y1, x1+dx*(distance+1), y1+dy*(distance+1)]
+
+def base2action(x, n):
+    """Converts an int2base index x1+y1*n+x2*n**2+y2*n**3 to the compact action."""
+    return move2action(int2base(x, n, 4), n)
+
+def action2base(action, n):
+    """Converts a compact action to its int2base index x1+y1*n+x2*n**2+y2*n**3."""
+    x1, y1, x2, y2 = action2move(action, n)
+    return x1+y1*n+x2*n**2+y2*n**3
     
 
 def test():
@@ -5,86 +5,153 @@ from Game import Game
 from .TaflLogic import Board
 import numpy as np
 from .GameVariants import *
-from .Digits import int2base
+from .Digits import action2move, move2action, DIRECTIONS
+
+# planes of the board tensor, indexed [x,y,plane]
+ATTACKER, DEFENDER, KING, THRONE, CORNER, TO_MOVE = range(6)
+NUM_PLANES = 6
 
 class TaflGame(Game):
+    """
+    Boards are n x n x NUM_PLANES int8 tensors. The attacker, defender and
+    king planes hold 1 for the pieces of the player the board is seen from
+    and -1 for the opponent (defenders are player 1 on the initial board),
+    throne and corner planes mark the special squares and the to move plane
+    is 1 when the defenders move and -1 when the attackers move.
+    The rules run on TaflLogic.Board.
+    """
 
     def __init__(self, name):
         self.name = name
-
-    def getInitBoard(self):    
-        board=Board(Tafl())
-        if self.name=="Brandubh": board=Board(Brandubh())
-        if self.name=="ArdRi": board=Board(ArdRi())
-        if self.name=="Tablut": board=Board(Tablut())
-        if self.name=="Tawlbwrdd": board=Board(Tawlbwrdd())
-        if self.name=="Hnefatafl": board=Board(Hnefatafl())
-        if self.name=="AleaEvangelii": board=Board(AleaEvangelii())
-        self.n=board.size         
+        variants = {"Brandubh": Brandubh, "ArdRi": ArdRi, "Tablut": Tablut, "Tawlbwrdd": Tawlbwrdd,
+                    "Hnefatafl": Hnefatafl, "AleaEvangelii": AleaEvangelii}
+        self.variant = variants.get(name, Tafl)()
+        self.n = self.variant.size
+        self.symmetries = None
+
+    def getInitBoard(self):
+        gv = self.variant
+        board = np.zeros((self.n, self.n, NUM_PLANES), dtype=np.int8)
+        for x, y, t in gv.board:
+            board[x, y, CORNER if t == 1 else THRONE] = 1
+        for x, y, t in gv.pieces:
+            board[x, y, {-1: ATTACKER, 1: DEFENDER, 2: KING}[t]] = t//abs(t)
+        board[:, :, TO_MOVE] = 1
         return board
-        
 
     def getBoardSize(self):
         # (a,b) tuple
         return (self.n, self.n)
 
     def getActionSize(self):
-        # return number of actions
-        return self.n**4 
+        # return number of actions, origin square x direction x distance
+        return self.n*self.n*4*(self.n-1)
 
     def getNextState(self, board, player, action):
         # if player takes action on board, return next (board,player)
-        # action must be a valid move
-        b = board.getCopy()
-        move = int2base(action,self.n,4)
+        # an action that is not a legal move passes
+        b = self.getLogicBoard(board)
+        x1, y1, x2, y2 = move = action2move(action,self.n)
+        time = b.time
         b.execute_move(move, player)
-        return (b, -player)
+        nextBoard = np.copy(board)
+        if b.time != time:
+            # moved, the grid tells which pieces were captured
+            nextBoard[x2, y2, :THRONE] = board[x1, y1, :THRONE]
+            nextBoard[:, :, :THRONE] *= (b.grid != 0)[:, :, None]
+        nextBoard[:, :, TO_MOVE] *= -1
+        return (nextBoard, -player)
 
     def getValidMoves(self, board, player):
-        # return a fixed size binary vector
-        valids = [0]*self.getActionSize()
-        b = board.getCopy()
-        legalMoves =  b.get_legal_moves(player)
+        # return a fixed size binary vector, the moves of the side to move
+        valids = np.zeros(self.getActionSize(), dtype=np.int8)
+        b = self.getLogicBoard(board)
+        legalMoves =  b.get_legal_moves(board[0, 0, TO_MOVE])
         if len(legalMoves)==0:
             valids[-1]=1
-            return np.array(valids)
-        for x1, y1, x2, y2 in legalMoves:
-            valids[x1+y1*self.n+x2*self.n**2+y2*self.n**3]=1
-        return np.array(valids)
+            return valids
+        for move in legalMoves:
+            valids[move2action(move,self.n)]=1
+        return valids
 
     def getGameEnded(self, board, player):
-        # return 0 if not ended, if player 1 won, -1 if player 1 lost
-        return board.done*player
+        # return 0 if not ended, 1 if player won, -1 if player lost
+        king = board[:, :, KING]
+        if not king.any():
+            # the attackers won
+            return int(np.sign(board[:, :, ATTACKER].sum()))*player
+        if (king*board[:, :, CORNER]).any() or not board[:, :, ATTACKER].any():
+            # the defenders won
+            return int(king.sum())*player
+        return 0
 
     def getCanonicalForm(self, board, player):
-        # return state if player==1, else return -state if player==-1
-        b = board.getCopy()
-        #for p in b.pieces: p[2]=p[2]*player
+        # the pieces of player become 1, the to move plane keeps the side
+        if player == 1:
+            return board
+        b = np.copy(board)
+        b[:, :, :THRONE] *= -1
         return b
 
     def getSymmetries(self, board, pi):
         # mirror, rotational
-        assert(len(pi) == self.n**2)  
-        pi_board = np.reshape(pi[:-1], (self.n, self.n))
+        assert(len(pi) == self.getActionSize())
+        if self.symmetries is None:
+            self.symmetries = self._actionSymmetries()
+        pi = np.asarray(pi)
         l = []
-
-        for i in range(1, 5):
-            for j in [True, False]:
-                newB = np.rot90(board, i)
-                newPi = np.rot90(pi_board, i)
-                if j:
-                    newB = np.fliplr(newB)
-                    newPi = np.fliplr(newPi)
-                l += [(newB, list(newPi.ravel()) + [pi[-1]])]
+        for (i, j), perm in zip([(i, j) for i in range(1, 5) for j in [True, False]], self.symmetries):
+            newB = np.rot90(board, i)
+            if j:
+                newB = np.fliplr(newB)
+            newPi = np.empty_like(pi)
+            newPi[perm] = pi
+            l += [(newB, list(newPi))]
         return l
 
     def stringRepresentation(self, board):
         # numpy array (canonical board)
-        return board.tostring()
+        return board.tobytes()
 
     def getScore(self, board, player):
-        if board.done: return 1000*board.done*player
-        return board.countDiff(player)
+        done = self.getGameEnded(board, player)
+        if done: return 1000*done
+        return int(board[:, :, :THRONE].sum())*player
+
+    def getLogicBoard(self, board):
+        """Returns the TaflLogic.Board of a board tensor."""
+        gv = Tafl()
+        gv.size = self.n
+        gv.board = self.variant.board
+        gv.pieces = []
+        for plane, t in [(ATTACKER, -1), (DEFENDER, 1), (KING, 2)]:
+            xs, ys = np.nonzero(board[:, :, plane])
+            gv.pieces += [[x, y, t] for x, y in zip(xs.tolist(), ys.tolist())]
+        b = Board(gv)
+        b.time = 0 if board[0, 0, TO_MOVE] > 0 else 1
+        b.done = b._getWinLose()
+        return b
+
+    def _actionSymmetries(self):
+        # for each symmetry of getSymmetries, the action each action is mapped to
+        n = self.n
+        x1, y1, x2, y2 = np.array([action2move(a, n) for a in range(self.getActionSize())]).T
+        perms = []
+        for i in range(1, 5):
+            for j in [True, False]:
+                a, b, c, d = x1, y1, x2, y2
+                for _ in range(i):
+                    # np.rot90 moves (x,y) to (n-1-y,x)
+                    a, b, c, d = n-1-b, a, n-1-d, c
+                if j:
+                    b, d = n-1-b, n-1-d
+                dx, dy = np.sign(c-a), np.sign(d-b)
+                direction = np.zeros_like(dx)
+                for k, (ex, ey) in enumerate(DIRECTIONS):
+                    direction[(dx == ex) & (dy == ey)] = k
+                distance = np.abs(c-a) + np.abs(d-b)
+                perms.append(((a+b*n)*4 + direction)*(n-1) + distance-1)
+        return perms
 
 
 
@@ -100,15 +167,13 @@ def display(board):
              "22": "x",
        }
        print("---------------------")
-       print("Time: ",board.time)    
-       image=board.getImage()
+       print("To move: ", "white" if board[0, 0, TO_MOVE] > 0 else "black")
+       image = (np.abs(board[:, :, DEFENDER]) + 2*np.abs(board[:, :, KING]) - np.abs(board[:, :, ATTACKER])
+                + 10*board[:, :, CORNER] + 20*board[:, :, THRONE]).T.tolist()
        for i in range(len(image)-1,-1,-1):
            row=image[i]
            for col in row:
                c = render_chars[str(col)]
                sys.stdout.write(c)
-           print(" ") 
-       if (board.done!=0): print("***** Done: ",board.done)  
+           print(" ")
        print("---------------------")
-
-
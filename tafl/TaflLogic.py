@@ -1,47 +1,58 @@
+import copy
 import numpy as np
-from .GameVariants import Tafl
 
-class Board():
+# (dx, dy) of the four orthogonal directions
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
 
+class Board():
+    """
+    Tafl board. Pieces are kept as a list of [x,y,type] (type -1 attacker,
+    1 defender, 2 king; captured pieces have x=-99) together with an
+    occupancy grid of piece types and a grid of piece numbers, both indexed
+    [x,y]. Special squares (1 corner, 2 throne) are kept in a third grid.
+    """
 
     def __init__(self, gv):
-      self.size=gv.size  
-      self.width=gv.size
-      self.height=gv.size
-      self.board=gv.board #[x,y,type]
-      self.pieces=gv.pieces #[x,y,type]
-      self.time=0
-      self.done=0
+        self.size=gv.size
+        self.width=gv.size
+        self.height=gv.size
+        self.board=gv.board #[x,y,type]
+        self.pieces=gv.pieces #[x,y,type]
+        self.time=0
+        self.done=0
+
+        self.squares=np.zeros((self.width, self.height), dtype=np.int8)
+        for x, y, t in self.board:
+            self.squares[x, y] = t
+        self.grid=np.zeros((self.width, self.height), dtype=np.int8)
+        self.index=np.full((self.width, self.height), -1, dtype=np.int16)
+        self.king=-1
+        for pieceno, (x, y, t) in enumerate(self.pieces):
+            if x < 0: continue
+            self.grid[x, y] = t
+            self.index[x, y] = pieceno
+            if t == 2: self.king = pieceno
 
     def getCopy(self):
-      gv=Tafl()
-      gv.size=self.size
-      gv.board=np.copy(np.array(self.board)).tolist()
-      gv.pieces=np.copy(np.array(self.pieces)).tolist()
-      b = Board(gv)
-      b.time=self.time
-      b.done=self.done
-      return b
+        # board and squares never change, they are shared between copies
+        b = copy.copy(self)
+        b.pieces = [list(p) for p in self.pieces]
+        b.grid = np.copy(self.grid)
+        b.index = np.copy(self.index)
+        return b
 
 
     def countDiff(self, color):
-        """Counts the # pieces of the given color
-        (1 for white, -1 for black, 0 for empty spaces)"""
-        count = 0
-        for p in range(self.pieces):
-            if p[0] >= 0:
-               if p[2]*color == 1:
-                   count += 1
-               else:
-                   count -= 1
-        return count
+        """Counts the # pieces of the given color minus the # pieces of the opponent
+        (1 for white, -1 for black)"""
+        return int(np.count_nonzero(self.grid*color > 0)) - int(np.count_nonzero(self.grid*color < 0))
 
     def get_legal_moves(self, color):
         """Returns all the legal moves for the given color.
         (1 for white, -1 for black
         """
         return self._getValidMoves(color)
-     
+
     def has_legal_moves(self, color):
         vm = self._getValidMoves(color)
         if len(vm)>0: return True
@@ -54,112 +65,109 @@ class Board():
         """
         x1,y1,x2,y2 = move
         pieceno = self._getPieceNo(x1,y1)
-        if self._isLegalMove(pieceno,x2,y2):
-           self._moveByPieceNo(pieceno,x2,y2)
-   
+        if pieceno >= 0 and self._isLegalMove(pieceno,x2,y2) == 0:
+            self._moveByPieceNo(pieceno,x2,y2)
+
     def getImage(self):
-        image = [[0 for col in range(self.width)] for row in range(self.height)]
-        for item in self.board:
-            image[item[1]][item[0]] = item[2]*10
-        for piece in self.pieces:
-            if piece[0] >= 0: image[piece[1]][piece[0]] = piece[2] + image[piece[1]][piece[0]]
-        return image
+        # image[y][x], special square type*10 plus piece type
+        return (self.squares.astype(int)*10 + self.grid).T.tolist()
 
 
 ################## Internal methods ##################
 
     def _isLegalMove(self,pieceno,x2,y2):
-      try:
-
-         if x2 < 0 or y2 < 0 or x2 >= self.width or y2 > self.height: return -1
-         
-         piece = self.pieces[pieceno]
-         x1=piece[0]
-         y1=piece[1]
-         if x1<0: return -2 #piece was captured
-         if x1 != x2 and y1 != y2: return -3 #must move in straight line
-         if x1 == x2 and y1 == y2: return -4 #no move
-
-         piecetype = piece[2]
-         if (piecetype == -1 and self.time%2 == 0) or (piecetype != -1 and self.time%2 == 1): return -5 #wrong player
-
-         for item in self.board:
-            if item[0] == x2 and item[1] == y2 and item[2] > 0:
-                if piecetype != 2: return -10 #forbidden space
-         for apiece in self.pieces:
-            if y1==y2 and y1 == apiece[1] and ((x1 < apiece[0] and x2 >= apiece[0]) or (x1 > apiece[0] and x2 <= apiece[0])): return -20 #interposing piece
-            if x1==x2 and x1 == apiece[0] and ((y1 < apiece[1] and y2 >= apiece[1]) or (y1 > apiece[1] and y2 <= apiece[1])): return -20 #interposing piece
-
-         return 0 # legal move
-      except Exception as ex:
-         print("error in islegalmove ",ex,pieceno,x2,y2)
-         raise
-
-   
+        if x2 < 0 or y2 < 0 or x2 >= self.width or y2 >= self.height: return -1
+
+        x1,y1,piecetype = self.pieces[pieceno]
+        if x1<0: return -2 #piece was captured
+        if x1 != x2 and y1 != y2: return -3 #must move in straight line
+        if x1 == x2 and y1 == y2: return -4 #no move
+
+        if (piecetype == -1) != (self.time%2 == 1): return -5 #wrong player
+
+        if self.squares[x2, y2] > 0 and piecetype != 2: return -10 #forbidden space
+        if x1 == x2:
+            path = self.grid[x1, min(y1,y2):max(y1,y2)+1]
+        else:
+            path = self.grid[min(x1,x2):max(x1,x2)+1, y1]
+        if np.count_nonzero(path) > 1: return -20 #interposing piece
+
+        return 0 # legal move
+
+
     def _getCaptures(self,pieceno,x2,y2):
-       #Assumes was already checked for legal move
-       captures=[]
-       piece=self.pieces[pieceno]
-       piecetype = piece[2]
-       for apiece in self.pieces:
-          if piecetype*apiece[2] < 0:
-             d1 = apiece[0]-x2 
-             d2 = apiece[1]-y2
-             if (abs(d1)==1 and d2==0) or (abs(d2)==1 and d1==0): 
-                 for bpiece in self.pieces:
-                    if piecetype*bpiece[2] > 0 and not(piece[0]==bpiece[0] and piece[1]==bpiece[1]):
-                       e1 = bpiece[0]-apiece[0]
-                       e2 = bpiece[1]-apiece[1]
-                       if d1==e1 and d2==e2:
-                          captures.extend([apiece])
-       return captures
+        #Assumes was already checked for legal move
+        #an enemy next to the destination is captured by a friendly piece behind it
+        captures=[]
+        piecetype = self.pieces[pieceno][2]
+        for dx, dy in DIRECTIONS:
+            x3, y3 = x2+2*dx, y2+2*dy
+            if x3 < 0 or y3 < 0 or x3 >= self.width or y3 >= self.height: continue
+            if self.grid[x2+dx, y2+dy]*piecetype < 0 and self.grid[x3, y3]*piecetype > 0:
+                captures.append(self.pieces[self.index[x2+dx, y2+dy]])
+        return captures
 
     # returns code for invalid mode (<0) or number of pieces captured
     def _moveByPieceNo(self,pieceno,x2,y2):
-      
-      legal = self._isLegalMove(pieceno,x2,y2)
-      if legal != 0: return legal
 
-      self.time = self.time + 1
+        legal = self._isLegalMove(pieceno,x2,y2)
+        if legal != 0: return legal
+
+        self.time = self.time + 1
+
+        piece=self.pieces[pieceno]
+        self.grid[piece[0], piece[1]] = 0
+        self.index[piece[0], piece[1]] = -1
+        piece[0]=x2
+        piece[1]=y2
+        self.grid[x2, y2] = piece[2]
+        self.index[x2, y2] = pieceno
+        caps = self._getCaptures(pieceno,x2,y2)
+        for c in caps:
+            self.grid[c[0], c[1]] = 0
+            self.index[c[0], c[1]] = -1
+            c[0]=-99
+
+        self.done = self._getWinLose()
 
-      piece=self.pieces[pieceno]
-      piece[0]=x2
-      piece[1]=y2
-      caps = self._getCaptures(pieceno,x2,y2)
-      #print("Captures = ",caps)
-      for c in caps:
-          c[0]=-99
+        return len(caps)
 
-      self.done = self._getWinLose()
-      
-      return len(caps)
-        
 
 
     def _getWinLose(self):
-       for apiece in self.pieces:
-           if apiece[2]==2 and apiece[0] > -1:
-               for item in self.board:
-                 if item[0]==apiece[0] and item[1]==apiece[1] and item[2]==1:
-                     return 1 #white won
-               return 0 # no winner
-       return -1  #white lost
-   
-    def _getPieceNo(self,x,y):
-       for pieceno in range(len(self.pieces)):
-           piece=self.pieces[pieceno]
-           if piece[0]==x and piece[1]==y: return pieceno
-       return -1    
-   
-    def _getValidMoves(self,player):
-       moves=[]
-       for pieceno in range(len(self.pieces)):
-           piece=self.pieces[pieceno]
-           if piece[2]*player > 0:
-              for x in range(0,self.width):
-                  if self._isLegalMove(pieceno,x,piece[1])>=0:moves.extend([[piece[0],piece[1],x,piece[1]]])
-              for y in range(0,self.height):
-                  if self._isLegalMove(pieceno,piece[0],y)>=0:moves.extend([[piece[0],piece[1],piece[0],y]])
-       return moves
+        if self.king < 0: return -1
+        x, y, _ = self.pieces[self.king]
+        if x < 0: return -1  #white lost
+        if self.squares[x, y] == 1: return 1 #white won
+        if not (self.grid < 0).any(): return 1 #all attackers captured
+        return 0 # no winner
 
+    def _getPieceNo(self,x,y):
+        if x < 0 or y < 0 or x >= self.width or y >= self.height: return -1
+        return int(self.index[x, y])
 
+    def _getValidMoves(self,player):
+        # slides each piece of the side to move along its row and column until blocked
+        moves=[]
+        side = -1 if self.time%2 == 1 else 1
+        if side*player <= 0: return moves
+        grid = self.grid.tolist()
+        squares = self.squares.tolist()
+        for x1, y1, piecetype in self.pieces:
+            if x1 < 0 or piecetype*side <= 0: continue
+            # in the order of the destination x, then the destination y
+            moves.extend(self._slide(grid, squares, x1, y1, -1, 0, piecetype)[::-1])
+            moves.extend(self._slide(grid, squares, x1, y1, 1, 0, piecetype))
+            moves.extend(self._slide(grid, squares, x1, y1, 0, -1, piecetype)[::-1])
+            moves.extend(self._slide(grid, squares, x1, y1, 0, 1, piecetype))
+        return moves
+
+    def _slide(self, grid, squares, x1, y1, dx, dy, piecetype):
+        # walks from (x1,y1) in direction (dx,dy) up to the first piece or the edge,
+        # only the king may stop on special squares
+        moves=[]
+        x, y = x1+dx, y1+dy
+        while 0 <= x < self.width and 0 <= y < self.height and grid[x][y] == 0:
+            if piecetype == 2 or squares[x][y] == 0: moves.append([x1,y1,x,y])
+            x, y = x+dx, y+dy
+        return moves
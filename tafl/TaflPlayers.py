@@ -1,5 +1,5 @@
 import numpy as np
-from .Digits import int2base
+from .Digits import action2move, move2action
 
 class RandomTaflPlayer():
     def __init__(self, game):
@@ -23,17 +23,18 @@ class HumanTaflPlayer():
         m=[]
         for i in range(len(valid)):
             if valid[i]:
-                m.extend([int2base(i,self.game.n,4)])
+                m.extend([action2move(i,self.game.n)])
         print(m)    
         while True:
             a = input()
 
-            x1,y1,x2,y2 = [int(x) for x in a.strip().split(' ')]
-            a = x1 + y1 * self.game.n + x2 * self.game.n**2 + y2 * self.game.n**3 
-            if valid[a]:
-                break
-            else:
-                print('Invalid')
+            move = [int(x) for x in a.strip().split(' ')]
+            n = self.game.n
+            if all(0 <= v < n for v in move) and move[:2] != move[2:] and (move[0] == move[2] or move[1] == move[3]):
+                a = move2action(move, n)
+                if valid[a]:
+                    break
+            print('Invalid')
 
         return a
 
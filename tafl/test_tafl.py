@@ -0,0 +1,94 @@
+"""
+To run tests:
+pytest-3 tafl
+"""
+
+from .Digits import action2base, action2move, base2action, int2base, move2action
+from .GameVariants import Brandubh
+from .TaflGame import ATTACKER, DEFENDER, KING, NUM_PLANES, TO_MOVE, TaflGame
+from .TaflLogic import Board
+
+
+def test_sliding_moves():
+    board = Board(Brandubh())
+    # defenders move first, attackers have no moves
+    assert board.get_legal_moves(-1) == []
+    moves = board.get_legal_moves(1)
+    # the defender on (3,2) is blocked by the king and an attacker, the throne is left alone
+    assert [m for m in moves if m[:2] == [3, 2]] == [[3, 2, 0, 2], [3, 2, 1, 2], [3, 2, 2, 2],
+                                                     [3, 2, 4, 2], [3, 2, 5, 2], [3, 2, 6, 2]]
+    # the king is surrounded by defenders
+    assert [m for m in moves if m[:2] == [3, 3]] == []
+
+
+def test_capture_and_escape():
+    board = Board(Brandubh())
+    board.execute_move([3, 2, 1, 2], 1)
+    assert board.pieces[board._getPieceNo(1, 2)][2] == 1 and board.time == 1
+    # an attacker sandwiched between two defenders is removed
+    board.execute_move([3, 0, 4, 0], -1)
+    board.execute_move([2, 3, 2, 2], 1)
+    board.execute_move([3, 1, 3, 2], -1)
+    assert board.countDiff(1) == -3
+    board.execute_move([4, 3, 4, 2], 1)
+    assert board._getPieceNo(3, 2) == -1 and board.grid[3, 2] == 0
+    assert board.countDiff(1) == -2
+
+    # the king slides out of the throne and reaches a corner
+    board.execute_move([0, 3, 0, 2], -1)
+    board.execute_move([3, 3, 3, 2], 1)
+    board.execute_move([0, 2, 0, 3], -1)
+    assert board.done == 0
+    board.execute_move([3, 2, 3, 0], 1)
+    board.execute_move([6, 3, 6, 2], -1)
+    # only the king may stop on a corner
+    assert [3, 0, 0, 0] in board.get_legal_moves(1)
+    assert [1, 2, 1, 0] in board.get_legal_moves(1)
+    board.execute_move([3, 0, 0, 0], 1)
+    assert board.done == 1
+
+
+def test_compact_actions():
+    game = TaflGame("Hnefatafl")
+    board = game.getInitBoard()
+    n = game.n
+    assert game.getActionSize() == 11*11*4*10
+    valids = game.getValidMoves(board, 1)
+    moves = game.getLogicBoard(board).get_legal_moves(1)
+    assert valids.sum() == len(moves)
+    for move in moves:
+        action = move2action(move, n)
+        assert valids[action] and action2move(action, n) == move
+        index = move[0] + move[1]*n + move[2]*n**2 + move[3]*n**3
+        assert int2base(index, n, 4) == move
+        assert base2action(index, n) == action and action2base(action, n) == index
+    assert sorted(move2action(action2move(a, n), n) for a in range(game.getActionSize())) == list(range(game.getActionSize()))
+
+
+def test_board_tensor():
+    game = TaflGame("Brandubh")
+    board = game.getInitBoard()
+    assert board.shape == (7, 7, NUM_PLANES) and board[:, :, TO_MOVE].min() == 1
+    board, player = game.getNextState(board, 1, move2action([3, 2, 1, 2], 7))
+    assert player == -1 and board[1, 2, DEFENDER] == 1 and board[3, 2, DEFENDER] == 0
+    assert board[:, :, TO_MOVE].max() == -1
+    # the attackers to move see their own pieces as 1
+    canonical = game.getCanonicalForm(board, player)
+    assert canonical[3, 0, ATTACKER] == 1 and canonical[3, 3, KING] == -1
+    assert game.getValidMoves(canonical, 1).sum() == len(game.getLogicBoard(board).get_legal_moves(-1)) == 38
+    assert game.stringRepresentation(canonical) != game.stringRepresentation(board)
+    assert game.getGameEnded(canonical, 1) == 0
+
+    valids = game.getValidMoves(canonical, 1)
+    symmetries = game.getSymmetries(canonical, valids)
+    assert len(symmetries) == 8
+    for newBoard, newValids in symmetries:
+        assert (game.getValidMoves(newBoard, 1) == newValids).all()
+
+    # capturing the king wins for the attackers
+    board[3, 3, KING] = 0
+    assert game.getGameEnded(board, -1) == 1 and game.getGameEnded(game.getCanonicalForm(board, -1), 1) == 1
+    # so does capturing every attacker for the defenders
+    board = game.getInitBoard()
+    board[:, :, ATTACKER] = 0
+    assert game.getGameEnded(board, 1) == 1 and game.getGameEnded(game.getCanonicalForm(board, -1), 1) == -1
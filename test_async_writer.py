@@ -0,0 +1,114 @@
+"""
+To run tests:
+pytest-3 test_async_writer.py
+"""
+
+import os
+import threading
+
+import pytest
+
+from AsyncWriter import AsyncWriter
+from Coach import Coach
+from NeuralNet import NeuralNet
+from tictactoe.TicTacToeGame import TicTacToeGame
+from utils import dotdict
+
+
+def write_text(text):
+    def write(folder, tmpname):
+        with open(os.path.join(folder, tmpname), 'w') as f:
+            f.write(text)
+    return write
+
+
+def test_rename(tmp_path):
+    folder = str(tmp_path / 'checkpoint')
+    writer = AsyncWriter()
+    writer.submit(folder, 'examples', write_text('a'))
+    writer.submit(folder, 'examples', write_text('b'))
+    writer.wait()
+    assert os.listdir(folder) == ['examples'] and open(os.path.join(folder, 'examples')).read() == 'b'
+
+    # files written by the caller under a prefix, like tensorflow savers with their state file
+    tmpname = writer.tmpName('best.pth.tar')
+    for suffix in ('.index', '.meta'):
+        write_text(suffix)(folder, tmpname + suffix)
+    write_text('model_checkpoint_path: "%s"\n' % tmpname)(folder, 'checkpoint')
+    writer.submit(folder, 'best.pth.tar', tmpname=tmpname)
+    writer.wait()
+    assert sorted(os.listdir(folder)) == ['best.pth.tar.index', 'best.pth.tar.meta', 'checkpoint', 'examples']
+    assert open(os.path.join(folder, 'checkpoint')).read() == 'model_checkpoint_path: "best.pth.tar"\n'
+
+
+def test_bounded_queue(tmp_path):
+    folder = str(tmp_path)
+    writer = AsyncWriter(maxPending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow(folder, tmpname):
+        started.set()
+        release.wait()
+        write_text('slow')(folder, tmpname)
+    writer.submit(folder, 'slow', slow)
+    started.wait()
+    # writer thread is busy, so one write fits in the queue and the next one waits
+    writer.submit(folder, 'queued', write_text('queued'))
+    blocked = threading.Thread(target=writer.submit, args=(folder, 'blocked', write_text('blocked')))
+    blocked.start()
+    blocked.join(0.2)
+    assert blocked.is_alive()
+    release.set()
+    blocked.join(5)
+    assert not blocked.is_alive()
+    writer.wait()
+    assert sorted(os.listdir(folder)) == ['blocked', 'queued', 'slow']
+
+
+def test_error(tmp_path):
+    def fail(folder, tmpname):
+        raise ValueError('disk full')
+    writer = AsyncWriter()
+    writer.submit(str(tmp_path), 'examples', fail)
+    with pytest.raises(ValueError):
+        writer.wait()
+    # error is raised once and the writer keeps working
+    writer.submit(str(tmp_path), 'examples', write_text('a'))
+    writer.wait()
+    assert os.listdir(str(tmp_path)) == ['examples']
+
+
+class SnapshotNet(NeuralNet):
+    """Saves its weights from snapshots if threaded, else on the calling thread."""
+    def __init__(self, game, threaded=True):
+        self.weights = 'a'
+        self.threaded = threaded
+        self.threads = []
+
+    def save_checkpoint(self, folder, filename):
+        self.threads.append(threading.current_thread())
+        os.makedirs(folder, exist_ok=True)
+        write_text(self.weights)(folder, filename)
+
+    def snapshot_checkpoint(self):
+        if not self.threaded:
+            return None
+        weights = self.weights
+
+        def write(folder, filename):
+            self.threads.append(threading.current_thread())
+            write_text(weights)(folder, filename)
+        return write
+
+
+def test_coach_checkpoint(tmp_path):
+    for threaded in (True, False):
+        folder = str(tmp_path / str(threaded))
+        nnet = SnapshotNet(None, threaded)
+        coach = Coach(TicTacToeGame(), nnet, dotdict({'checkpoint': folder, 'numMCTSSims': 2, 'cpuct': 1}))
+        coach.saveCheckpoint('best.pth.tar')
+        # training on doesn't change the saved snapshot
+        nnet.weights = 'b'
+        coach.writer.wait()
+        assert os.listdir(folder) == ['best.pth.tar'] and open(os.path.join(folder, 'best.pth.tar')).read() == 'a'
+        assert (nnet.threads == [coach.writer.thread]) == threaded
@@ -0,0 +1,87 @@
+"""
+To run tests:
+pytest-3 test_prediction_cache.py
+"""
+
+import numpy as np
+
+from MCTS import MCTS
+from NeuralNet import NeuralNet
+from PredictionCache import PredictionCache
+from tictactoe.TicTacToeGame import TicTacToeGame
+from utils import dotdict
+
+
+class CountingNet(NeuralNet):
+    def __init__(self, game):
+        self.actionSize = game.getActionSize()
+        self.calls = 0
+
+    def predict(self, board):
+        self.calls += 1
+        return np.ones(self.actionSize)/self.actionSize, 0.
+
+    def train(self, examples):
+        self.weightsChanged()
+
+    def set_weights(self, weights):
+        self.weightsChanged()
+
+    def load_checkpoint(self, folder, filename):
+        self.weightsChanged()
+
+
+def test_shared_between_searches():
+    game = TicTacToeGame()
+    nnet = CountingNet(game)
+    args = dotdict({'numMCTSSims': 25, 'cpuct': 1.0, 'predictionCacheSize': 1000})
+    board = game.getInitBoard()
+    first = MCTS(game, nnet, args)
+    probs = first.getActionProb(board)
+    calls = nnet.calls
+
+    # a new search with the same net predicts nothing it has seen before
+    second = MCTS(game, nnet, args)
+    assert second.cache is first.cache
+    assert second.getActionProb(board) == probs
+    assert nnet.calls == calls and first.cache.hits > 0
+    assert first.cache.hitRate() == float(first.cache.hits)/(first.cache.hits + first.cache.misses)
+    assert 'hit rate: %.3f' % first.cache.hitRate() in str(first.cache)
+
+    # searches without cache size keep calling the net
+    MCTS(game, nnet, dotdict({'numMCTSSims': 25, 'cpuct': 1.0})).getActionProb(board)
+    assert nnet.calls > calls
+
+
+def test_flushed_when_weights_change():
+    game = TicTacToeGame()
+    nnet = CountingNet(game)
+    cache = PredictionCache.forNet(nnet, 10)
+    board = game.getInitBoard()
+    s = game.stringRepresentation(board)
+    cache.predict(board, s)
+    for change in (lambda: nnet.train([]), lambda: nnet.set_weights(None), lambda: nnet.load_checkpoint('folder', 'file')):
+        version, calls = nnet.weightsVersion, nnet.calls
+        cache.predict(board, s)
+        assert nnet.calls == calls
+        change()
+        assert nnet.weightsVersion == version + 1
+        cache.predict(board, s)
+        assert nnet.calls == calls + 1 and len(cache.entries) == 1
+
+
+def test_lru_eviction():
+    game = TicTacToeGame()
+    nnet = CountingNet(game)
+    cache = PredictionCache.forNet(nnet, 2)
+    boards = []
+    for action in range(3):
+        board, _ = game.getNextState(game.getInitBoard(), 1, action)
+        boards.append((board, game.stringRepresentation(board)))
+    for i in (0, 1, 0, 2):
+        cache.predict(*boards[i])
+    # second board was used least recently
+    assert list(cache.entries) == [boards[0][1], boards[2][1]]
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.predict(*boards[1])
+    assert nnet.calls == 4
@@ -1,8 +1,8 @@
 from __future__ import print_function
 import sys
 sys.path.append('..')
-from Game import Game
-from .TicTacToeLogic import Board
+from SquareBoardGame import SquareBoardGame
+from .TicTacToeLogic import get_win_lines
 import numpy as np
 
 """
@@ -14,85 +14,35 @@ Date: Jan 5, 2018.
 
 Based on the OthelloGame by Surag Nair.
 """
-class TicTacToeGame(Game):
-    def __init__(self, n=3):
-        self.n = n
-
-    def getInitBoard(self):
-        # return initial board (numpy board)
-        b = Board(self.n)
-        return np.array(b.pieces)
-
-    def getBoardSize(self):
-        # (a,b) tuple
-        return (self.n, self.n)
-
-    def getActionSize(self):
-        # return number of actions
-        return self.n*self.n + 1
-
-    def getNextState(self, board, player, action):
-        # if player takes action on board, return next (board,player)
-        # action must be a valid move
-        if action == self.n*self.n:
-            return (board, -player)
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-        move = (int(action/self.n), action%self.n)
-        b.execute_move(move, player)
-        return (b.pieces, -player)
-
-    def getValidMoves(self, board, player):
-        # return a fixed size binary vector
-        valids = [0]*self.getActionSize()
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-        legalMoves =  b.get_legal_moves(player)
-        if len(legalMoves)==0:
-            valids[-1]=1
-            return np.array(valids)
-        for x, y in legalMoves:
-            valids[self.n*x+y]=1
-        return np.array(valids)
+class TicTacToeGame(SquareBoardGame):
+    def __init__(self, n=3, k=None):
+        # k in a row wins, a full line by default
+        SquareBoardGame.__init__(self, n)
+        self.k = k or n
+        self.lines, _ = get_win_lines(self.n, self.k)
 
     def getGameEnded(self, board, player):
         # return 0 if not ended, 1 if player 1 won, -1 if player 1 lost
         # player = 1
-        b = Board(self.n)
-        b.pieces = np.copy(board)
-
-        if b.is_win(player):
+        # a line sums to k*color only if all its squares are color
+        sums = board.ravel()[self.lines].sum(axis=1)
+        if (sums == self.k*player).any():
             return 1
-        if b.is_win(-player):
+        if (sums == -self.k*player).any():
             return -1
-        if b.has_legal_moves():
+        if np.count_nonzero(board) < board.size:
             return 0
         # draw has a very little value 
         return 1e-4
 
-    def getCanonicalForm(self, board, player):
-        # return state if player==1, else return -state if player==-1
-        return player*board
-
-    def getSymmetries(self, board, pi):
-        # mirror, rotational
-        assert(len(pi) == self.n**2+1)  # 1 for pass
-        pi_board = np.reshape(pi[:-1], (self.n, self.n))
-        l = []
-
-        for i in range(1, 5):
-            for j in [True, False]:
-                newB = np.rot90(board, i)
-                newPi = np.rot90(pi_board, i)
-                if j:
-                    newB = np.fliplr(newB)
-                    newPi = np.fliplr(newPi)
-                l += [(newB, list(newPi.ravel()) + [pi[-1]])]
-        return l
-
-    def stringRepresentation(self, board):
-        # 8x8 numpy array (canonical board)
-        return board.tostring()
+    def getGameEndedBatch(self, boards, players):
+        flat = boards.reshape(len(boards), -1)
+        sums = flat[:, self.lines].sum(axis=2)
+        players = np.asarray(players).reshape(-1, 1)
+        won = (sums == self.k*players).any(axis=1)
+        lost = (sums == -self.k*players).any(axis=1)
+        full = np.count_nonzero(flat, axis=1) == flat.shape[1]
+        return np.where(won, 1., np.where(lost, -1., np.where(full, 1e-4, 0.)))
 
 def display(board):
     n = board.shape[0]
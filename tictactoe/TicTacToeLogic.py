@@ -1,6 +1,6 @@
 '''
 Board class for the game of TicTacToe.
-Default board size is 3x3.
+Default board size is 3x3, a player wins with k in a row (default k=n).
 Board data:
   1=white(O), -1=black(X), 0=empty
   first dim is column , 2nd is row:
@@ -14,16 +14,41 @@ Date: Jan 5, 2018.
 Based on the board for the game of Othello by Eric P. Nichols.
 
 '''
+import numpy as np
+
+# stores (lines, masks) for (n, k), see get_win_lines
+_win_lines = {}
+
+
+def get_win_lines(n, k):
+    """Returns every line of k squares on an n x n board, once per (n, k):
+    lines: int array of shape (number of lines, k) with flat indices x*n+y
+    masks: list of int bitmasks with bit x*n+y set for the squares of a line
+    """
+    if (n, k) not in _win_lines:
+        lines = []
+        for x in range(n):
+            for y in range(n):
+                for dx, dy in [(1,0),(0,1),(1,1),(1,-1)]:
+                    if 0 <= x + (k-1)*dx < n and 0 <= y + (k-1)*dy < n:
+                        lines.append([(x + i*dx)*n + y + i*dy for i in range(k)])
+        lines = np.array(lines, dtype=np.intp).reshape(-1, k)
+        masks = [sum(1 << int(i) for i in line) for line in lines]
+        _win_lines[(n, k)] = (lines, masks)
+    return _win_lines[(n, k)]
+
+
 # from bkcharts.attributes import color
 class Board():
 
     # list of all 8 directions on the board, as (x,y) offsets
     __directions = [(1,1),(1,0),(1,-1),(0,-1),(-1,-1),(-1,0),(-1,1),(0,1)]
 
-    def __init__(self, n=3):
+    def __init__(self, n=3, k=None):
         "Set up initial board configuration."
 
         self.n = n
+        self.k = k or n
         # Create the empty board array.
         self.pieces = [None]*self.n
         for i in range(self.n):
@@ -56,41 +81,11 @@ class Board():
         return False
     
     def is_win(self, color):
-        """Check whether the given player has collected a triplet in any direction; 
+        """Check whether the given player has collected k in a row in any direction;
         @param color (1=white,-1=black)
         """
-        win = self.n
-        # check y-strips
-        for y in range(self.n):
-            count = 0
-            for x in range(self.n):
-                if self[x][y]==color:
-                    count += 1
-            if count==win:
-                return True
-        # check x-strips
-        for x in range(self.n):
-            count = 0
-            for y in range(self.n):
-                if self[x][y]==color:
-                    count += 1
-            if count==win:
-                return True
-        # check two diagonal strips
-        count = 0
-        for d in range(self.n):
-            if self[d][d]==color:
-                count += 1
-        if count==win:
-            return True
-        count = 0
-        for d in range(self.n):
-            if self[d][self.n-d-1]==color:
-                count += 1
-        if count==win:
-            return True
-        
-        return False
+        lines, _ = get_win_lines(self.n, self.k)
+        return bool((np.asarray(self.pieces).ravel()[lines] == color).all(axis=1).any())
 
     def execute_move(self, move, color):
         """Perform the given move on the board; 
@@ -1,5 +1,7 @@
 import numpy as np
 
+from .TicTacToeSolver import TicTacToeSolver
+
 """
 Random and Human-ineracting players for the game of TicTacToe.
 
@@ -45,3 +47,24 @@ class HumanTicTacToePlayer():
                 print('Invalid')
 
         return a
+
+
+class PerfectTicTacToePlayer():
+    """Plays an exactly best move with TicTacToeSolver (up to 4x4), preferring the center among equal scores."""
+    def __init__(self, game):
+        self.game = game
+        self.solver = TicTacToeSolver(game.n, game.k)
+
+    def play(self, board):
+        scores = self.scores(board)
+        best = max(s for s in scores if s is not None)
+        for a in self.solver.order:
+            if scores[a] == best:
+                return a
+
+    def scores(self, board):
+        """Returns the exact score of each square of a canonical board, None for occupied squares."""
+        flat = board.ravel()
+        own = sum(1 << int(i) for i in np.nonzero(flat == 1)[0])
+        opp = sum(1 << int(i) for i in np.nonzero(flat == -1)[0])
+        return self.solver.scores(own, opp)
@@ -0,0 +1,105 @@
+'''
+Perfect play solver for TicTacToe with k in a row, practical up to 4x4.
+
+Negamax with alpha-beta pruning and a transposition table on bitmask
+positions (bit x*n+y, as in TicTacToeLogic.get_win_lines). Scores are from the
+point of view of the player to move: the number of empty squares left before
+the winning move for a win (so faster wins score higher), its negation for a
+loss and 0 for a draw.
+'''
+from .TicTacToeLogic import get_win_lines
+
+
+class TicTacToeSolver():
+
+    def __init__(self, n=3, k=None):
+        self.n = n
+        self.k = k or n
+        _, self.masks = get_win_lines(self.n, self.k)
+        self.full = (1 << (n*n)) - 1
+        # center squares first
+        c = (n - 1) / 2.
+        self.order = sorted(range(n*n), key=lambda i: abs(i // n - c) + abs(i % n - c))
+        self.table = {}     # stores (is_lower_bound, score) for (own, opp)
+
+    def is_win(self, own):
+        for mask in self.masks:
+            if own & mask == mask:
+                return True
+        return False
+
+    def winning_squares(self, own, opp):
+        """Returns the empty squares that complete a line for own."""
+        squares = 0
+        for mask in self.masks:
+            if opp & mask == 0:
+                missing = mask & ~own
+                if missing & (missing - 1) == 0:
+                    squares |= missing
+        return squares
+
+    def negamax(self, own, opp, alpha, beta):
+        """
+        Returns the exact score if it is within (alpha, beta), otherwise a
+        bound on the same side of the window. Neither player has a line yet.
+        """
+        empty = self.full & ~(own | opp)
+        if empty == 0:
+            return 0
+        empties = bin(empty).count('1')
+        if self.winning_squares(own, opp):
+            return empties
+
+        threats = self.winning_squares(opp, own)
+        if threats & (threats - 1):
+            # two threats cannot both be blocked
+            return -(empties - 1)
+        if threats:
+            moves = [threats]
+        else:
+            moves = [1 << i for i in self.order if empty >> i & 1]
+
+        # no win now, so the best is a win with the move after next or a draw
+        upper = max(empties - 2, 0)
+        if beta > upper:
+            beta = upper
+            if alpha >= beta:
+                return beta
+
+        key = (own, opp)
+        entry = self.table.get(key)
+        if entry is not None:
+            is_lower_bound, score = entry
+            if is_lower_bound:
+                if alpha < score:
+                    alpha = score
+                    if alpha >= beta:
+                        return alpha
+            elif beta > score:
+                beta = score
+                if alpha >= beta:
+                    return beta
+
+        for move in moves:
+            score = -self.negamax(opp, own | move, -beta, -alpha)
+            if score >= beta:
+                self.table[key] = (True, score)
+                return score
+            if score > alpha:
+                alpha = score
+
+        self.table[key] = (False, alpha)
+        return alpha
+
+    def scores(self, own, opp):
+        """Returns the score of each square for the player to move, None for occupied squares."""
+        result = [None]*(self.n*self.n)
+        for i in range(self.n*self.n):
+            move = 1 << i
+            if (own | opp) & move:
+                continue
+            if self.is_win(own | move):
+                result[i] = bin(self.full & ~(own | opp)).count('1')
+            else:
+                result[i] = -self.negamax(opp, own | move, -self.n*self.n, self.n*self.n)
+        return result
@@ -0,0 +1,68 @@
+"""
+To run tests:
+pytest-3 tictactoe
+"""
+
+import numpy as np
+
+from .TicTacToeGame import TicTacToeGame
+from .TicTacToePlayers import PerfectTicTacToePlayer
+
+
+def test_k_in_a_row():
+    game = TicTacToeGame(4, 3)
+    board = np.zeros((4, 4), dtype=int)
+    board[1, 3] = board[2, 2] = 1
+    assert game.getGameEnded(board, 1) == 0
+    board[3, 1] = 1
+    assert game.getGameEnded(board, 1) == 1
+    assert game.getGameEnded(board, -1) == -1
+    # a full line is needed by default
+    assert TicTacToeGame(4).getGameEnded(board, 1) == 0
+
+    draw = np.array([[1, -1, 1], [1, -1, -1], [-1, 1, 1]])
+    assert TicTacToeGame(3).getGameEnded(draw, 1) == 1e-4
+
+
+def test_perfect_player():
+    game = TicTacToeGame(3)
+    perfect = PerfectTicTacToePlayer(game)
+    assert perfect.scores(game.getInitBoard()) == [0]*9
+
+    # X (-1) threatens the top row, O (1) to move must block
+    board = np.array([[-1, -1, 0], [0, 1, 0], [0, 0, 0]])
+    assert perfect.play(board) == 2
+    # O to move wins on the diagonal at once
+    board = np.array([[1, -1, -1], [0, 1, 0], [-1, 0, 0]])
+    assert perfect.play(board) == 8
+    assert perfect.scores(board)[8] == 4
+
+
+def test_batch_matches_single_board():
+    game = TicTacToeGame(4, 3)
+    rng = np.random.RandomState(0)
+    # full board without 3 in a row, only passing is valid
+    draw = np.array([[1, 1, -1, -1], [-1, -1, 1, 1], [1, 1, -1, -1], [-1, -1, 1, 1]])
+    boards, players = [game.getInitBoard(), draw], [1, -1]
+    for _ in range(40):
+        board, player = game.getInitBoard(), 1
+        for _ in range(rng.randint(17)):
+            if game.getGameEnded(board, player) != 0:
+                break
+            board, player = game.getNextState(board, player, rng.choice(np.nonzero(game.getValidMoves(board, player))[0]))
+        boards.append(board)
+        players.append(player)
+    # every board seen by both players
+    boards, players = np.array(boards * 2), np.array(players + [-p for p in players])
+
+    ended = game.getGameEndedBatch(boards, players)
+    assert (ended == [game.getGameEnded(b, p) for b, p in zip(boards, players)]).all()
+    assert ended[1] == 1e-4 and (ended == 1).any() and (ended == -1).any() and (ended == 0).any()
+    valids = game.getValidMovesBatch(boards, players)
+    assert (valids == [game.getValidMoves(b, p) for b, p in zip(boards, players)]).all()
+    actions = [np.nonzero(v)[0][-1] for v in valids]
+    assert actions[1] == game.getActionSize() - 1
+    nextBoards, nextPlayers = game.getNextStateBatch(boards, players, actions)
+    for i in range(len(boards)):
+        board, player = game.getNextState(boards[i], players[i], actions[i])
+        assert (nextBoards[i] == board).all() and nextPlayers[i] == player